@@ -0,0 +1,113 @@
+"""
+Conversion throughput (atoms / s) of the 'mol' and 'atoms' adapters.
+
+Builds straight alkane chains C_n H_(2n+2) of 10^3 to 10^5 atoms with a zigzag
+geometry and times read and write of both adapters.
+
+Usage:
+    python benchmarks/io_throughput.py [--repeats 3] [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import time
+
+from functools import partial
+
+import ase
+import numpy as np
+import rdkit.Chem
+
+from chemgraph.chemgraph import ChemGraph
+
+# -------------------------------------------------------------------------------------- #
+
+
+def alkane(num_atoms: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Atomic numbers, positions and bonds (rows) of an alkane with ~num_atoms atoms."""
+    num_carbons = max(1, (num_atoms - 2) // 3)
+    ind_carbons = np.arange(num_carbons)
+
+    carbons = np.column_stack(
+        [1.26 * ind_carbons, 0.44 * (ind_carbons % 2), np.zeros(num_carbons)]
+    )
+    sign = np.where(ind_carbons % 2, 1.0, -1.0)
+    hydrogens = np.concatenate(
+        [
+            carbons + np.column_stack([np.zeros(num_carbons), 0.63 * sign, 0.89 * s])
+            for s in (-np.ones(num_carbons), np.ones(num_carbons))
+        ]
+    )
+    ends = carbons[[0, -1]] + np.array([[-1.09, 0.0, 0.0], [1.09, 0.0, 0.0]])
+
+    positions = np.concatenate([carbons, hydrogens, ends])
+    atomic_numbers = np.array([6] * num_carbons + [1] * (2 * num_carbons + 2))
+
+    bonds = np.concatenate(
+        [
+            np.column_stack([ind_carbons[:-1], ind_carbons[1:]]),
+            np.column_stack([ind_carbons, num_carbons + ind_carbons]),
+            np.column_stack([ind_carbons, 2 * num_carbons + ind_carbons]),
+            [[0, 3 * num_carbons], [num_carbons - 1, 3 * num_carbons + 1]],
+        ]
+    )
+
+    return atomic_numbers, positions, bonds
+
+
+def make_mol(atomic_numbers, positions, bonds) -> rdkit.Chem.rdchem.Mol:
+    """Builds the reference rdkit.Chem.Mol (the input of 'read_mol')."""
+    from chemgraph.io.mol import build_mol
+
+    mol = build_mol(atomic_numbers, positions, bonds, [1] * len(bonds))
+    rdkit.Chem.SanitizeMol(mol)
+
+    return mol
+
+
+def best_time(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'adapter':<12}{'atoms':>10}{'time (s)':>12}{'atoms / s':>14}")
+
+    for size in args.sizes:
+        atomic_numbers, positions, bonds = alkane(size)
+        num_atoms = len(atomic_numbers)
+
+        mol = make_mol(atomic_numbers, positions, bonds)
+        atoms = ase.Atoms(numbers=atomic_numbers, positions=positions)
+        cg_mol = ChemGraph.from_file(mol, fmt="mol")
+        cg_atoms = ChemGraph.from_file(atoms, fmt="atoms")
+
+        cases = {
+            "read_mol": partial(ChemGraph.from_file, mol, fmt="mol"),
+            "write_mol": partial(cg_mol.to_file, fmt="mol"),
+            "read_atoms": partial(ChemGraph.from_file, atoms, fmt="atoms"),
+            "write_atoms": partial(cg_atoms.to_file, fmt="atoms"),
+        }
+        for name, function in cases.items():
+            seconds = best_time(function, args.repeats)
+            print(
+                f"{name:<12}{num_atoms:>10}{seconds:>12.4f}{num_atoms / seconds:>14.3e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
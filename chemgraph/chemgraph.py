@@ -1,15 +1,25 @@
 import networkx as nx
+import numpy as np
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from chemgraph.io import registry
-from chemgraph.inference.bonds import REGISTRY_INFERENCE_BONDS
-from chemgraph.geometry.parser.registry import REGISTRY_GEOMETRY_PARSER
+from chemgraph.io import batch, registry
+from chemgraph.inference.registry import REGISTRY_INFERENCE_BONDS
+from chemgraph.geometry.parser.registry import (
+    REGISTRY_GEOMETRY_INDICES,
+    REGISTRY_GEOMETRY_PARSER,
+    REGISTRY_GEOMETRY_PARSER_ARRAY,
+)
 
 from .constants import graph as constants_graph
+from .geometry import trajectory
+from .geometry.parser.parsed import ParsedGeometry
+from .utils import arrays, parallel, topology, views
+from .utils.parallel import TaskError
 
-from typing import List
+from typing import Iterable, Iterator, List
 
 
 @dataclass
@@ -18,6 +28,10 @@ class ChemGraph:
     """Name of the molecule."""
     graph: nx.Graph = nx.Graph()
     """Graph representation of the molecule."""
+    positions: np.ndarray | None = field(default=None, repr=False, compare=False)
+    """Positions (N, 3) of the atoms in graph node order. None without coordinates."""
+    atomic_numbers: np.ndarray | None = field(default=None, repr=False, compare=False)
+    """Atomic numbers (N,) of the atoms in graph node order."""
 
     # ============================================================= #
 
@@ -46,6 +60,225 @@ class ChemGraph:
             for key, default in constants_graph.EDGE_SCHEMA.items():
                 attrs.setdefault(key, default)
 
+        # === Columnar storage of positions and atomic numbers === #
+        self._bind_arrays()
+
+        # === Memo of derived topology, stamped by the edits of the graph === #
+        self.graph = views.track_edits(self.graph)
+        self._init_cache()
+
+    # ============================================================= #
+
+    def __getstate__(self) -> dict:
+        """Drops cached graph views, which cannot be pickled, before pickling or copying."""
+        state = self.__dict__.copy()
+        state.pop("_heavy_atom_view", None)
+        state.pop("_topology_cache", None)
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restores the node attribute views after unpickling or copying."""
+        self.__dict__.update(state)
+        self._bind_arrays()
+        self._init_cache()
+
+    # ============================================================= #
+
+    def _bind_arrays(self):
+        """
+        Makes the positions and atomic_numbers arrays the source of truth.
+        Arrays that are not given are gathered from the node attributes.
+        Afterwards, the 'position' of every node is a view into row k of the
+        positions array and 'atom_number' mirrors atomic_numbers[k].
+        Integer node labels are kept as an int64 array, other labels (e.g. str)
+        as an object array.
+        """
+        nodes = self.graph.nodes
+        num_atoms = len(nodes)
+
+        self._node_row = {node: ind_row for ind_row, node in enumerate(nodes)}
+        if all(isinstance(node, (int, np.integer)) for node in self._node_row):
+            self._node_indices = np.fromiter(nodes, dtype=np.int64, count=num_atoms)
+        else:
+            self._node_indices = np.fromiter(nodes, dtype=object, count=num_atoms)
+
+        if self.atomic_numbers is None:
+            self.atomic_numbers = np.fromiter(
+                (0 if z is None else z for _, z in nodes(data="atom_number")),
+                dtype=np.int64,
+                count=num_atoms,
+            )
+        else:
+            self.atomic_numbers = np.asarray(self.atomic_numbers)
+
+        if self.positions is None:
+            if all(position is not None for _, position in nodes(data="position")):
+                self.positions = np.empty((num_atoms, 3), dtype=np.float64)
+                for ind_row, (_, position) in enumerate(nodes(data="position")):
+                    self.positions[ind_row] = position
+        else:
+            self.positions = np.asarray(self.positions, dtype=np.float64)
+
+        if len(self.atomic_numbers) != num_atoms or (
+            self.positions is not None and self.positions.shape != (num_atoms, 3)
+        ):
+            raise ValueError(
+                f"Arrays do not match the {num_atoms} nodes of the graph: "
+                f"atomic_numbers {self.atomic_numbers.shape}, "
+                f"positions {None if self.positions is None else self.positions.shape}."
+            )
+
+        for ind_row, (atom_number, (_, attrs)) in enumerate(
+            zip(self.atomic_numbers.tolist(), nodes(data=True))
+        ):
+            attrs["atom_number"] = atom_number
+            attrs["position"] = (
+                None if self.positions is None else self.positions[ind_row]
+            )
+
+    # ============================================================= #
+
+    @property
+    def node_indices(self) -> np.ndarray:
+        """Node indices (N,) belonging to the rows of positions and atomic_numbers."""
+        return self._node_indices
+
+    # ============================================================= #
+
+    def node_rows(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Maps node indices onto rows of the positions and atomic_numbers arrays.
+
+        Args:
+        -----
+            indices: np.ndarray
+                Array of node indices of any shape.
+
+        Returns:
+        --------
+            np.ndarray
+                Array of rows with the same shape as indices.
+        """
+        indices = np.asarray(indices, dtype=self._node_indices.dtype)
+        if self._node_indices.dtype != object:
+            return arrays.index_rows(self._node_indices, indices)
+
+        return np.fromiter(
+            (self._node_row[node] for node in indices.flat),
+            dtype=np.int64,
+            count=indices.size,
+        ).reshape(indices.shape)
+
+    # ============================================================= #
+
+    def heavy_atom_view(self) -> nx.Graph:
+        """
+        Read-only view of the graph without Hydrogens. Built once and cached.
+        Nothing is copied and the view follows later edits of the graph.
+
+        Returns:
+        --------
+            nx.Graph
+                Frozen subgraph view (nx.subgraph_view).
+        """
+        graph, view = getattr(self, "_heavy_atom_view", (None, None))
+
+        if graph is not self.graph:
+            view = views.heavy_atom_view(self.graph)
+            self._heavy_atom_view = (self.graph, view)
+
+        return view
+
+    # ============================================================= #
+
+    def _init_cache(self):
+        self._version = getattr(self, "_version", 0)
+        self._topology_cache = OrderedDict()
+
+    @property
+    def version(self) -> int:
+        """Mutation counter. Bumped by infer_bonds, supress_hydrogens and invalidate_cache."""
+        return self._version
+
+    def invalidate_cache(self) -> ChemGraph:
+        """
+        Drops all cached derived topology and bumps the version.
+        Adding or removing nodes and edges through ChemGraph.graph is detected
+        automatically. Call this after editing node or edge attributes (e.g. atom
+        numbers, bond orders) in place, after editing the graph through another
+        reference to the nx.Graph passed in, and after any edit of a graph that is
+        not a plain nx.Graph (e.g. a subclass), whose edits are not tracked.
+
+        Returns:
+        --------
+            self: ChemGraph
+        """
+        self._version += 1
+        self._topology_cache.clear()
+        return self
+
+    def topology(self, name: str, *args, heavy: bool = False):
+        """
+        Returns a derived topological property of the graph, e.g. degrees, the cycle
+        basis or all paths of length n. Computed once and cached until the graph
+        changes. At most TOPOLOGY_CACHE_SIZE properties are kept (least recently used).
+
+        Args:
+        -----
+            name: str
+                Name of the property, see utils.topology.REGISTRY_TOPOLOGY.
+            *args:
+                Arguments of the property, e.g. the path length of 'paths'.
+            heavy: bool
+                Default: False
+                If True, the property of heavy_atom_view() is returned.
+
+        Returns:
+        --------
+            Any
+                Arrays are read-only.
+        """
+        key = (name, args, heavy)
+        stamp = (
+            self._version,
+            id(self.graph),
+            views.edit_stamp(self.graph),
+        )
+
+        cached = self._topology_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            self._topology_cache.move_to_end(key)
+            return cached[1]
+
+        g = self.heavy_atom_view() if heavy else self.graph
+        value = topology.REGISTRY_TOPOLOGY[name](g, *args)
+        for array in value if isinstance(value, tuple) else [value]:
+            if isinstance(array, np.ndarray):
+                array.setflags(write=False)
+
+        self._topology_cache[key] = (stamp, value)
+        if len(self._topology_cache) > topology.TOPOLOGY_CACHE_SIZE:
+            self._topology_cache.popitem(last=False)
+
+        return value
+
+    # ============================================================= #
+
+    def refresh_arrays(self) -> ChemGraph:
+        """
+        Regathers positions and atomic_numbers from the node attributes.
+        Needed after nodes were added, or node attributes replaced, on the graph directly.
+
+        Returns:
+        --------
+            self: ChemGraph
+        """
+        self.positions = None
+        self.atomic_numbers = None
+        self._bind_arrays()
+        self.invalidate_cache()
+        return self
+
     # ============================================================= #
 
     @classmethod
@@ -98,6 +331,126 @@ class ChemGraph:
 
     # ============================================================= #
 
+    @classmethod
+    def iter_file(
+        cls,
+        path: Path | str,
+        name: str | None = None,
+        fmt: str | None = None,
+        **kwargs,
+    ) -> Iterator[ChemGraph]:
+        """
+        Streams ChemGraph instances from a multi-frame file, one per frame.
+
+        Args:
+        -----
+            path: Path | str
+                Path to the file to read.
+            name: str | None
+                Default: None.
+                Name of every ChemGraph instance.
+            fmt: str | None
+                Default: None.
+                Format of the file.
+                If the format is None, extension of the path is used as file format.
+                Accepted formats: xyz
+            **kwargs:
+                Passed to the iterator, e.g. start, stop and step for frame slicing.
+
+        Yields:
+        -------
+            ChemGraph:
+                New ChemGraph instance for every frame.
+        """
+        if fmt is None:
+            fmt = Path(path).suffix.lstrip(".").lower()
+
+        iterator = registry.iterators.get(fmt)
+
+        if iterator is None:
+            raise ValueError(f"No iterator registered for format {fmt}")
+
+        for data in iterator(path, **kwargs):
+            if name is not None:
+                data["name"] = name
+
+            yield cls(**data)
+
+    # ============================================================= #
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: Path | str | Iterable[Path | str],
+        fmt: str | None = None,
+        num_workers: int | None = None,
+        chunk_size: int = 16,
+        as_completed: bool = False,
+        infer_bonds: str | None = None,
+        infer_bonds_kwargs: dict | None = None,
+        **kwargs,
+    ) -> List[ChemGraph | TaskError] | Iterator[tuple[Path, ChemGraph | TaskError]]:
+        """
+        Creates ChemGraph instances from many files in parallel on a process pool.
+        A file that cannot be read yields a TaskError instead of aborting the batch.
+
+        Args:
+        -----
+            paths: Path | str | Iterable[Path | str]
+                Directory, glob pattern (e.g. "data/**/*.xyz") or paths of the files.
+            fmt: str | None
+                Default: None.
+                Format of the files.
+                If the format is None, extension of every path is used as file format.
+            num_workers: int | None
+                Default: None.
+                Number of worker processes. None uses all CPUs.
+                0 or 1 reads in the calling process.
+            chunk_size: int
+                Default: 16
+                Number of files sent to a worker at once.
+            as_completed: bool
+                Default: False
+                If False, a list in input order is returned once all files are read.
+                If True, (path, result) pairs are streamed as soon as they are read.
+            infer_bonds: str | None
+                Default: None
+                Bond inference method run inside the workers, e.g. "cov_radii".
+            infer_bonds_kwargs: dict | None
+                Default: None
+                Keyword arguments of the bond inference method.
+            **kwargs:
+                Passed to the reader.
+
+        Returns:
+        --------
+            List[ChemGraph | TaskError]
+                If as_completed is False.
+            Iterator[tuple[Path, ChemGraph | TaskError]]
+                If as_completed is True.
+        """
+        paths = batch.resolve_paths(paths, fmt=fmt)
+
+        results = parallel.iter_map(
+            batch.load_file,
+            paths,
+            num_workers=num_workers,
+            chunk_size=chunk_size,
+            ordered=not as_completed,
+            cls=cls,
+            fmt=fmt,
+            infer_bonds=infer_bonds,
+            infer_bonds_kwargs=infer_bonds_kwargs,
+            reader_kwargs=kwargs,
+        )
+
+        if as_completed:
+            return ((paths[index], result) for index, result in results)
+
+        return [result for _, result in results]
+
+    # ============================================================= #
+
     def to_file(
         self, path: str | Path | None = None, fmt: str | Path | None = None, **kwargs
     ):
@@ -139,6 +492,47 @@ class ChemGraph:
 
     # ============================================================= #
 
+    @staticmethod
+    def frames_to_file(
+        chemgraphs: Iterable[ChemGraph],
+        path: str | Path,
+        fmt: str | None = None,
+        **kwargs,
+    ):
+        """
+        Writes many ChemGraph instances (frames) into one multi-frame file.
+        Frames are streamed to disk through a single open file handle.
+
+        Args:
+        -----
+            chemgraphs: Iterable[ChemGraph]
+                ChemGraphs to write, one frame each.
+            path: Path | str
+                Path to the file to write the frames to.
+            fmt: str | None
+                Default: None.
+                Format of the file.
+                If the format is None, extension of the path is used as file format.
+                Accepted formats: xyz
+            **kwargs:
+                Passed to the writer, e.g. precision and append.
+
+        Returns:
+        --------
+            None
+        """
+        if fmt is None:
+            fmt = Path(path).suffix.lstrip(".").lower()
+
+        writer = registry.frames_writers.get(fmt)
+
+        if writer is None:
+            raise ValueError(f"No frames writer registered for format {fmt}")
+
+        writer(chemgraphs, path, **kwargs)
+
+    # ============================================================= #
+
     def supress_hydrogens(self) -> ChemGraph:
         """
         Returns the ChemGraph instance with Hydrogens removed.
@@ -151,29 +545,48 @@ class ChemGraph:
         --------
             self: ChemGraph
         """
-        indx_H = [
-            ind_n
-            for ind_n, _ in self.graph.nodes(data=True)
-            if self.graph.nodes[ind_n["atom_number"]] == 1
-        ]
-        self.graph.remove_nodes_from(indx_H)
+        mask_H = self.atomic_numbers == 1
+        self.graph.remove_nodes_from(self._node_indices[mask_H].tolist())
+
+        self.atomic_numbers = self.atomic_numbers[~mask_H]
+        if self.positions is not None:
+            self.positions = self.positions[~mask_H]
+        self._bind_arrays()
+        self.invalidate_cache()
+
         return self
 
     # ============================================================= #
 
     def infer_bonds(self, method="cov_radii", **kwargs):
-        """ """
+        """
+        Infers the bonds of the ChemGraph instance and adds them to the graph.
+
+        Args:
+        -----
+            method: str
+                Default: "cov_radii"
+                Name of the bond inference method, see REGISTRY_INFERENCE_BONDS.
+            **kwargs:
+                Passed to the bond inference method.
 
+        Returns:
+        --------
+            self: ChemGraph
+        """
         inference_function = REGISTRY_INFERENCE_BONDS[method]
 
         edges = inference_function(self, **kwargs)
         self.graph.add_edges_from(edges)
+        self.invalidate_cache()
 
         return self
 
     # ============================================================= #
 
-    def parse_geometry(self, geometry_parser: str | List[str]) -> dict:
+    def parse_geometry(
+        self, geometry_parser: str | List[str], as_arrays: bool = False
+    ) -> dict:
         """
         Parses the specified geometry from the ChemGraph instance.
 
@@ -182,15 +595,103 @@ class ChemGraph:
             geometry_parser: String
                 Defines the geoemetry that should be parsed.
                 Options: bonds, angles, dihedrals, or a list of these.
+            as_arrays: bool
+                Default: False
+                If True, every geometry is computed in one vectorized pass and
+                returned as a ParsedGeometry (index array and float64 value array).
+                If False, the list format [[(indices), value], ...] is returned.
+
+        Returns:
+        --------
+            dict
+                {parser: list | ParsedGeometry}
         """
         if not isinstance(geometry_parser, list):
             geometry_parser = [
                 geometry_parser,
             ]
 
+        registry_parser = REGISTRY_GEOMETRY_PARSER
+        if as_arrays:
+            registry_parser = REGISTRY_GEOMETRY_PARSER_ARRAY
+
         parsed_geometry = dict()
         for parser in geometry_parser:
-            parser_func = REGISTRY_GEOMETRY_PARSER[parser]
+            parser_func = registry_parser[parser]
             parsed_geometry[parser] = parser_func(self)
 
         return parsed_geometry
+
+    # ============================================================= #
+
+    def iter_geometry(
+        self, geometry_parser: str, chunk_size: int = 65536
+    ) -> Iterator[ParsedGeometry]:
+        """
+        Streams the specified geometry of the ChemGraph instance in chunks.
+        Memory use is bounded by chunk_size, which allows parsing millions of
+        angles or dihedrals in constant memory.
+
+        Args:
+        -----
+            geometry_parser: String
+                Defines the geoemetry that should be parsed.
+                Options: bonds, angles, dihedrals.
+            chunk_size: int
+                Default: 65536
+                Maximum number of bonds, angles or dihedrals per chunk.
+
+        Yields:
+        -------
+            ParsedGeometry
+        """
+        iter_indices = REGISTRY_GEOMETRY_INDICES[geometry_parser]
+        parser_func = REGISTRY_GEOMETRY_PARSER_ARRAY[geometry_parser]
+
+        for indices in iter_indices(self.graph, chunk_size):
+            yield parser_func(self, indices=indices)
+
+    # ============================================================= #
+
+    def parse_trajectory(
+        self,
+        frames: np.ndarray | Iterable[np.ndarray | dict],
+        geometry_parser: str | List[str],
+        indices: dict | None = None,
+        chunk_size: int = 65536,
+        path_out: str | Path | None = None,
+    ) -> dict:
+        """
+        Parses the specified geometry over the frames of a trajectory.
+        The topology of the ChemGraph is enumerated once and kept fixed.
+
+        Args:
+        -----
+            frames: np.ndarray | Iterable[np.ndarray | dict]
+                Positions (F, N, 3) in node order, or an iterable of positions (N, 3)
+                or of frames of a registered iterator (e.g. io.xyz.iter_xyz).
+            geometry_parser: String
+                Options: bonds, angles, dihedrals, or a list of these.
+            indices: (Optional) dict
+                Default: None
+                {parser: node indices (M, k)} to parse. Missing parsers parse all.
+            chunk_size: int
+                Default: 65536
+                Maximum number of values (frames x paths) evaluated per pass.
+            path_out: (Optional) str | Path
+                Default: None
+                Directory the values are written to as memory-mapped '<parser>.npy'.
+
+        Returns:
+        --------
+            dict
+                {parser: ParsedGeometry} with indices (M, k) and values (F, M).
+        """
+        return trajectory.parse_trajectory(
+            self,
+            frames=frames,
+            geometry_parser=geometry_parser,
+            indices=indices,
+            chunk_size=chunk_size,
+            path_out=path_out,
+        )
@@ -13,4 +13,6 @@ GRAPH_SCHEMA = {
     "description": None,
     "spin": None,
     "charge": None,
+    "cell": None,
+    "pbc": None,
 }
@@ -252,3 +252,21 @@ COVALENT_RADII = [
 ]
 
 COVALENT_RADII = {i: v for i, v in enumerate(COVALENT_RADII)}
+
+# Allowed valences of neutral main-group atoms, smallest first.
+# Used for the bond order perception of the 'valence' inference method.
+VALENCES = {
+    1: (1,),  # H
+    5: (3,),  # B
+    6: (4,),  # C
+    7: (3,),  # N
+    8: (2,),  # O
+    9: (1,),  # F
+    14: (4,),  # Si
+    15: (3, 5),  # P
+    16: (2, 4, 6),  # S
+    17: (1,),  # Cl
+    34: (2,),  # Se
+    35: (1,),  # Br
+    53: (1,),  # I
+}
@@ -1,5 +1 @@
-# import bonds
-# import angles
-# import dihedrals
-
-# import registry
+"""Modules are imported on first use of their entries, see registry.py."""
@@ -1,46 +1,102 @@
-from .registry import register_geometry_parser
+from .registry import (
+    register_array_geometry_parser,
+    register_geometry_indices,
+    register_geometry_kernel,
+    register_geometry_parser,
+)
+from .parsed import ParsedGeometry
 from ... import chemgraph
-from ...utils import math, pathfinder
+from ...utils import arrays, math, pathfinder, pbc, topology
 import networkx as nx
+import numpy as np
 
+from typing import Iterator
 
-@register_geometry_parser("angles")
-def parse_angles(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+
+@register_geometry_indices("angles")
+def iter_angle_indices(g: nx.Graph, chunk_size: int) -> Iterator[np.ndarray]:
     """
-    Parses all bond angles in a ChemGraph or nx.Graph object.
+    Streams the node indices of all angles in chunks of at most chunk_size rows.
 
     Args:
     -----
-        chemgraph_or_graph: ChemGraph | nx.Graph
+        g: nx.Graph
+        chunk_size: int
+
+    Yields:
+    -------
+        np.ndarray: Int64 array (chunk, 3).
+    """
+    return pathfinder.iter_path_chunks(g=g, n=2, chunk_size=chunk_size)
+
+
+@register_geometry_kernel("angles")
+def angles_kernel(path_pos: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Bond angles of stacks of (node_1, node_center, node_2) paths.
+
+    Args:
+    -----
+        path_pos: np.ndarray
+            Positions (..., 3, 3).
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,).
 
     Returns:
     --------
-        list
+        np.ndarray: Bond angles (...,) in degrees.
     """
-    g = chempgraph_or_graph
-    if isinstance(g, chemgraph.ChemGraph):
-        g = g.graph
+    return math.bond_angles(
+        pos_center=path_pos[..., 1, :],
+        pos_1=path_pos[..., 0, :],
+        pos_2=path_pos[..., 2, :],
+        out=out,
+    )
 
-    list_bond_angles = []
-    list_paths = pathfinder._paths_finder_rev(
-        g=g, n=2
-    )  # All unique paths length 2 (= 3 nodes)
 
-    for path in list_paths:
-        ind_node_1 = path[0]
-        ind_node_center = path[1]
-        ind_node_2 = path[2]
+@register_array_geometry_parser("angles")
+def parse_angles_array(
+    chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    indices: np.ndarray | None = None,
+) -> ParsedGeometry:
+    """
+    Parses all bond angles in a ChemGraph or nx.Graph object in one vectorized pass.
 
-        pos_1 = g.nodes[ind_node_1]["position"]
-        pos_center = g.nodes[ind_node_center]["position"]
-        pos_2 = g.nodes[ind_node_2]["position"]
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+        indices: (Optional) np.ndarray
+            Default: None
+            Node indices (3 columns) to parse. If None, all are parsed.
+
+    Returns:
+    --------
+        ParsedGeometry
+            indices (M, 3) as (node_1, node_center, node_2) and angles in degrees (M,).
+    """
+    g, nodes, positions = arrays.columns(chempgraph_or_graph)
+    if indices is None:
+        # All unique paths length 2 (= 3 nodes)
+        indices = topology.get(chempgraph_or_graph, "paths", 2)
+    path_pos = pbc.path_positions(
+        g, nodes, positions, indices, topology.get(chempgraph_or_graph, "edge_shifts")
+    )
+
+    return ParsedGeometry(indices=indices, values=angles_kernel(path_pos))
 
-        bond_angle = math.bond_angle(
-            pos_center=pos_center,
-            pos_1=pos_1,
-            pos_2=pos_2,
-        )
 
-        list_bond_angles.append([(ind_node_1, ind_node_center, ind_node_2), bond_angle])
+@register_geometry_parser("angles")
+def parse_angles(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+    """
+    Parses all bond angles in a ChemGraph or nx.Graph object.
 
-    return list_bond_angles
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+
+    Returns:
+    --------
+        list
+    """
+    return parse_angles_array(chempgraph_or_graph).to_list()
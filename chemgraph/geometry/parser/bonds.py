@@ -1,34 +1,109 @@
-from .registry import register_geometry_parser
+from .registry import (
+    register_array_geometry_parser,
+    register_geometry_indices,
+    register_geometry_kernel,
+    register_geometry_parser,
+)
+from .parsed import ParsedGeometry
 from ... import chemgraph
-from ...utils import math
+from ...utils import arrays, math, pbc, topology
 import networkx as nx
+import numpy as np
 
+from itertools import chain, islice
+from typing import Iterator
 
-@register_geometry_parser("bonds")
-def parse_bonds(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+
+@register_geometry_indices("bonds")
+def iter_bond_indices(g: nx.Graph, chunk_size: int) -> Iterator[np.ndarray]:
     """
-    Parses all bonds in a ChemGraph or nx.Graph object.
+    Streams the node indices of all bonds in chunks of at most chunk_size rows.
+
+    Args:
+    -----
+        g: nx.Graph
+        chunk_size: int
+
+    Yields:
+    -------
+        np.ndarray: Int64 array (chunk, 2).
+    """
+    edges = iter(g.edges())
+
+    while True:
+        chunk = np.fromiter(
+            chain.from_iterable(islice(edges, chunk_size)), dtype=np.int64
+        ).reshape(-1, 2)
+
+        if len(chunk) == 0:
+            return
+
+        yield chunk
+
+
+@register_geometry_kernel("bonds")
+def bonds_kernel(path_pos: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Bond lengths of stacks of bonded atom pairs.
+
+    Args:
+    -----
+        path_pos: np.ndarray
+            Positions (..., 2, 3).
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,).
+
+    Returns:
+    --------
+        np.ndarray: Bond lengths (...,).
+    """
+    return math.bond_lengths(
+        pos_1=path_pos[..., 0, :], pos_2=path_pos[..., 1, :], out=out
+    )
+
+
+@register_array_geometry_parser("bonds")
+def parse_bonds_array(
+    chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    indices: np.ndarray | None = None,
+) -> ParsedGeometry:
+    """
+    Parses all bond lengths in a ChemGraph or nx.Graph object in one vectorized pass.
 
     Args:
     -----
         chemgraph_or_graph: ChemGraph | nx.Graph
+        indices: (Optional) np.ndarray
+            Default: None
+            Node indices (2 columns) to parse. If None, all bonds are parsed.
 
     Returns:
     --------
-        list
+        ParsedGeometry
+            indices (M, 2) and bond lengths (M,).
     """
-    g = chempgraph_or_graph
-    if isinstance(g, chemgraph.ChemGraph):
-        g = g.graph
+    g, nodes, positions = arrays.columns(chempgraph_or_graph)
+    if indices is None:
+        indices = topology.get(chempgraph_or_graph, "edges")
+    path_pos = pbc.path_positions(
+        g, nodes, positions, indices, topology.get(chempgraph_or_graph, "edge_shifts")
+    )
 
-    list_bond_length = []
+    return ParsedGeometry(indices=indices, values=bonds_kernel(path_pos))
 
-    for ind_node_1, ind_node_2, edge_data in g.edges(data=True):
-        pos_1 = g.nodes[ind_node_1]["position"]
-        pos_2 = g.nodes[ind_node_2]["position"]
 
-        _, bond_length = math.bond_length(pos_1=pos_1, pos_2=pos_2)
+@register_geometry_parser("bonds")
+def parse_bonds(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+    """
+    Parses all bonds in a ChemGraph or nx.Graph object.
 
-        list_bond_length.append([(ind_node_1, ind_node_2), bond_length])
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
 
-    return list_bond_length
+    Returns:
+    --------
+        list
+    """
+    return parse_bonds_array(chempgraph_or_graph).to_list()
@@ -1,52 +1,103 @@
-from .registry import register_geometry_parser
+from .registry import (
+    register_array_geometry_parser,
+    register_geometry_indices,
+    register_geometry_kernel,
+    register_geometry_parser,
+)
+from .parsed import ParsedGeometry
 from ... import chemgraph
-from ...utils import math, pathfinder
+from ...utils import arrays, math, pathfinder, pbc, topology
 import networkx as nx
+import numpy as np
 
+from typing import Iterator
 
-@register_geometry_parser("dihedrals")
-def parse_dihedrals(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+
+@register_geometry_indices("dihedrals")
+def iter_dihedral_indices(g: nx.Graph, chunk_size: int) -> Iterator[np.ndarray]:
     """
-    Parses all dihedral angles in a ChemGraph or nx.Graph object.
+    Streams the node indices of all dihedrals in chunks of at most chunk_size rows.
 
     Args:
     -----
-        chemgraph_or_graph: ChemGraph | nx.Graph
+        g: nx.Graph
+        chunk_size: int
+
+    Yields:
+    -------
+        np.ndarray: Int64 array (chunk, 4).
+    """
+    return pathfinder.iter_path_chunks(g=g, n=3, chunk_size=chunk_size)
+
+
+@register_geometry_kernel("dihedrals")
+def dihedrals_kernel(path_pos: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Dihedral angles of stacks of 4-atom paths.
+
+    Args:
+    -----
+        path_pos: np.ndarray
+            Positions (..., 4, 3).
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,).
 
     Returns:
     --------
-        list
+        np.ndarray: Dihedral angles (...,) in degrees [0, 360).
+    """
+    return math.dihedral_angles(
+        pos_1=path_pos[..., 0, :],
+        pos_2=path_pos[..., 1, :],
+        pos_3=path_pos[..., 2, :],
+        pos_4=path_pos[..., 3, :],
+        out=out,
+    )
+
+
+@register_array_geometry_parser("dihedrals")
+def parse_dihedrals_array(
+    chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    indices: np.ndarray | None = None,
+) -> ParsedGeometry:
     """
-    g = chempgraph_or_graph
-    if isinstance(g, chemgraph.ChemGraph):
-        g = g.graph
+    Parses all dihedral angles in a ChemGraph or nx.Graph object in one vectorized pass.
 
-    list_dihedral_angles = []
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+        indices: (Optional) np.ndarray
+            Default: None
+            Node indices (4 columns) to parse. If None, all are parsed.
 
-    list_paths = pathfinder._paths_finder_rev(
-        g=g, n=3
-    )  # All unique paths length 3 (= 4 nodes)
+    Returns:
+    --------
+        ParsedGeometry
+            indices (M, 4) and dihedral angles in degrees [0, 360) (M,).
+    """
+    g, nodes, positions = arrays.columns(chempgraph_or_graph)
+    if indices is None:
+        # All unique paths length 3 (= 4 nodes)
+        indices = topology.get(chempgraph_or_graph, "paths", 3)
+    path_pos = pbc.path_positions(
+        g, nodes, positions, indices, topology.get(chempgraph_or_graph, "edge_shifts")
+    )
 
-    for path in list_paths:
-        ind_node_1 = path[0]
-        ind_node_2 = path[1]
-        ind_node_3 = path[2]
-        ind_node_4 = path[3]
+    return ParsedGeometry(indices=indices, values=dihedrals_kernel(path_pos))
 
-        node_1 = g.nodes[ind_node_1]
-        node_2 = g.nodes[ind_node_2]
-        node_3 = g.nodes[ind_node_3]
-        node_4 = g.nodes[ind_node_4]
 
-        dihedral_angle = math.dihedral_angle(
-            pos_1=node_1["position"],
-            pos_2=node_2["position"],
-            pos_3=node_3["position"],
-            pos_4=node_4["position"],
-        )
+@register_geometry_parser("dihedrals")
+def parse_dihedrals(chempgraph_or_graph: chemgraph.ChemGraph | nx.Graph):
+    """
+    Parses all dihedral angles in a ChemGraph or nx.Graph object.
 
-        list_dihedral_angles.append(
-            [(ind_node_1, ind_node_2, ind_node_3, ind_node_4), dihedral_angle]
-        )
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
 
-    return list_dihedral_angles
+    Returns:
+    --------
+        list
+    """
+    return parse_dihedrals_array(chempgraph_or_graph).to_list()
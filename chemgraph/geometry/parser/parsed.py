@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ParsedGeometry:
+    """
+    Array representation of a parsed geometry.
+
+    Row k of `indices` holds the node indices of the k-th bond, angle or dihedral
+    and `values[k]` holds its length (Angstrom) or angle (degrees).
+    """
+
+    indices: np.ndarray
+    """Integer array (M, 2), (M, 3) or (M, 4) with node indices."""
+    values: np.ndarray
+    """Float64 array (M,) with the parsed values, (F, M) for F trajectory frames."""
+
+    # ============================================================= #
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # ============================================================= #
+
+    def to_list(self) -> list:
+        """
+        Returns the legacy list representation [[(ind_1, ..., ind_k), value], ...].
+
+        Returns:
+        --------
+            list
+        """
+        return [
+            [tuple(indices), value]
+            for indices, value in zip(self.indices.tolist(), self.values.tolist())
+        ]
@@ -1,14 +1,89 @@
-REGISTRY_GEOMETRY_PARSER = {}
+"""
+Registries of the geometry parsers. The module of a geometry is imported on first use,
+see utils.plugins.LazyRegistry.
+"""
+
+from ...utils.plugins import LazyRegistry
+
+GEOMETRY_MODULES = {
+    "angles": ".geometry.parser.angles",
+    "bonds": ".geometry.parser.bonds",
+    "dihedrals": ".geometry.parser.dihedrals",
+}
+"""Modules of the built-in geometries, registering all four kinds of functions."""
+
+REGISTRY_GEOMETRY_PARSER = LazyRegistry(
+    GEOMETRY_MODULES, group="chemgraph.geometry.parsers"
+)
+REGISTRY_GEOMETRY_PARSER_ARRAY = LazyRegistry(
+    GEOMETRY_MODULES, group="chemgraph.geometry.array_parsers"
+)
 
 
 def register_geometry_parser(name):
     """Decorator that adds the function to the registry."""
 
     def decorator(func):
-        if name in REGISTRY_GEOMETRY_PARSER:
+        if REGISTRY_GEOMETRY_PARSER.is_loaded(name):
             raise ValueError(f"Geometry parser already exists: {name}")
 
         REGISTRY_GEOMETRY_PARSER[name] = func
         return func
 
     return decorator
+
+
+def register_array_geometry_parser(name):
+    """Decorator that adds the array-native function to the registry."""
+
+    def decorator(func):
+        if REGISTRY_GEOMETRY_PARSER_ARRAY.is_loaded(name):
+            raise ValueError(f"Array geometry parser already exists: {name}")
+
+        REGISTRY_GEOMETRY_PARSER_ARRAY[name] = func
+        return func
+
+    return decorator
+
+
+REGISTRY_GEOMETRY_INDICES = LazyRegistry(
+    GEOMETRY_MODULES, group="chemgraph.geometry.indices"
+)
+
+
+def register_geometry_indices(name):
+    """
+    Decorator that adds the function streaming the index chunks of a geometry to the registry.
+    The function takes (graph, chunk_size) and yields integer arrays (chunk, k).
+    """
+
+    def decorator(func):
+        if REGISTRY_GEOMETRY_INDICES.is_loaded(name):
+            raise ValueError(f"Geometry indices already exist: {name}")
+
+        REGISTRY_GEOMETRY_INDICES[name] = func
+        return func
+
+    return decorator
+
+
+REGISTRY_GEOMETRY_KERNEL = LazyRegistry(
+    GEOMETRY_MODULES, group="chemgraph.geometry.kernels"
+)
+
+
+def register_geometry_kernel(name):
+    """
+    Decorator that adds the function evaluating a geometry from path positions to the registry.
+    The function takes positions (..., k, 3) of the k atoms of every path and an optional
+    float64 'out' buffer (...,) and returns the values (...,).
+    """
+
+    def decorator(func):
+        if REGISTRY_GEOMETRY_KERNEL.is_loaded(name):
+            raise ValueError(f"Geometry kernel already exists: {name}")
+
+        REGISTRY_GEOMETRY_KERNEL[name] = func
+        return func
+
+    return decorator
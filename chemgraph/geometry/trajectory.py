@@ -0,0 +1,165 @@
+"""
+Geometry time series of trajectories with a fixed topology.
+
+The bonds, angles and dihedrals are enumerated once from the graph. Every chunk of
+frames is then evaluated in one vectorized pass of the geometry kernels over a
+(frames, paths, atoms, 3) stack, written straight into dense (F, M) arrays, which
+can be memory-mapped .npy files.
+"""
+
+from .parser.parsed import ParsedGeometry
+from .parser.registry import REGISTRY_GEOMETRY_KERNEL
+from .. import chemgraph
+from ..utils import arrays, pbc, topology
+import networkx as nx
+import numpy as np
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+TOPOLOGY_INDICES = {
+    "bonds": ("edges",),
+    "angles": ("paths", 2),
+    "dihedrals": ("paths", 3),
+}
+"""Topology entries (see utils.topology) with the default indices of every geometry."""
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _iter_frame_chunks(
+    frames: np.ndarray | Iterable[np.ndarray | dict], chunk_frames: int
+) -> Iterator[np.ndarray]:
+    """Yields stacks (F_c, N, 3) of at most chunk_frames frames."""
+    if isinstance(frames, np.ndarray):
+        for start in range(0, len(frames), chunk_frames):
+            yield frames[start : start + chunk_frames]
+        return
+
+    chunk = []
+    for frame in frames:
+        chunk.append(frame["positions"] if isinstance(frame, dict) else frame)
+
+        if len(chunk) == chunk_frames:
+            yield np.stack(chunk)
+            chunk = []
+
+    if chunk:
+        yield np.stack(chunk)
+
+
+def _unwrap_paths(path_pos: np.ndarray, cell: np.ndarray, pbc_g) -> np.ndarray:
+    """Unwraps path positions (..., L, 3) by the minimum image of every bond vector."""
+    bond_vectors = pbc.minimum_image(np.diff(path_pos, axis=-2), cell, pbc_g)
+    path_pos[..., 1:, :] = path_pos[..., :1, :] + np.cumsum(bond_vectors, axis=-2)
+
+    return path_pos
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def parse_trajectory(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    frames: np.ndarray | Iterable[np.ndarray | dict],
+    geometry_parser: str | list[str],
+    indices: dict | None = None,
+    chunk_size: int = 65536,
+    path_out: str | Path | None = None,
+) -> dict:
+    """
+    Parses bonds, angles or dihedrals over all frames of a trajectory with a fixed
+    topology. Memory use of the evaluation is bounded by chunk_size.
+
+    For periodic graphs (see utils.pbc) every bond vector is mapped to its minimum
+    image, so frames may be wrapped into the cell.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecule with bonds. Positions are taken from the frames.
+        frames: np.ndarray | Iterable[np.ndarray | dict]
+            Positions (F, N, 3) in node order (e.g. a memory map), or an iterable of
+            positions (N, 3) or frames of a registered iterator (e.g. io.xyz.iter_xyz).
+        geometry_parser: str | list[str]
+            Options: bonds, angles, dihedrals, or a list of these.
+        indices: (Optional) dict
+            Default: None
+            {parser: node indices (M, k)} to parse. Missing parsers parse all.
+        chunk_size: int
+            Default: 65536
+            Maximum number of values (frames x paths) evaluated per pass.
+        path_out: (Optional) str | Path
+            Default: None
+            Directory the values are written to as memory-mapped '<parser>.npy'.
+            Needs frames with a length.
+
+    Returns:
+    --------
+        dict
+            {parser: ParsedGeometry} with indices (M, k) and values (F, M).
+    """
+    if not isinstance(geometry_parser, list):
+        geometry_parser = [geometry_parser]
+    indices = dict(indices or {})
+
+    g, nodes, _ = arrays.columns(chemgraph_or_graph)
+    cell = pbc.cell(g)
+
+    kernels, rows, values = dict(), dict(), dict()
+    for parser in geometry_parser:
+        kernels[parser] = REGISTRY_GEOMETRY_KERNEL[parser]
+        if parser not in indices:
+            indices[parser] = topology.get(
+                chemgraph_or_graph, *TOPOLOGY_INDICES[parser]
+            )
+        rows[parser] = arrays.index_rows(nodes, indices[parser])
+
+    num_paths = max([1] + [len(rows_parser) for rows_parser in rows.values()])
+    chunk_frames = max(1, chunk_size // num_paths)
+
+    if path_out is not None:
+        if not hasattr(frames, "__len__"):
+            raise ValueError("Writing to path_out needs frames with a length.")
+
+        Path(path_out).mkdir(parents=True, exist_ok=True)
+        for parser in geometry_parser:
+            values[parser] = np.lib.format.open_memmap(
+                Path(path_out) / f"{parser}.npy",
+                mode="w+",
+                dtype=np.float64,
+                shape=(len(frames), len(rows[parser])),
+            )
+
+    chunks = {parser: [] for parser in geometry_parser}
+    start = 0
+    for positions in _iter_frame_chunks(frames, chunk_frames):
+        positions = np.asarray(positions, dtype=np.float64)
+        stop = start + len(positions)
+
+        for parser in geometry_parser:
+            path_pos = positions[:, rows[parser]]
+            if cell is not None:
+                path_pos = _unwrap_paths(path_pos, cell, g.graph["pbc"])
+
+            if path_out is not None:
+                kernels[parser](path_pos, out=values[parser][start:stop])
+            else:
+                chunks[parser].append(kernels[parser](path_pos))
+
+        start = stop
+
+    parsed_geometry = dict()
+    for parser in geometry_parser:
+        if path_out is not None:
+            values[parser].flush()
+        elif chunks[parser]:
+            values[parser] = np.concatenate(chunks[parser])
+        else:
+            values[parser] = np.empty((0, len(rows[parser])), dtype=np.float64)
+
+        parsed_geometry[parser] = ParsedGeometry(
+            indices=indices[parser], values=values[parser]
+        )
+
+    return parsed_geometry
@@ -0,0 +1 @@
+"""Modules are imported on first use of their entries, see registry.py."""
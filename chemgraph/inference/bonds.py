@@ -1,20 +1,17 @@
 """ """
 
+from .registry import REGISTRY_INFERENCE_BONDS, register_inference
 from .. import chemgraph
+from ..io import mol
+from ..utils import parallel, pbc
 import networkx as nx
+import numpy as np
+import warnings
 from rdkit.Chem import rdDetermineBonds
 import ase.io
 import ase.neighborlist
 
-REGISTRY_INFERENCE_BONDS = dict()
-
-
-def register_inference(name):
-    def wrapper(func):
-        REGISTRY_INFERENCE_BONDS[name] = func
-        return func
-
-    return wrapper
+from typing import Iterable
 
 
 @register_inference("cov_radii")
@@ -25,6 +22,8 @@ def infer_bonds_cov_radii(
     Infers the bonds of a graph or ChemGraph using covalent radii powered by ASE.
     Removes all existing bonds before infering bonds.
     All bond orders are assumed to be 1.
+    For periodic graphs (see utils.pbc) bonds across the cell boundary get their
+    image shift as edge attribute 'shift'.
 
     Args:
     -----
@@ -49,16 +48,47 @@ def infer_bonds_cov_radii(
     )
     nl.update(atoms)
 
-    edges = []
-
+    rows_1, rows_2, shifts = [], [], []
     for ind_atom_1 in range(len(atoms)):
         neigh, offset = nl.get_neighbors(ind_atom_1)
-
-        for ind_atom_2 in neigh:
-            if ind_atom_1 < ind_atom_2:
-                edges.append((ind_atom_1, int(ind_atom_2), {"bond_order": 1}))
-
-    return edges
+        rows_1.append(np.full(len(neigh), ind_atom_1, dtype=np.int64))
+        rows_2.append(np.asarray(neigh, dtype=np.int64))
+        shifts.append(np.asarray(offset, dtype=np.int64).reshape(-1, 3))
+
+    rows_1 = np.concatenate(rows_1) if rows_1 else np.empty(0, dtype=np.int64)
+    rows_2 = np.concatenate(rows_2) if rows_2 else np.empty(0, dtype=np.int64)
+    shifts = np.concatenate(shifts) if shifts else np.empty((0, 3), dtype=np.int64)
+
+    # Bonds of an atom to its own periodic images are not representable.
+    mask = rows_1 != rows_2
+    rows_1, rows_2, shifts = rows_1[mask], rows_2[mask], shifts[mask]
+
+    # Across the cell boundary ASE may list a pair from either side and through
+    # several images. Keep the closest image of every pair.
+    distances = np.linalg.norm(
+        atoms.positions[rows_2] + shifts @ atoms.cell.array - atoms.positions[rows_1],
+        axis=1,
+    )
+    edges, shifts = pbc.orient_shifts(
+        cg.node_indices[np.stack([rows_1, rows_2], axis=1)], shifts
+    )
+    order = np.lexsort((distances, edges[:, 1], edges[:, 0]))
+    edges, shifts = edges[order], shifts[order]
+    first = np.ones(len(edges), dtype=bool)
+    first[1:] = np.any(edges[1:] != edges[:-1], axis=1)
+
+    return [
+        (
+            node_1,
+            node_2,
+            {"bond_order": 1, "shift": tuple(shift)}
+            if any(shift)
+            else {"bond_order": 1},
+        )
+        for (node_1, node_2), shift in zip(
+            edges[first].tolist(), shifts[first].tolist()
+        )
+    ]
 
 
 @register_inference("rdkit")
@@ -69,6 +99,8 @@ def infer_bonds_rdkit(
     """
     Infers the bonds of a graph using RDKIT.
     Removes all exisiting bonds before infering bonds.
+    The RDKit molecule is built straight from the columnar positions and atomic
+    numbers, and the bond orders are read back without building a graph.
 
     Args:
     -----
@@ -87,9 +119,78 @@ def infer_bonds_rdkit(
     if isinstance(cg, nx.Graph):
         cg = chemgraph.ChemGraph(name="graph", graph=cg)
 
-    rdkit_mol = cg.to_file(fmt="mol")
+    rdkit_mol = mol.build_mol(cg.atomic_numbers, cg.positions)
     rdDetermineBonds.DetermineBonds(rdkit_mol, charge=charge)
 
-    cg_rdkit = cg.from_file(path_or_file=rdkit_mol, fmt="mol")
+    rows, bond_orders = mol.mol_bonds(rdkit_mol)
+    edges = cg.node_indices[rows].tolist()
+
+    return [
+        (node_1, node_2, {"bond_order": bond_order})
+        for (node_1, node_2), bond_order in zip(edges, bond_orders)
+    ]
+
+
+def _infer_bonds_rdkit_item(item: tuple) -> list:
+    """Worker function of infer_bonds_rdkit_batch for one (ChemGraph, charge) item."""
+    cg, charge = item
+    return REGISTRY_INFERENCE_BONDS["rdkit"](cg, charge=charge)
 
-    return list(cg_rdkit.graph.edges(data=True))
+
+def infer_bonds_rdkit_batch(
+    chemgraphs: Iterable[chemgraph.ChemGraph],
+    charge: int | Iterable[int] = 0,
+    timeout: float = 60.0,
+    num_workers: int | None = None,
+    fallback: str | None = "cov_radii",
+) -> list:
+    """
+    Infers the bonds of many molecules with RDKIT in worker processes.
+    DetermineBonds can run for a very long time on large or unusual molecules.
+    Molecules exceeding the time limit (or failing) are inferred with the fallback
+    method in the calling process instead, with a warning.
+
+    Args:
+    -----
+        chemgraphs: Iterable[ChemGraph]
+            Molecules. They are not modified.
+        charge: int | Iterable[int]
+            Default: 0
+            Charge of all molecules, or one charge per molecule.
+        timeout: float
+            Default: 60.0
+            Time limit per molecule in seconds.
+        num_workers: int | None
+            Default: None
+            Number of worker processes. None uses os.cpu_count().
+        fallback: str | None
+            Default: "cov_radii"
+            Inference method for molecules RDKIT fails on, see REGISTRY_INFERENCE_BONDS.
+            If None, their TaskError is returned instead.
+
+    Returns:
+    --------
+        list
+            Edges of every molecule in input order, as returned by the inference
+            methods, or a TaskError.
+    """
+    chemgraphs = list(chemgraphs)
+    charges = [charge] * len(chemgraphs) if isinstance(charge, int) else list(charge)
+
+    results = [None] * len(chemgraphs)
+    for index, result in parallel.iter_map_timeout(
+        _infer_bonds_rdkit_item,
+        zip(chemgraphs, charges),
+        timeout=timeout,
+        num_workers=num_workers,
+    ):
+        if isinstance(result, parallel.TaskError) and fallback is not None:
+            warnings.warn(
+                f"RDKIT bond inference of '{chemgraphs[index].name}' failed with "
+                f"{result.error}. Falling back to '{fallback}'."
+            )
+            result = REGISTRY_INFERENCE_BONDS[fallback](chemgraphs[index])
+
+        results[index] = result
+
+    return results
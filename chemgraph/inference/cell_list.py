@@ -0,0 +1,465 @@
+"""
+Native bond inference with cell lists.
+
+Atoms are binned into a uniform grid with the largest bond cutoff as cell size,
+so every bond connects atoms in the same or in adjacent cells. Candidate pairs of
+all cells are generated in bulk with NumPy and compared against an element-pair
+cutoff matrix built from the covalent radii. Run time and memory are linear in
+the number of atoms.
+"""
+
+from .registry import register_inference
+from .. import chemgraph
+from ..constants import periodic_table
+from ..utils import pbc
+import networkx as nx
+import numpy as np
+
+SKIN = 0.3
+"""
+Default skin (Angstrom) added to the covalent radius of every atom.
+Same default and criterion as ase.neighborlist.NeighborList, which is used by 'cov_radii':
+two atoms are bonded below radius_1 + radius_2 + 2 * skin.
+"""
+
+BRUTE_FORCE_SIZE = 128
+"""Up to this number of atoms all pairs are compared directly instead of binned."""
+
+# The 13 neighbor cells of the upper half-shell. Together with the cell itself every
+# pair of adjacent cells is visited exactly once.
+HALF_SHELL = np.array(
+    [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ],
+    dtype=np.int64,
+)
+
+# -------------------------------------------------------------------------------------- #
+
+
+def cutoff_matrix(
+    radii: dict = periodic_table.COVALENT_RADII, skin: float = SKIN
+) -> np.ndarray:
+    """
+    Bond cutoffs of all element pairs: (radii[z_1] + skin) + (radii[z_2] + skin).
+
+    Args:
+    -----
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin added to the radius of every atom.
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (Z, Z) indexed by atomic numbers.
+    """
+    radii = np.array([radii[z] for z in range(max(radii) + 1)], dtype=np.float64)
+    radii = radii + skin
+    return radii[:, None] + radii[None, :]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _cell_pairs(
+    cell_ids: np.ndarray, cells_1: np.ndarray, cells_2: np.ndarray, same: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    All pairs of atoms of cells_1[k] and cells_2[k], with atoms sorted by cell id.
+
+    Args:
+    -----
+        cell_ids: np.ndarray
+            Sorted cell id (N,) of every atom.
+        cells_1, cells_2: np.ndarray
+            Matching ids of occupied cells.
+        same: bool
+            If True, cells_1 equals cells_2 and only pairs with i < j are returned.
+
+    Returns:
+    --------
+        tuple[np.ndarray, np.ndarray]
+            Atom positions (P,) in the sorted order.
+    """
+    start_1 = np.searchsorted(cell_ids, cells_1, side="left")
+    count_1 = np.searchsorted(cell_ids, cells_1, side="right") - start_1
+    start_2 = np.searchsorted(cell_ids, cells_2, side="left")
+    count_2 = np.searchsorted(cell_ids, cells_2, side="right") - start_2
+
+    # One row per atom i of cells_1, paired with every atom of the matching cells_2.
+    ind_1 = np.repeat(start_1, count_1) + _ranges(count_1)
+    start_2 = np.repeat(start_2, count_1)
+    count_2 = np.repeat(count_2, count_1)
+
+    if same:
+        # Only partners behind atom i within the same cell.
+        count_2 = start_2 + count_2 - ind_1 - 1
+        start_2 = ind_1 + 1
+
+    ind_2 = np.repeat(start_2, count_2) + _ranges(count_2)
+    ind_1 = np.repeat(ind_1, count_2)
+
+    return ind_1, ind_2
+
+
+def _ranges(counts: np.ndarray) -> np.ndarray:
+    """Concatenation of np.arange(count) for all counts."""
+    total = int(counts.sum())
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(total, dtype=np.int64) - offsets
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def neighbor_pairs(
+    positions: np.ndarray, cutoff: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds all pairs of atoms closer than cutoff with a cell list.
+
+    Args:
+    -----
+        positions: np.ndarray
+            Positions (N, 3).
+        cutoff: float
+            Maximum distance of a pair.
+
+    Returns:
+    --------
+        rows_1, rows_2: np.ndarray
+            Int64 arrays (P,) of atom rows with rows_1 < rows_2.
+        distances: np.ndarray
+            Float64 array (P,) of pair distances.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    num_atoms = len(positions)
+
+    if num_atoms < 2 or cutoff <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), np.empty(0, dtype=np.float64)
+
+    if num_atoms <= BRUTE_FORCE_SIZE:
+        # Small molecules: all pairs are cheaper than building the grid.
+        rows_1, rows_2 = np.triu_indices(num_atoms, k=1)
+        distances = np.sqrt(
+            np.sum((positions[rows_1] - positions[rows_2]) ** 2, axis=1)
+        )
+        mask = distances < cutoff
+        return rows_1[mask], rows_2[mask], distances[mask]
+
+    coords = np.floor((positions - positions.min(axis=0)) / cutoff).astype(np.int64)
+    # Pad by one cell so neighbor coordinates never wrap around.
+    shape = coords.max(axis=0) + 3
+    coords += 1
+
+    ids = (coords[:, 0] * shape[1] + coords[:, 1]) * shape[2] + coords[:, 2]
+    order = np.argsort(ids, kind="stable")
+    ids_sorted = ids[order]
+    cells = np.unique(ids_sorted)
+
+    pairs_1 = []
+    pairs_2 = []
+
+    ind_1, ind_2 = _cell_pairs(ids_sorted, cells, cells, same=True)
+    pairs_1.append(ind_1)
+    pairs_2.append(ind_2)
+
+    for dx, dy, dz in HALF_SHELL:
+        neighbors = cells + (dx * shape[1] + dy) * shape[2] + dz
+        occupied = np.isin(neighbors, cells, assume_unique=True)
+        ind_1, ind_2 = _cell_pairs(
+            ids_sorted, cells[occupied], neighbors[occupied], same=False
+        )
+        pairs_1.append(ind_1)
+        pairs_2.append(ind_2)
+
+    rows_1 = order[np.concatenate(pairs_1)]
+    rows_2 = order[np.concatenate(pairs_2)]
+
+    distances = np.sqrt(np.sum((positions[rows_1] - positions[rows_2]) ** 2, axis=1))
+    mask = distances < cutoff
+
+    rows_1, rows_2 = np.minimum(rows_1, rows_2)[mask], np.maximum(rows_1, rows_2)[mask]
+    return rows_1, rows_2, distances[mask]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def periodic_neighbor_pairs(
+    positions: np.ndarray, cutoff: float, cell: np.ndarray, pbc: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds all pairs of atoms closer than cutoff under periodic boundary conditions.
+    Atoms are wrapped into the cell and every periodic image within cutoff of the cell
+    is added as a ghost atom, so all images closer than cutoff are found, also in cells
+    smaller than twice the cutoff. If an atom pair is bonded through several images,
+    only the closest (minimum image) is kept. Bonds of an atom to its own images are
+    not returned.
+
+    Args:
+    -----
+        positions: np.ndarray
+            Positions (N, 3).
+        cutoff: float
+            Maximum distance of a pair.
+        cell: np.ndarray
+            Cell (3, 3) with the lattice vectors as rows.
+        pbc: np.ndarray
+            Periodic flags (3,) of the lattice vectors.
+
+    Returns:
+    --------
+        rows_1, rows_2: np.ndarray
+            Int64 arrays (P,) of atom rows with rows_1 < rows_2.
+        shifts: np.ndarray
+            Int64 array (P, 3). The pair vector is
+            positions[rows_2] + shifts @ cell - positions[rows_1].
+        distances: np.ndarray
+            Float64 array (P,) of pair distances.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    cell = np.asarray(cell, dtype=np.float64).reshape(3, 3)
+    pbc = np.broadcast_to(np.asarray(pbc, dtype=bool), (3,))
+    num_atoms = len(positions)
+
+    if abs(np.linalg.det(cell)) < 1e-12:
+        raise ValueError("Periodic boundary conditions need a cell with a volume.")
+
+    # Wrap all atoms into the cell along the periodic axes.
+    cell_inv = np.linalg.inv(cell)
+    fractional = positions @ cell_inv
+    wrap = np.where(pbc, np.floor(fractional), 0.0).astype(np.int64)
+    fractional -= wrap
+    positions_wrapped = positions - wrap @ cell
+
+    # Width of the band of images closer than cutoff to the cell, in fractional units.
+    band = np.where(pbc, cutoff * np.linalg.norm(cell_inv, axis=0), 0.0)
+    num_images = np.ceil(band).astype(np.int64)
+
+    images = np.stack(
+        np.meshgrid(*[np.arange(-n, n + 1) for n in num_images], indexing="ij"),
+        axis=-1,
+    ).reshape(-1, 3)
+    images = images[np.any(images != 0, axis=1)]
+
+    ghost_rows = [np.arange(num_atoms)]
+    ghost_images = [np.zeros((num_atoms, 3), dtype=np.int64)]
+    for image in images:
+        fractional_image = fractional + image
+        inside = np.all(
+            ~pbc | ((fractional_image >= -band) & (fractional_image < 1.0 + band)),
+            axis=1,
+        )
+        rows = np.nonzero(inside)[0]
+        ghost_rows.append(rows)
+        ghost_images.append(np.broadcast_to(image, (len(rows), 3)))
+
+    ghost_rows = np.concatenate(ghost_rows)
+    ghost_images = np.concatenate(ghost_images)
+
+    rows_1, rows_2, distances = neighbor_pairs(
+        positions_wrapped[ghost_rows] + ghost_images @ cell, cutoff
+    )
+
+    # Keep pairs starting at a real atom. Every bond appears once from each side,
+    # so only pairs towards a larger row are kept.
+    mask = rows_1 < num_atoms
+    rows_1, rows_2, distances = rows_1[mask], rows_2[mask], distances[mask]
+    rows_2, image = ghost_rows[rows_2], ghost_images[rows_2]
+
+    mask = rows_1 < rows_2
+    rows_1, rows_2, image, distances = (
+        rows_1[mask],
+        rows_2[mask],
+        image[mask],
+        distances[mask],
+    )
+    shifts = image - wrap[rows_2] + wrap[rows_1]
+
+    # Minimum image of atom pairs bonded through several images.
+    order = np.lexsort((distances, rows_2, rows_1))
+    rows_1, rows_2, shifts, distances = (
+        rows_1[order],
+        rows_2[order],
+        shifts[order],
+        distances[order],
+    )
+    first = np.ones(len(rows_1), dtype=bool)
+    first[1:] = (rows_1[1:] != rows_1[:-1]) | (rows_2[1:] != rows_2[:-1])
+
+    return rows_1[first], rows_2[first], shifts[first], distances[first]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def bond_rows(
+    positions: np.ndarray,
+    atomic_numbers: np.ndarray,
+    radii: dict = periodic_table.COVALENT_RADII,
+    skin: float = SKIN,
+) -> np.ndarray:
+    """
+    Infers bonds from positions and covalent radii with a cell list.
+    Two atoms are bonded if their distance is below radius_1 + radius_2 + 2 * skin.
+
+    Args:
+    -----
+        positions: np.ndarray
+            Positions (N, 3).
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin added to the radius of every atom.
+
+    Returns:
+    --------
+        np.ndarray
+            Int64 array (M, 2) of atom rows, sorted, with rows[:, 0] < rows[:, 1].
+    """
+    atomic_numbers = np.asarray(atomic_numbers, dtype=np.int64)
+    cutoffs = cutoff_matrix(radii, skin)
+
+    if len(atomic_numbers) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    elements = np.unique(atomic_numbers)
+    max_cutoff = cutoffs[np.ix_(elements, elements)].max()
+
+    rows_1, rows_2, distances = neighbor_pairs(positions, max_cutoff)
+    mask = distances < cutoffs[atomic_numbers[rows_1], atomic_numbers[rows_2]]
+
+    rows = np.stack([rows_1[mask], rows_2[mask]], axis=1)
+    return rows[np.lexsort((rows[:, 1], rows[:, 0]))]
+
+
+def periodic_bond_rows(
+    positions: np.ndarray,
+    atomic_numbers: np.ndarray,
+    cell: np.ndarray,
+    pbc: np.ndarray,
+    radii: dict = periodic_table.COVALENT_RADII,
+    skin: float = SKIN,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Infers bonds from positions and covalent radii under periodic boundary conditions.
+    Two atoms are bonded if the distance of their closest images is below
+    radius_1 + radius_2 + 2 * skin.
+
+    Args:
+    -----
+        positions: np.ndarray
+            Positions (N, 3).
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        cell: np.ndarray
+            Cell (3, 3) with the lattice vectors as rows.
+        pbc: np.ndarray
+            Periodic flags (3,) of the lattice vectors.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin added to the radius of every atom.
+
+    Returns:
+    --------
+        rows: np.ndarray
+            Int64 array (M, 2) of atom rows, sorted, with rows[:, 0] < rows[:, 1].
+        shifts: np.ndarray
+            Int64 array (M, 3) of image shifts of the atoms rows[:, 1].
+    """
+    atomic_numbers = np.asarray(atomic_numbers, dtype=np.int64)
+    cutoffs = cutoff_matrix(radii, skin)
+
+    if len(atomic_numbers) == 0:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 3), dtype=np.int64)
+
+    elements = np.unique(atomic_numbers)
+    max_cutoff = cutoffs[np.ix_(elements, elements)].max()
+
+    rows_1, rows_2, shifts, distances = periodic_neighbor_pairs(
+        positions, max_cutoff, cell, pbc
+    )
+    mask = distances < cutoffs[atomic_numbers[rows_1], atomic_numbers[rows_2]]
+
+    return np.stack([rows_1[mask], rows_2[mask]], axis=1), shifts[mask]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+@register_inference("cell_list")
+def infer_bonds_cell_list(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    radii: dict = periodic_table.COVALENT_RADII,
+    skin: float = SKIN,
+):
+    """
+    Infers the bonds of a graph or ChemGraph using covalent radii and cell lists.
+    Same criterion as 'cov_radii' without the round trip through ASE.
+    All bond orders are assumed to be 1.
+    For periodic graphs (see utils.pbc) bonds across the cell boundary get their
+    image shift as edge attribute 'shift'.
+
+    Args:
+    -----
+        chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph
+            Representation of a molecule as a ChemGraph or a Graph.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin (Angstrom) added to the covalent radius of every atom.
+
+    Returns:
+    --------
+        list
+    """
+    cg = chemgraph_or_graph
+    if isinstance(chemgraph_or_graph, nx.Graph):
+        cg = chemgraph.ChemGraph(name="g", graph=cg)
+
+    cell = pbc.cell(cg.graph)
+    if cell is None:
+        rows = bond_rows(cg.positions, cg.atomic_numbers, radii=radii, skin=skin)
+        edges = cg.node_indices[rows].tolist()
+
+        return [(node_1, node_2, {"bond_order": 1}) for node_1, node_2 in edges]
+
+    rows, shifts = periodic_bond_rows(
+        cg.positions,
+        cg.atomic_numbers,
+        cell,
+        cg.graph.graph["pbc"],
+        radii=radii,
+        skin=skin,
+    )
+    edges, shifts = pbc.orient_shifts(cg.node_indices[rows], shifts)
+
+    return [
+        (
+            node_1,
+            node_2,
+            {"bond_order": 1, "shift": tuple(shift)}
+            if any(shift)
+            else {"bond_order": 1},
+        )
+        for (node_1, node_2), shift in zip(edges.tolist(), shifts.tolist())
+    ]
@@ -0,0 +1,265 @@
+"""
+Streaming detection of reaction events in trajectories.
+
+ReactionDetector tracks the bonds of every frame with a BondTracker and reports the
+bonds formed and broken since the previous frame. Bonds follow a hysteresis
+('break_skin', see tracking.BondTracker), so vibrations around the bond cutoff do
+not register as events. Changes of the connected components (fragmentation and
+recombination of molecules) are reported alongside. Only the bonds and component
+labels of the previous frame are kept, so memory does not grow with the number of
+frames.
+"""
+
+from dataclasses import dataclass
+
+from . import cell_list
+from .tracking import VERLET_SKIN, BondTracker
+from .. import chemgraph
+from ..constants import periodic_table
+import networkx as nx
+import numpy as np
+
+from typing import Iterable, Iterator
+
+BREAK_SKIN = 0.3
+"""Default hysteresis (Angstrom): bonds break only beyond cutoff + BREAK_SKIN."""
+
+# -------------------------------------------------------------------------------------- #
+
+
+@dataclass
+class ReactionFrame:
+    """
+    Bond and fragment changes of one trajectory frame against the previous frame.
+    The first frame has no events.
+    """
+
+    frame: int
+    """Index of the frame."""
+    formed: np.ndarray
+    """Int64 array (K, 2) of node indices of the bonds formed, sorted."""
+    broken: np.ndarray
+    """Int64 array (K, 2) of node indices of the bonds broken, sorted."""
+    num_components: int
+    """Number of connected components (molecules) of the frame."""
+    num_fragmented: int
+    """Number of components of the previous frame that split up."""
+    num_recombined: int
+    """Number of components of the frame joined from several previous ones."""
+
+    # ============================================================= #
+
+    @property
+    def has_events(self) -> bool:
+        """True if any bond was formed or broken."""
+        return len(self.formed) > 0 or len(self.broken) > 0
+
+    # ============================================================= #
+
+    def to_events(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the events as compact (frame, ind_1, ind_2) rows.
+
+        Returns:
+        --------
+            formed, broken: np.ndarray
+                Int64 arrays (K, 3).
+        """
+        return tuple(
+            np.column_stack([np.full(len(edges), self.frame, dtype=np.int64), edges])
+            for edges in (self.formed, self.broken)
+        )
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _component_labels(num_atoms: int, rows: np.ndarray) -> np.ndarray:
+    """
+    Labels (N,) of the connected components of a graph given by bonded atom rows (M, 2).
+    Vectorized union-find: roots are hooked to the smallest neighboring root and the
+    forest is compressed by pointer jumping until no bond connects two roots.
+    Labels are the smallest atom row of every component.
+    """
+    labels = np.arange(num_atoms)
+
+    while True:
+        roots_1, roots_2 = labels[rows[:, 0]], labels[rows[:, 1]]
+        if (roots_1 == roots_2).all():
+            return labels
+
+        np.minimum.at(labels, roots_1, roots_2)
+        np.minimum.at(labels, roots_2, roots_1)
+
+        while True:
+            parents = labels[labels]
+            if (parents == labels).all():
+                break
+            labels = parents
+
+
+def _edge_keys(rows: np.ndarray, num_atoms: int) -> np.ndarray:
+    """Sorted scalar keys (M,) of atom row pairs."""
+    return np.sort(rows[:, 0] * num_atoms + rows[:, 1])
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+class ReactionDetector:
+    """
+    Detects bond formation, bond breaking, fragmentation and recombination frame by
+    frame.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecule (or system) of the trajectory, see tracking.BondTracker.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin added to the radius of every atom, see cell_list.SKIN.
+        break_skin: float
+            Default: 0.3
+            Hysteresis. Existing bonds break only beyond cutoff + break_skin.
+        verlet_skin: float
+            Default: 1.0
+            Margin of the Verlet list, see tracking.BondTracker.
+    """
+
+    def __init__(
+        self,
+        chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+        radii: dict = periodic_table.COVALENT_RADII,
+        skin: float = cell_list.SKIN,
+        break_skin: float = BREAK_SKIN,
+        verlet_skin: float = VERLET_SKIN,
+    ):
+        self.tracker = BondTracker(
+            chemgraph_or_graph,
+            radii=radii,
+            skin=skin,
+            verlet_skin=verlet_skin,
+            break_skin=break_skin,
+        )
+        self.num_atoms = len(self.tracker.atomic_numbers)
+
+        self._keys = None
+        self._labels = None
+        self._num_components = 0
+
+    def _edges(self, keys: np.ndarray) -> np.ndarray:
+        """Sorted node indices (K, 2) of scalar row pair keys."""
+        edges = np.sort(
+            self.tracker.node_indices[
+                np.stack([keys // self.num_atoms, keys % self.num_atoms], axis=1)
+            ],
+            axis=1,
+        )
+        return edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+    def update(self, positions: np.ndarray) -> ReactionFrame:
+        """
+        Processes the next frame.
+
+        Args:
+        -----
+            positions: np.ndarray
+                Positions (N, 3) in node order.
+
+        Returns:
+        --------
+            ReactionFrame
+        """
+        frame = self.tracker.num_frames
+        rows = self.tracker.update_rows(positions)
+        keys = _edge_keys(rows, self.num_atoms)
+
+        if self._keys is None:
+            formed = broken = np.empty(0, dtype=np.int64)
+        else:
+            formed = np.setdiff1d(keys, self._keys, assume_unique=True)
+            broken = np.setdiff1d(self._keys, keys, assume_unique=True)
+
+        num_fragmented = num_recombined = 0
+        if self._keys is None or len(formed) or len(broken):
+            labels = _component_labels(self.num_atoms, rows)
+
+            if self._labels is not None:
+                # Unique (previous, current) component pairs of all atoms.
+                pairs = np.unique(self._labels * self.num_atoms + labels)
+                previous, current = pairs // self.num_atoms, pairs % self.num_atoms
+                num_fragmented = int(np.count_nonzero(np.bincount(previous) > 1))
+                num_recombined = int(np.count_nonzero(np.bincount(current) > 1))
+
+            self._labels = labels
+            self._num_components = int(
+                np.count_nonzero(labels == np.arange(self.num_atoms))
+            )
+
+        self._keys = keys
+
+        return ReactionFrame(
+            frame=frame,
+            formed=self._edges(formed),
+            broken=self._edges(broken),
+            num_components=self._num_components,
+            num_fragmented=num_fragmented,
+            num_recombined=num_recombined,
+        )
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_reactions(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    frames: Iterable[np.ndarray | dict],
+    radii: dict = periodic_table.COVALENT_RADII,
+    skin: float = cell_list.SKIN,
+    break_skin: float = BREAK_SKIN,
+    verlet_skin: float = VERLET_SKIN,
+    events_only: bool = False,
+) -> Iterator[ReactionFrame]:
+    """
+    Streams the reaction events of a trajectory, see ReactionDetector.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecule (or system) of the trajectory.
+        frames: Iterable[np.ndarray | dict]
+            Positions (N, 3) per frame, or frames of a registered iterator
+            (e.g. io.xyz.iter_xyz) with key 'positions'.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+        skin: float
+            Default: 0.3
+        break_skin: float
+            Default: 0.3
+        verlet_skin: float
+            Default: 1.0
+        events_only: bool
+            Default: False
+            If True, only frames with formed or broken bonds are yielded.
+
+    Yields:
+    -------
+        ReactionFrame
+    """
+    detector = ReactionDetector(
+        chemgraph_or_graph,
+        radii=radii,
+        skin=skin,
+        break_skin=break_skin,
+        verlet_skin=verlet_skin,
+    )
+
+    for frame in frames:
+        positions = frame["positions"] if isinstance(frame, dict) else frame
+        reaction_frame = detector.update(positions)
+
+        if not events_only or reaction_frame.has_events:
+            yield reaction_frame
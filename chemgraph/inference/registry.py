@@ -0,0 +1,24 @@
+"""
+Registry of the bond inference methods. The module of a method is imported on first
+use, see utils.plugins.LazyRegistry.
+"""
+
+from ..utils.plugins import LazyRegistry
+
+REGISTRY_INFERENCE_BONDS = LazyRegistry(
+    {
+        "cell_list": ".inference.cell_list",
+        "cov_radii": ".inference.bonds",
+        "rdkit": ".inference.bonds",
+        "valence": ".inference.valence",
+    },
+    group="chemgraph.inference.bonds",
+)
+
+
+def register_inference(name):
+    def wrapper(func):
+        REGISTRY_INFERENCE_BONDS[name] = func
+        return func
+
+    return wrapper
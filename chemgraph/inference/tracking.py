@@ -0,0 +1,246 @@
+"""
+Incremental bond inference across the frames of a trajectory.
+
+BondTracker keeps a Verlet list: all atom pairs closer than their bond cutoff plus
+a margin ('verlet_skin'), found once with cell lists. As long as no atom has moved
+more than half the margin since the list was built, no pair outside of the list can
+have come within its bond cutoff, so every frame only re-checks the listed pairs.
+The list is rebuilt automatically when some atom moves further.
+
+With a positive 'break_skin' bonds follow a hysteresis: a bond forms below its
+bond cutoff but only breaks beyond cutoff + break_skin, so vibrations around the
+cutoff do not toggle it.
+"""
+
+from . import cell_list
+from .. import chemgraph
+from ..constants import periodic_table
+from ..utils import pbc
+import networkx as nx
+import numpy as np
+
+from typing import Iterable, Iterator
+
+VERLET_SKIN = 1.0
+"""Default margin (Angstrom) of the Verlet list on top of the bond cutoffs."""
+
+# -------------------------------------------------------------------------------------- #
+
+
+class BondTracker:
+    """
+    Tracks the bonds of a molecule with fixed atoms over trajectory frames.
+    Uses the criterion of the 'cell_list' (and 'cov_radii') inference method.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecule. Atomic numbers, node indices and the cell (see utils.pbc)
+            are taken from it, positions are passed per frame.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+            Covalent radii indexed by atomic number.
+        skin: float
+            Default: 0.3
+            Skin added to the radius of every atom, see cell_list.SKIN.
+        verlet_skin: float
+            Default: 1.0
+            Margin of the Verlet list. Larger margins rebuild less often but
+            re-check more pairs per frame.
+        break_skin: float
+            Default: 0.0
+            Hysteresis. Existing bonds break only beyond cutoff + break_skin.
+
+    Attributes:
+    -----------
+        num_frames: int
+            Number of frames processed.
+        num_rebuilds: int
+            Number of Verlet list builds.
+    """
+
+    def __init__(
+        self,
+        chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+        radii: dict = periodic_table.COVALENT_RADII,
+        skin: float = cell_list.SKIN,
+        verlet_skin: float = VERLET_SKIN,
+        break_skin: float = 0.0,
+    ):
+        cg = chemgraph_or_graph
+        if isinstance(chemgraph_or_graph, nx.Graph):
+            cg = chemgraph.ChemGraph(name="g", graph=cg)
+
+        if verlet_skin <= 0.0:
+            raise ValueError("verlet_skin must be positive.")
+        if break_skin < 0.0:
+            raise ValueError("break_skin must not be negative.")
+
+        self.node_indices = cg.node_indices.copy()
+        self.atomic_numbers = cg.atomic_numbers.copy()
+        self.cell = pbc.cell(cg.graph)
+        self.pbc = cg.graph.graph.get("pbc")
+        self.verlet_skin = verlet_skin
+        self.break_skin = break_skin
+
+        self._cutoffs = cell_list.cutoff_matrix(radii, skin)
+        elements = np.unique(self.atomic_numbers)
+        self._max_cutoff = (
+            self._cutoffs[np.ix_(elements, elements)].max() if len(elements) else 0.0
+        )
+
+        self._reference = None
+        self._rows = np.empty((0, 2), dtype=np.int64)
+        self._offsets = np.empty((0, 3), dtype=np.float64)
+        self._pair_cutoffs = np.empty(0, dtype=np.float64)
+        self._bonded = np.empty(0, dtype=bool)
+
+        self.num_frames = 0
+        self.num_rebuilds = 0
+
+    def _build(self, positions: np.ndarray):
+        """Builds the Verlet list of all pairs within cutoff + break_skin + verlet_skin."""
+        margin = self.break_skin + self.verlet_skin
+        cutoff = self._max_cutoff + margin
+
+        if self.cell is None:
+            rows_1, rows_2, distances = cell_list.neighbor_pairs(positions, cutoff)
+            offsets = np.zeros((len(rows_1), 3))
+        else:
+            rows_1, rows_2, shifts, distances = cell_list.periodic_neighbor_pairs(
+                positions, cutoff, self.cell, self.pbc
+            )
+            offsets = shifts @ self.cell
+
+        pair_cutoffs = self._cutoffs[
+            self.atomic_numbers[rows_1], self.atomic_numbers[rows_2]
+        ]
+        mask = distances < pair_cutoffs + margin
+        rows = np.stack([rows_1[mask], rows_2[mask]], axis=1)
+
+        # Carry the bonds of the previous frame over to the new list.
+        num_atoms = len(self.atomic_numbers)
+        bonded = self._rows[self._bonded]
+        self._bonded = np.isin(
+            rows[:, 0] * num_atoms + rows[:, 1], bonded[:, 0] * num_atoms + bonded[:, 1]
+        )
+
+        self._rows = rows
+        self._offsets = offsets[mask]
+        self._pair_cutoffs = pair_cutoffs[mask]
+        self._reference = positions.copy()
+        self.num_rebuilds += 1
+
+    def _needs_build(self, positions: np.ndarray) -> bool:
+        """True if some atom moved more than verlet_skin / 2 since the last build."""
+        if self._reference is None:
+            return True
+
+        displacements = np.einsum(
+            "ij,ij->i", positions - self._reference, positions - self._reference
+        )
+        return displacements.max(initial=0.0) > (0.5 * self.verlet_skin) ** 2
+
+    def update_rows(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Infers the bonds of the next frame as atom rows.
+
+        Args:
+        -----
+            positions: np.ndarray
+                Positions (N, 3) in node order.
+
+        Returns:
+        --------
+            np.ndarray
+                Int64 array (M, 2) of atom rows of all bonds, sorted,
+                with rows[:, 0] < rows[:, 1].
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.shape != (len(self.atomic_numbers), 3):
+            raise ValueError(
+                f"Expected positions of shape ({len(self.atomic_numbers)}, 3), "
+                f"got {positions.shape}."
+            )
+
+        if self._needs_build(positions):
+            self._build(positions)
+
+        vectors = (
+            positions[self._rows[:, 1]] + self._offsets - positions[self._rows[:, 0]]
+        )
+        distances_sq = np.einsum("ij,ij->i", vectors, vectors)
+        self._bonded = (distances_sq < self._pair_cutoffs**2) | (
+            self._bonded & (distances_sq < (self._pair_cutoffs + self.break_skin) ** 2)
+        )
+        rows = self._rows[self._bonded]
+
+        self.num_frames += 1
+
+        return rows[np.lexsort((rows[:, 1], rows[:, 0]))]
+
+    def update(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Infers the bonds of the next frame.
+
+        Args:
+        -----
+            positions: np.ndarray
+                Positions (N, 3) in node order.
+
+        Returns:
+        --------
+            np.ndarray
+                Int64 array (M, 2) of node indices of all bonds, smaller index
+                first, sorted.
+        """
+        edges = np.sort(self.node_indices[self.update_rows(positions)], axis=1)
+        return edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_bonds(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    frames: Iterable[np.ndarray | dict],
+    radii: dict = periodic_table.COVALENT_RADII,
+    skin: float = cell_list.SKIN,
+    verlet_skin: float = VERLET_SKIN,
+    break_skin: float = 0.0,
+) -> Iterator[np.ndarray]:
+    """
+    Streams the bonds of every frame of a trajectory, see BondTracker.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecule of the trajectory.
+        frames: Iterable[np.ndarray | dict]
+            Positions (N, 3) per frame, or frames of a registered iterator
+            (e.g. io.xyz.iter_xyz) with key 'positions'.
+        radii: dict
+            Default: periodic_table.COVALENT_RADII
+        skin: float
+            Default: 0.3
+        verlet_skin: float
+            Default: 1.0
+        break_skin: float
+            Default: 0.0
+
+    Yields:
+    -------
+        np.ndarray
+            Int64 array (M, 2) of node indices of all bonds of the frame, sorted.
+    """
+    tracker = BondTracker(
+        chemgraph_or_graph,
+        radii=radii,
+        skin=skin,
+        verlet_skin=verlet_skin,
+        break_skin=break_skin,
+    )
+
+    for frame in frames:
+        positions = frame["positions"] if isinstance(frame, dict) else frame
+        yield tracker.update(positions)
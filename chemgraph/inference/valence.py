@@ -0,0 +1,682 @@
+"""
+Native bond order perception from connectivity and valence rules.
+
+Every atom gets the smallest allowed valence (periodic_table.VALENCES) that fits
+its degree; the difference is its unsaturation. Multiple bonds are placed on the
+compressed sparse row adjacency in two stages:
+
+1. Forced assignments: an unsaturated atom with a single unsaturated neighbor
+   must share all of its unsaturation with it (chains, carbonyls, nitriles).
+2. Rings and other ambiguous systems get a Kekule structure from a greedy
+   matching that starts at the most constrained atoms. Should it leave atoms
+   unsaturated, a maximum cardinality matching (networkx) is tried as well.
+
+Atoms left unsaturated are the charged ones. For positive charges, three-bonded
+nitrogens next to them may take a double bond (pyridinium, iminium). For negative
+charges, terminal O, N and S atoms may keep a lone pair instead of a double bond
+(phenoxide, thiolate).
+Charge-separated structures of neutral molecules are not perceived: [C-]#[O+]
+becomes C=O, azides R-N=N-N and nitro groups R-N(-O)-O keep atoms unsaturated.
+Finally rings (and pairs of fused rings) with a Hueckel count of 4n + 2 pi
+electrons are marked aromatic with bond order 1.5. Double bonds shared with an
+aromatic ring count for the rings next to it, until no more rings are found.
+"""
+
+from .registry import REGISTRY_INFERENCE_BONDS, register_inference
+from .. import chemgraph
+from ..constants import periodic_table
+import networkx as nx
+import numpy as np
+import heapq
+
+from collections import deque
+from itertools import combinations
+
+MAX_AROMATIC_RING_SIZE = 8
+"""Largest ring considered for aromaticity."""
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _csr(num_atoms: int, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Adjacency (CSR) of bonded atom rows (M, 2).
+
+    Returns:
+    --------
+        indptr: np.ndarray
+            Int64 array (N + 1,).
+        neighbors: np.ndarray
+            Int64 array (2 * M,) of neighbor rows.
+        bond_ids: np.ndarray
+            Int64 array (2 * M,) of the bond (row of 'rows') to every neighbor.
+    """
+    rows_from = np.concatenate([rows[:, 0], rows[:, 1]])
+    rows_to = np.concatenate([rows[:, 1], rows[:, 0]])
+    bond_ids = np.concatenate([np.arange(len(rows))] * 2)
+    order = np.argsort(rows_from, kind="stable")
+
+    indptr = np.zeros(num_atoms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows_from, minlength=num_atoms), out=indptr[1:])
+
+    return indptr, rows_to[order], bond_ids[order]
+
+
+def valences(atomic_numbers: np.ndarray, degrees: np.ndarray) -> np.ndarray:
+    """
+    Valence (N,) of every atom: the smallest allowed valence >= degree.
+    Elements without tabulated valences (or more bonds than any) keep their degree.
+
+    Args:
+    -----
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        degrees: np.ndarray
+            Degrees (N,).
+
+    Returns:
+    --------
+        np.ndarray
+            Int64 array (N,).
+    """
+    result = np.array(degrees, dtype=np.int64)
+
+    for atom_number in np.unique(atomic_numbers):
+        allowed = periodic_table.VALENCES.get(int(atom_number))
+        if allowed is None:
+            continue
+
+        mask = atomic_numbers == atom_number
+        target = result[mask]
+        for valence in allowed[::-1]:
+            target = np.where(degrees[mask] <= valence, valence, target)
+
+        result[mask] = target
+
+    return result
+
+
+def _raise_valences(
+    atomic_numbers: np.ndarray,
+    csr: tuple[np.ndarray, np.ndarray, np.ndarray],
+    valence: np.ndarray,
+    unsaturation: np.ndarray,
+) -> list:
+    """
+    Raises hypervalent atoms (P, S, ...) next to unsaturated atoms to their next
+    allowed valence, e.g. for sulfones and phosphates. In place.
+    Returns the raised atoms.
+    """
+    indptr, neighbors, _ = csr
+    raised = []
+
+    for atom in np.nonzero(unsaturation > 0)[0].tolist():
+        for neighbor in neighbors[indptr[atom] : indptr[atom + 1]].tolist():
+            larger = [
+                allowed
+                for allowed in periodic_table.VALENCES.get(
+                    int(atomic_numbers[neighbor]), ()
+                )
+                if allowed > valence[neighbor]
+            ]
+            if larger and unsaturation[neighbor] == 0:
+                unsaturation[neighbor] += larger[0] - valence[neighbor]
+                valence[neighbor] = larger[0]
+                raised.append(neighbor)
+
+    return raised
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _saturate_forced(
+    indptr: list,
+    neighbors: list,
+    bond_ids: list,
+    unsaturation: list,
+    orders: list,
+    atoms,
+):
+    """
+    Forced assignments: atoms with exactly one unsaturated neighbor share their
+    unsaturation with it. Propagates along the adjacency from the given atoms.
+    Operates on lists, in place. Returns the atoms that became saturated.
+    """
+    queue = deque(atoms)
+    saturated = []
+
+    while queue:
+        atom = queue.popleft()
+        if unsaturation[atom] == 0:
+            continue
+
+        open_slots = [
+            slot
+            for slot in range(indptr[atom], indptr[atom + 1])
+            if unsaturation[neighbors[slot]] > 0
+        ]
+        if len(open_slots) != 1:
+            continue
+
+        neighbor = neighbors[open_slots[0]]
+        extra = min(unsaturation[atom], unsaturation[neighbor])
+
+        orders[bond_ids[open_slots[0]]] += extra
+        unsaturation[atom] -= extra
+        unsaturation[neighbor] -= extra
+        saturated.extend(a for a in (atom, neighbor) if unsaturation[a] == 0)
+
+        queue.extend(neighbors[indptr[neighbor] : indptr[neighbor + 1]])
+        queue.append(neighbor)
+
+    return saturated
+
+
+def _saturate_greedy(
+    indptr: list, neighbors: list, bond_ids: list, unsaturation: list, orders: list
+):
+    """
+    Greedy matching: repeatedly places a multiple bond at the unsaturated atom with
+    the fewest unsaturated neighbors, towards its most constrained neighbor, and
+    propagates the forced assignments. Operates on lists, in place.
+    The atoms are kept in a heap keyed by their number of unsaturated neighbors.
+    Only the neighbors of atoms that became saturated are re-keyed, so run time is
+    linear (up to the heap) in the number of atoms.
+    """
+
+    def open_slots(atom: int) -> list:
+        return [
+            slot
+            for slot in range(indptr[atom], indptr[atom + 1])
+            if unsaturation[neighbors[slot]] > 0
+        ]
+
+    heap = [
+        (len(slots), atom)
+        for atom in range(len(unsaturation))
+        if unsaturation[atom] > 0 and (slots := open_slots(atom))
+    ]
+    heapq.heapify(heap)
+
+    while heap:
+        num_slots, atom = heapq.heappop(heap)
+        if unsaturation[atom] == 0:
+            continue
+
+        # Entries are pushed again whenever a neighbor becomes saturated,
+        # so outdated entries are skipped.
+        slots = open_slots(atom)
+        if len(slots) != num_slots:
+            continue
+
+        slot = min(slots, key=lambda slot: len(open_slots(neighbors[slot])))
+        neighbor = neighbors[slot]
+
+        orders[bond_ids[slot]] += 1
+        unsaturation[atom] -= 1
+        unsaturation[neighbor] -= 1
+
+        saturated = [a for a in (atom, neighbor) if unsaturation[a] == 0]
+        saturated += _saturate_forced(
+            indptr,
+            neighbors,
+            bond_ids,
+            unsaturation,
+            orders,
+            neighbors[indptr[atom] : indptr[atom + 1]]
+            + neighbors[indptr[neighbor] : indptr[neighbor + 1]]
+            + [atom, neighbor],
+        )
+
+        for other in {atom, neighbor}.union(
+            *(neighbors[indptr[a] : indptr[a + 1]] for a in saturated)
+        ):
+            if unsaturation[other] > 0 and (slots := open_slots(other)):
+                heapq.heappush(heap, (len(slots), other))
+
+
+def _saturate_matching(rows: np.ndarray, unsaturation: list, orders: list) -> list:
+    """
+    Adds one bond order to every bond of a maximum cardinality matching of the
+    unsaturated subgraph. Operates on lists, in place.
+    Returns the atoms whose unsaturation changed.
+    """
+    graph = nx.Graph()
+    for bond_id, (row_1, row_2) in enumerate(rows.tolist()):
+        if unsaturation[row_1] > 0 and unsaturation[row_2] > 0:
+            graph.add_edge(row_1, row_2, bond_id=bond_id)
+
+    changed = []
+    for row_1, row_2 in nx.max_weight_matching(graph, maxcardinality=True):
+        orders[graph.edges[row_1, row_2]["bond_id"]] += 1
+        unsaturation[row_1] -= 1
+        unsaturation[row_2] -= 1
+        changed.extend((row_1, row_2))
+
+    return changed
+
+
+def _kekulize(
+    rows: np.ndarray,
+    csr: tuple[np.ndarray, np.ndarray, np.ndarray],
+    unsaturation: np.ndarray,
+    orders: np.ndarray,
+):
+    """
+    Places multiple bonds until no bonded pair of unsaturated atoms is left. In place.
+    The greedy matching on the adjacency solves closed-shell molecules in one pass.
+    If it leaves atoms unsaturated, maximum cardinality matchings (nx.max_weight_matching)
+    are tried instead and the better result is kept.
+    """
+    indptr, neighbors, bond_ids = (array.tolist() for array in csr)
+    unsaturation_list, orders_list = unsaturation.tolist(), orders.tolist()
+
+    _saturate_forced(
+        indptr,
+        neighbors,
+        bond_ids,
+        unsaturation_list,
+        orders_list,
+        np.nonzero(unsaturation > 0)[0].tolist(),
+    )
+    unsaturation_matching, orders_matching = unsaturation_list[:], orders_list[:]
+
+    _saturate_greedy(indptr, neighbors, bond_ids, unsaturation_list, orders_list)
+
+    if any(unsaturation_list):
+        atoms = _saturate_matching(rows, unsaturation_matching, orders_matching)
+        while atoms:
+            _saturate_forced(
+                indptr,
+                neighbors,
+                bond_ids,
+                unsaturation_matching,
+                orders_matching,
+                atoms,
+            )
+            atoms = _saturate_matching(rows, unsaturation_matching, orders_matching)
+
+        if sum(unsaturation_matching) < sum(unsaturation_list):
+            unsaturation_list, orders_list = unsaturation_matching, orders_matching
+
+    unsaturation[:] = unsaturation_list
+    orders[:] = orders_list
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _pi_electrons(
+    atom: int,
+    ring_atoms: set,
+    atomic_numbers: np.ndarray,
+    degrees: np.ndarray,
+    partners: dict,
+    aromatic: set,
+) -> int | None:
+    """
+    Pi electrons an atom contributes to a ring system, None if it breaks aromaticity.
+    A double bond to a partner outside the ring counts as 1 electron if the bond is
+    part of an aromatic ring already (fused polycyclic aromatics).
+    """
+    partner = partners.get(atom)
+
+    if partner is not None:
+        if partner in ring_atoms or frozenset((atom, partner)) in aromatic:
+            return 1
+        if atomic_numbers[partner] in (7, 8, 16):  # Exocyclic C=O, C=N, C=S.
+            return 0
+        return None
+
+    atom_number = atomic_numbers[atom]
+    if (atom_number in (7, 15) and degrees[atom] == 3) or (
+        atom_number in (8, 16, 34) and degrees[atom] == 2
+    ):
+        return 2  # Lone pair.
+
+    return None
+
+
+def _smallest_rings(adjacency: dict, max_size: int) -> list[tuple[set, set]]:
+    """
+    Smallest ring through every bond, found by a breadth-first search from one atom
+    of the bond to the other without using the bond itself.
+
+    Returns:
+    --------
+        list[tuple[set, set]]
+            Unique rings as (atoms, bonds). Bonds are frozensets of two atoms.
+    """
+    rings = dict()
+
+    for atom_1, neighbors_1 in adjacency.items():
+        for atom_2 in neighbors_1:
+            if atom_1 > atom_2:
+                continue
+
+            parents = {atom_1: None}
+            frontier = [atom_1]
+            for _ in range(max_size - 1):
+                frontier_next = []
+                for atom in frontier:
+                    for neighbor in adjacency[atom]:
+                        if neighbor in parents or (atom, neighbor) == (atom_1, atom_2):
+                            continue
+                        parents[neighbor] = atom
+                        frontier_next.append(neighbor)
+
+                frontier = frontier_next
+                if atom_2 in parents or not frontier:
+                    break
+
+            if atom_2 not in parents:
+                continue
+
+            path = [atom_2]
+            while path[-1] != atom_1:
+                path.append(parents[path[-1]])
+
+            atoms = frozenset(path)
+            if atoms not in rings:
+                bonds = {frozenset(pair) for pair in zip(path, path[1:] + path[:1])}
+                rings[atoms] = (set(atoms), bonds)
+
+    return list(rings.values())
+
+
+def aromatic_bonds(
+    atomic_numbers: np.ndarray, rows: np.ndarray, orders: np.ndarray
+) -> np.ndarray:
+    """
+    Aromatic bonds of a Kekule structure by the Hueckel 4n + 2 rule.
+    The smallest rings of all bonds are tested first, then pairs of fused rings
+    that are not both aromatic on their own (e.g. azulene, whose shared bond
+    stays localized). Both are repeated with the aromatic bonds found so far
+    until a fixed point, so every ring of a polycyclic aromatic is found whatever
+    its Kekule structure.
+
+    Args:
+    -----
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        rows: np.ndarray
+            Atom rows (M, 2) of the bonds.
+        orders: np.ndarray
+            Bond orders (M,) of a Kekule structure.
+
+    Returns:
+    --------
+        np.ndarray
+            Bool array (M,).
+    """
+    degrees = np.bincount(rows.ravel(), minlength=len(atomic_numbers))
+    partners = dict()
+    for row_1, row_2 in rows[orders == 2].tolist():
+        # Atoms with two double bonds (allenes, cumulenes) are never aromatic.
+        partners[row_1] = -1 if row_1 in partners else row_2
+        partners[row_2] = -1 if row_2 in partners else row_1
+    partners = {atom: partner for atom, partner in partners.items() if partner != -1}
+
+    # Only atoms that can contribute pi electrons can be part of an aromatic ring.
+    capable = np.isin(atomic_numbers, (7, 15)) & (degrees == 3)
+    capable |= np.isin(atomic_numbers, (8, 16, 34)) & (degrees == 2)
+    capable[list(partners)] = True
+
+    adjacency = dict()
+    for row_1, row_2 in rows[capable[rows[:, 0]] & capable[rows[:, 1]]].tolist():
+        adjacency.setdefault(row_1, set()).add(row_2)
+        adjacency.setdefault(row_2, set()).add(row_1)
+
+    # Atoms with less than two neighbors are not in any ring.
+    leaves = [atom for atom, neighbors in adjacency.items() if len(neighbors) < 2]
+    while leaves:
+        atom = leaves.pop()
+        for neighbor in adjacency.pop(atom, ()):
+            adjacency[neighbor].discard(atom)
+            if len(adjacency[neighbor]) == 1:
+                leaves.append(neighbor)
+
+    rings = _smallest_rings(adjacency, MAX_AROMATIC_RING_SIZE)
+
+    def is_aromatic(ring_atoms: set) -> bool:
+        total = 0
+        for atom in ring_atoms:
+            electrons = _pi_electrons(
+                atom, ring_atoms, atomic_numbers, degrees, partners, result
+            )
+            if electrons is None:
+                return False
+            total += electrons
+
+        return total % 4 == 2
+
+    rings_of_bond = dict()
+    for ind_ring, (_, bonds) in enumerate(rings):
+        for bond in bonds:
+            rings_of_bond.setdefault(bond, []).append(ind_ring)
+
+    # Rings next to aromatic rings may become aromatic through their shared double
+    # bonds (anthracene, phenanthrene, pyrene), so the tests repeat until no more
+    # bonds are found.
+    result = set()
+    aromatic = [False] * len(rings)
+    num_bonds = None
+    while num_bonds != len(result):
+        num_bonds = len(result)
+
+        for ind_ring, (atoms, bonds) in enumerate(rings):
+            if not aromatic[ind_ring] and is_aromatic(atoms):
+                aromatic[ind_ring] = True
+                result |= bonds
+
+        for ring_ids in rings_of_bond.values():
+            for ind_1, ind_2 in combinations(ring_ids, 2):
+                (atoms_1, bonds_1), (atoms_2, bonds_2) = rings[ind_1], rings[ind_2]
+                if aromatic[ind_1] and aromatic[ind_2]:
+                    continue
+                if len(atoms_1 & atoms_2) == 2 and is_aromatic(atoms_1 | atoms_2):
+                    result |= bonds_1 ^ bonds_2
+
+    return np.fromiter(
+        (frozenset(pair) in result for pair in rows.tolist()),
+        dtype=bool,
+        count=len(rows),
+    )
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def bond_orders(
+    atomic_numbers: np.ndarray,
+    rows: np.ndarray,
+    charge: int = 0,
+    aromaticity: bool = True,
+) -> np.ndarray:
+    """
+    Perceives bond orders from connectivity, see module docstring.
+
+    Args:
+    -----
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        rows: np.ndarray
+            Atom rows (M, 2) of the bonds.
+        charge: int
+            Default: 0
+            Total charge of the molecule. Zwitterions (e.g. [C-]#[O+], azides,
+            nitro groups) are not supported, see module docstring.
+        aromaticity: bool
+            Default: True
+            If True, bonds of aromatic rings get bond order 1.5.
+            If False, the Kekule structure is returned.
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (M,) of bond orders 1, 2, 3 or 1.5.
+    """
+    atomic_numbers = np.asarray(atomic_numbers, dtype=np.int64)
+    rows = np.asarray(rows, dtype=np.int64).reshape(-1, 2)
+    num_atoms = len(atomic_numbers)
+
+    csr = _csr(num_atoms, rows)
+    degrees = np.diff(csr[0])
+    valence = valences(atomic_numbers, degrees)
+    unsaturation = valence - degrees
+    orders = np.ones(len(rows), dtype=np.int64)
+
+    _kekulize(rows, csr, unsaturation, orders)
+    while unsaturation.any() and _raise_valences(
+        atomic_numbers, csr, valence, unsaturation
+    ):
+        _kekulize(rows, csr, unsaturation, orders)
+
+    # Cations: three-bonded nitrogens next to unsaturated atoms may take a double
+    # bond (pyridinium, iminium). Kept if fewer atoms are left unsaturated.
+    if charge > 0 and unsaturation.any():
+        indptr, neighbors, _ = csr
+        initial = valence - degrees
+        candidates = [
+            atom
+            for atom in np.nonzero(
+                (atomic_numbers == 7) & (degrees == 3) & (initial == 0)
+            )[0].tolist()
+            if initial[neighbors[indptr[atom] : indptr[atom + 1]]].any()
+        ][:charge]
+
+        unsaturation_cation = initial.copy()
+        unsaturation_cation[candidates] += 1
+        orders_cation = np.ones(len(rows), dtype=np.int64)
+        _kekulize(rows, csr, unsaturation_cation, orders_cation)
+
+        if np.count_nonzero(unsaturation_cation) < np.count_nonzero(unsaturation):
+            orders = orders_cation
+
+    # Anions: up to -charge terminal O, N and S atoms of the unsaturated system keep
+    # a lone pair instead of a multiple bond (phenoxide, thiolate, anilide). They are
+    # chosen one at a time, each time the one leaving the fewest atoms unsaturated.
+    if charge < 0 and unsaturation.any():
+        indptr, neighbors, _ = csr
+        initial = valence - degrees
+        left = np.nonzero(unsaturation)[0].tolist()
+
+        # Only the conjugated systems of the atoms left unsaturated are searched.
+        conjugated = nx.Graph(rows[(initial[rows] > 0).all(axis=1)].tolist())
+        system = set(left).union(
+            *(
+                nx.node_connected_component(conjugated, a)
+                for a in left
+                if a in conjugated
+            )
+        )
+        candidates = [
+            atom
+            for atom in sorted(system)
+            if atomic_numbers[atom] in (7, 8, 16)
+            and np.count_nonzero(initial[neighbors[indptr[atom] : indptr[atom + 1]]])
+            == 1
+        ]
+
+        # Nothing to do if only such atoms are left unsaturated (carboxylates).
+        if set(left) <= set(candidates):
+            candidates = []
+
+        anions = []
+        num_unsaturated = len(left)
+        for _ in range(min(-charge, len(candidates))):
+            trials = []
+            for atom in candidates:
+                if atom in anions:
+                    continue
+                unsaturation_anion = initial.copy()
+                unsaturation_anion[anions + [atom]] -= 1
+                orders_anion = np.ones(len(rows), dtype=np.int64)
+                _kekulize(rows, csr, unsaturation_anion, orders_anion)
+                trials.append(
+                    (np.count_nonzero(unsaturation_anion), atom, orders_anion)
+                )
+
+            num_trial = min(trial[0] for trial in trials)
+            if num_trial >= num_unsaturated:
+                break
+
+            # Ties (e.g. phenoxide or quinoid enolate) go to the most aromatic bonds.
+            trials = [trial for trial in trials if trial[0] == num_trial]
+            if len(trials) > 1:
+                trials.sort(
+                    key=lambda trial: np.count_nonzero(
+                        aromatic_bonds(atomic_numbers, rows, trial[2])
+                    ),
+                    reverse=True,
+                )
+
+            num_unsaturated, (_, atom, orders) = num_trial, trials[0]
+            anions.append(atom)
+            if num_unsaturated == 0:
+                break
+
+    orders = orders.astype(np.float64)
+    if aromaticity:
+        orders[aromatic_bonds(atomic_numbers, rows, orders)] = 1.5
+
+    return orders
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+@register_inference("valence")
+def infer_bonds_valence(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    charge: int = 0,
+    connectivity: str | None = "cell_list",
+    aromaticity: bool = True,
+):
+    """
+    Infers bonds with bond orders from valence rules without RDKIT.
+    Connectivity is inferred first (or taken from the graph), then multiple bonds
+    are placed by a matching-based Kekule assignment and aromatic rings are
+    detected by the Hueckel rule, see chemgraph.inference.valence.
+
+    Args:
+    -----
+        chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph
+            Representation of the molecule as ChemGraph or nx.Graph.
+        charge: int
+            Default: 0
+            Charge of the molecule.
+        connectivity: str | None
+            Default: "cell_list"
+            Inference method for the connectivity, see REGISTRY_INFERENCE_BONDS.
+            If None, the bonds of the graph are used.
+        aromaticity: bool
+            Default: True
+            If True, bonds of aromatic rings get bond order 1.5.
+
+    Returns:
+    --------
+        list
+    """
+    cg = chemgraph_or_graph
+    if isinstance(cg, nx.Graph):
+        cg = chemgraph.ChemGraph(name="graph", graph=cg)
+
+    if connectivity is None:
+        edges = list(cg.graph.edges(data=True))
+    else:
+        edges = REGISTRY_INFERENCE_BONDS[connectivity](cg)
+
+    rows = cg.node_rows([(node_1, node_2) for node_1, node_2, _ in edges]).reshape(
+        -1, 2
+    )
+
+    orders = bond_orders(
+        cg.atomic_numbers, rows, charge=charge, aromaticity=aromaticity
+    )
+
+    return [
+        (node_1, node_2, {**data, "bond_order": int(order) if order != 1.5 else order})
+        for (node_1, node_2, data), order in zip(edges, orders.tolist())
+    ]
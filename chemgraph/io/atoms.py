@@ -7,6 +7,7 @@ from .. import chemgraph
 import ase
 import ase.io
 import networkx as nx
+import numpy as np
 
 
 @register_reader("atoms")
@@ -21,22 +22,26 @@ def read_atoms(ase_atoms: ase.Atoms) -> dict:
 
     Returns:
     --------
-        dict: {'name': str, 'graph: nx.Graph}
+        dict: {'name': str, 'graph: nx.Graph, 'positions': np.ndarray,
+               'atomic_numbers': np.ndarray}
+            The cell and periodic flags are kept in the graph metadata
+            'cell' and 'pbc' (see utils.pbc).
     """
     name = ase_atoms.get_chemical_formula()
     graph = nx.Graph()
 
-    atom_numbers = ase_atoms.get_atomic_numbers()
-    positions = ase_atoms.get_positions()
+    if np.any(ase_atoms.pbc) or np.any(ase_atoms.cell.array):
+        graph.graph["cell"] = ase_atoms.cell.array.tolist()
+        graph.graph["pbc"] = ase_atoms.pbc.tolist()
 
-    for ind_number, atom_number in enumerate(atom_numbers):
-        graph.add_node(
-            node_for_adding=ind_number,
-            atom_number=int(atom_number),
-            position=positions[ind_number, :],
-        )
+    graph.add_nodes_from(range(len(ase_atoms)))
 
-    return {"name": name, "graph": graph}
+    return {
+        "name": name,
+        "graph": graph,
+        "positions": ase_atoms.get_positions(),
+        "atomic_numbers": ase_atoms.get_atomic_numbers().astype(np.int64),
+    }
 
 
 @register_writer("atoms")
@@ -53,12 +58,11 @@ def write_atoms(chemgraph: chemgraph.ChemGraph) -> ase.Atoms:
     --------
         ase.Atoms
     """
-    atom_numbers = []
-    positions = []
-
-    for _, data in chemgraph.graph.nodes(data=True):
-        atom_numbers.append(data["atom_number"])
-        positions.append(data["position"])
-
-    atoms = ase.Atoms(numbers=atom_numbers, positions=positions)
+    metadata = chemgraph.graph.graph
+    atoms = ase.Atoms(
+        numbers=chemgraph.atomic_numbers,
+        positions=chemgraph.positions,
+        cell=metadata.get("cell"),
+        pbc=metadata.get("pbc") or False,
+    )
     return atoms
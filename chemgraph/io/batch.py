@@ -0,0 +1,99 @@
+"""
+Batch loading of many files on a process pool.
+"""
+
+from . import registry
+
+import glob
+
+from pathlib import Path
+from typing import Iterable, List
+
+# -------------------------------------------------------------------------------------- #
+
+
+def resolve_paths(
+    paths: str | Path | Iterable[str | Path], fmt: str | None = None
+) -> List[Path]:
+    """
+    Resolves a directory, a glob pattern or a list of paths into a list of paths.
+
+    Args:
+    -----
+        paths: str | Path | Iterable[str | Path]
+            Directory, glob pattern (e.g. "data/**/*.xyz") or paths of the files.
+            Files of a directory are filtered by fmt, or by the registered readers
+            of files (all but registry.OBJECT_FORMATS) if fmt is None, and sorted
+            by name.
+        fmt: str | None
+            Default: None
+            Format of the files.
+
+    Returns:
+    --------
+        List[Path]
+    """
+    if not isinstance(paths, (str, Path)):
+        return [Path(path) for path in paths]
+
+    path = Path(paths)
+    if path.is_dir():
+        suffixes = {fmt}
+        if fmt is None:
+            suffixes = set(registry.readers) - registry.OBJECT_FORMATS
+        return sorted(
+            path_file
+            for path_file in path.iterdir()
+            if path_file.is_file() and path_file.suffix.lstrip(".").lower() in suffixes
+        )
+
+    if glob.has_magic(str(paths)):
+        return [Path(path) for path in sorted(glob.glob(str(paths), recursive=True))]
+
+    return [path]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def load_file(
+    path: Path,
+    cls: type,
+    fmt: str | None = None,
+    infer_bonds: str | None = None,
+    infer_bonds_kwargs: dict | None = None,
+    reader_kwargs: dict | None = None,
+):
+    """
+    Reads one file into a ChemGraph and optionally infers its bonds.
+    Module-level so it can be sent to worker processes.
+
+    Args:
+    -----
+        path: Path
+            Path to the file.
+        cls: type
+            ChemGraph class to instantiate.
+        fmt: str | None
+            Default: None
+            Format of the file. If None, the extension of the path is used.
+        infer_bonds: str | None
+            Default: None
+            Bond inference method to run after reading. None skips bond inference.
+        infer_bonds_kwargs: dict | None
+            Default: None
+            Keyword arguments of the bond inference method.
+        reader_kwargs: dict | None
+            Default: None
+            Keyword arguments of the reader.
+
+    Returns:
+    --------
+        ChemGraph
+    """
+    chemgraph = cls.from_file(path, fmt=fmt, **(reader_kwargs or {}))
+
+    if infer_bonds is not None:
+        chemgraph.infer_bonds(method=infer_bonds, **(infer_bonds_kwargs or {}))
+
+    return chemgraph
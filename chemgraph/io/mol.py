@@ -2,7 +2,6 @@ from .registry import register_reader, register_writer
 import networkx as nx
 
 import rdkit.Chem
-from rdkit.Geometry import Point3D
 import numpy as np
 
 
@@ -15,99 +14,160 @@ RDKIT_TO_BO = {
 
 BO_TO_RDKIT = {v: k for k, v in RDKIT_TO_BO.items()}
 
+# -------------------------------------------------------------------------------------- #
 
-@register_reader("mol")
-def read_mol(mol: rdkit.Chem.rdchem.Mol, ind_conformer=0) -> dict:
+
+def build_mol(
+    atomic_numbers: np.ndarray,
+    positions: np.ndarray | None = None,
+    bonds: np.ndarray | None = None,
+    bond_orders: np.ndarray | None = None,
+) -> rdkit.Chem.rdchem.Mol:
     """
-    Reads a mol rdkit.Chem.Mol object into a ChemGraph object.
-    If the
+    Builds an unsanitized rdkit.Chem.Mol straight from columnar arrays.
+    The conformer is set with one bulk call instead of one Point3D per atom.
 
     Args:
     -----
-        mol: rdkit.Chem.rdchem.Mol()
-            Molecule.
-
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        positions: (Optional) np.ndarray
+            Default: None
+            Positions (N, 3). No conformer is added if None.
+        bonds: (Optional) np.ndarray
+            Default: None
+            Atom rows (M, 2) of the bonds.
+        bond_orders: (Optional) np.ndarray
+            Default: None
+            Bond orders (M,), see BO_TO_RDKIT. Single bonds if None.
 
+    Returns:
+    --------
+        mol: rdkit.Chem.rdchem.Mol
     """
-    has_positions = False
-    graph = nx.Graph()
+    mol = rdkit.Chem.RWMol()
+    for atom_number in np.asarray(atomic_numbers).tolist():
+        mol.AddAtom(rdkit.Chem.Atom(atom_number))
 
-    if (
-        mol.GetNumConformers() != 0
-    ):  # Checks if positional information is stored in the mol object.
-        has_positions = True
-        conf = list(mol.GetConformers())[ind_conformer]
+    if bonds is not None:
+        bonds = np.asarray(bonds).tolist()
+        if bond_orders is None:
+            bond_orders = [1] * len(bonds)
 
-    atoms = list(mol.GetAtoms())
-    bonds = list(mol.GetBonds())
-    # atoms_kit = list(mol.GetAtoms())
+        for (row_1, row_2), bond_order in zip(bonds, bond_orders):
+            mol.AddBond(row_1, row_2, BO_TO_RDKIT[bond_order])
 
-    for atom in atoms:
-        atom_number = atom.GetAtomicNum()
-        position = None
+    if positions is not None:
+        conf = rdkit.Chem.Conformer(mol.GetNumAtoms())
+        conf.SetPositions(np.ascontiguousarray(positions, dtype=np.float64))
+        conf.Set3D(True)
+        mol.AddConformer(conf, assignId=True)
 
-        if has_positions:
-            position = conf.GetAtomPosition(atom.GetIdx())
-            position = np.array(position)
+    return mol.GetMol()
 
-        graph.add_node(
-            node_for_adding=atom.GetIdx(), atom_number=atom_number, position=position
-        )
 
-    for ind_bond, bond in enumerate(bonds):
-        bond_order = RDKIT_TO_BO[bond.GetBondType()]
+def mol_bonds(mol: rdkit.Chem.rdchem.Mol) -> tuple[np.ndarray, list]:
+    """
+    Reads the bonds of a rdkit.Chem.Mol without building a graph.
 
-        graph.add_edge(
-            u_of_edge=bond.GetBeginAtomIdx(),
-            v_of_edge=bond.GetEndAtomIdx(),
-            bond_order=bond_order,
-        )
+    Args:
+    -----
+        mol: rdkit.Chem.rdchem.Mol
 
-    return {"name": "from_mol", "graph": graph}
+    Returns:
+    --------
+        rows: np.ndarray
+            Int64 array (M, 2) of atom indices.
+        bond_orders: list
+            Bond orders (M,), see RDKIT_TO_BO.
+    """
+    # Mol.GetBonds() looks every bond up by index, which is linear in the number of
+    # bonds. The bonds of every atom are returned at once, so each bond is taken from
+    # its begin atom and put back into bond order.
+    bonds = sorted(
+        (
+            (bond.GetIdx(), index, bond.GetEndAtomIdx(), bond.GetBondType())
+            for index, atom in enumerate(mol.GetAtoms())
+            for bond in atom.GetBonds()
+            if bond.GetBeginAtomIdx() == index
+        ),
+        key=lambda bond: bond[0],
+    )
+    rows = np.array([bond[1:3] for bond in bonds], dtype=np.int64).reshape(-1, 2)
+
+    return rows, [RDKIT_TO_BO[bond[3]] for bond in bonds]
 
 
-@register_writer("mol")
-def write_mol(chemgraph) -> rdkit.Chem.rdchem.Mol:
+@register_reader("mol")
+def read_mol(mol: rdkit.Chem.rdchem.Mol, ind_conformer=0) -> dict:
     """
-    Writes a ChemGraph object into a rdkit.Chem.Mol object.
+    Reads a mol rdkit.Chem.Mol object into a ChemGraph object.
+    Positions are read in bulk from the conformer, if the molecule has one.
 
     Args:
     -----
-        chemgraph: ChemGraph
-            ChemGraph object to be converted.
+        mol: rdkit.Chem.rdchem.Mol()
+            Molecule.
+        ind_conformer: int
+            Default: 0
+            Index of the conformer to read the positions from.
 
     Returns:
     --------
-        mol: rdkit.Chem.rdchem.Mol
+        dict: {'name': str, 'graph': nx.Graph, 'atomic_numbers': np.ndarray,
+               'positions': np.ndarray (if the molecule has a conformer)}
     """
+    num_atoms = mol.GetNumAtoms()
+    atomic_numbers = np.fromiter(
+        (atom.GetAtomicNum() for atom in mol.GetAtoms()),
+        dtype=np.int64,
+        count=num_atoms,
+    )
 
-    # ==== Create an editable molecule ==== #
-    mol = rdkit.Chem.RWMol()
-    has_positions = False
+    graph = nx.Graph()
+    graph.add_nodes_from(range(num_atoms))
 
-    for node, node_data in chemgraph.graph.nodes(data=True):
-        atom = rdkit.Chem.Atom(node_data["atom_number"])
-        mol.AddAtom(atom)
+    rows, bond_orders = mol_bonds(mol)
+    graph.add_edges_from(
+        (row_1, row_2, {"bond_order": bond_order})
+        for (row_1, row_2), bond_order in zip(rows.tolist(), bond_orders)
+    )
 
-        if node_data["position"] is not None:
-            has_positions = True
+    data = {"name": "from_mol", "graph": graph, "atomic_numbers": atomic_numbers}
+
+    if mol.GetNumConformers() != 0:
+        conf = list(mol.GetConformers())[ind_conformer]
+        data["positions"] = conf.GetPositions()
 
-    for node_1, node_2, edge_data in chemgraph.graph.edges(data=True):
-        bond_order = edge_data["bond_order"]
-        rdkit_order = BO_TO_RDKIT[bond_order]
-        mol.AddBond(node_1, node_2, rdkit_order)
+    return data
 
-    if has_positions:
-        conf = rdkit.Chem.Conformer(len(chemgraph.graph.nodes()))
 
-        for node, node_data in chemgraph.graph.nodes(data=True):
-            position = node_data["position"]
-            conf.SetAtomPosition(node, Point3D(position[0], position[1], position[2]))
+@register_writer("mol")
+def write_mol(chemgraph) -> rdkit.Chem.rdchem.Mol:
+    """
+    Writes a ChemGraph object into a sanitized rdkit.Chem.Mol object.
+    Atoms are added in node order, positions are set in bulk.
 
-        mol.AddConformer(conf)
+    Args:
+    -----
+        chemgraph: ChemGraph
+            ChemGraph object to be converted.
 
-    # Finalize molecule
-    mol = mol.GetMol()
+    Returns:
+    --------
+        mol: rdkit.Chem.rdchem.Mol
+    """
+    edges = list(chemgraph.graph.edges(data="bond_order"))
+    bonds = chemgraph.node_rows(
+        [(node_1, node_2) for node_1, node_2, _ in edges]
+    ).reshape(-1, 2)
+
+    mol = build_mol(
+        chemgraph.atomic_numbers,
+        positions=chemgraph.positions,
+        bonds=bonds,
+        bond_orders=[bond_order for _, _, bond_order in edges],
+    )
     rdkit.Chem.SanitizeMol(mol)
 
     return mol
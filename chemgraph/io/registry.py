@@ -1,5 +1,32 @@
-readers = {}
-writers = {}
+"""
+Registries of the file formats. The modules of the built-in formats are imported on
+first use of the format, see utils.plugins.LazyRegistry.
+"""
+
+from ..utils.plugins import LazyRegistry
+
+readers = LazyRegistry(
+    {
+        "atoms": ".io.atoms",
+        "cgstore": ".io.store",
+        "mol": ".io.mol",
+        "xyz": ".io.xyz",
+    },
+    group="chemgraph.io.readers",
+)
+writers = LazyRegistry(
+    {
+        "atoms": ".io.atoms",
+        "cgstore": ".io.store",
+        "mol": ".io.mol",
+        "xyz": ".io.xyz",
+    },
+    group="chemgraph.io.writers",
+)
+
+
+OBJECT_FORMATS = {"atoms", "mol"}
+"""Formats whose readers take in-memory objects (ase.Atoms, rdkit Mol), not paths."""
 
 
 def register_reader(name):
@@ -20,3 +47,33 @@ def register_writer(name):
         return func
 
     return decorator
+
+
+iterators = LazyRegistry(
+    {"cgstore": ".io.store", "xyz": ".io.xyz"}, group="chemgraph.io.iterators"
+)
+
+
+def register_iterator(name):
+    """Decorator that adds the function streaming multi-frame files to the registry."""
+
+    def decorator(func):
+        iterators[name] = func
+        return func
+
+    return decorator
+
+
+frames_writers = LazyRegistry(
+    {"cgstore": ".io.store", "xyz": ".io.xyz"}, group="chemgraph.io.frames_writers"
+)
+
+
+def register_frames_writer(name):
+    """Decorator that adds the function writing multi-frame files to the registry."""
+
+    def decorator(func):
+        frames_writers[name] = func
+        return func
+
+    return decorator
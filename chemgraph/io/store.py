@@ -0,0 +1,433 @@
+"""
+Memory-mapped binary store for large collections of ChemGraphs.
+
+A store is a directory of .npy files holding the concatenated data of all molecules:
+
+    positions.npy           float64 (A, 3)      Positions of all atoms.
+    atomic_numbers.npy      int64 (A,)          Atomic numbers of all atoms.
+    bonds.npy               int64 (B, 2)        Bonds as atom rows local to their molecule.
+    bond_orders.npy         float64 (B,)        Bond orders, NaN if unknown.
+    atom_offsets.npy        int64 (M + 1,)      Molecule i owns atoms [offsets[i], offsets[i + 1]).
+    bond_offsets.npy        int64 (M + 1,)      Molecule i owns bonds [offsets[i], offsets[i + 1]).
+    metadata.jsonl          One JSON line per molecule: name and GRAPH_SCHEMA metadata.
+    metadata_offsets.npy    int64 (M + 1,)      Byte offsets of the JSON lines.
+
+All files are opened with np.memmap, so opening a store does not depend on its size and
+reading a molecule returns views into the mapped files without copying.
+"""
+
+from .registry import (
+    register_frames_writer,
+    register_iterator,
+    register_reader,
+    register_writer,
+)
+import networkx as nx
+import numpy as np
+
+import json
+import os
+
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from ..constants import graph as constants_graph
+
+ARRAYS = {
+    "positions": (np.float64, (3,)),
+    "atomic_numbers": (np.int64, ()),
+    "bonds": (np.int64, (2,)),
+    "bond_orders": (np.float64, ()),
+    "atom_offsets": (np.int64, ()),
+    "bond_offsets": (np.int64, ()),
+    "metadata_offsets": (np.int64, ()),
+}
+"""Name, dtype and row shape of the arrays of a store."""
+
+# -------------------------------------------------------------------------------------- #
+
+
+class _NpyAppender:
+    """
+    Appends rows to a .npy file. The header is rewritten in place on 'flush'.
+    NumPy pads .npy headers so that the shape can grow without changing the header size.
+    """
+
+    def __init__(self, path: Path, dtype, row_shape: tuple, append: bool = False):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.row_shape = row_shape
+        self.num_rows = 0
+
+        append = append and path.exists()
+        self.file = open(path, "r+b" if append else "w+b")
+
+        try:
+            if append:
+                np.lib.format.read_magic(self.file)
+                shape, _, dtype_file = np.lib.format.read_array_header_1_0(self.file)
+
+                if dtype_file != self.dtype or shape[1:] != row_shape:
+                    raise ValueError(f"Store file '{path}' does not match {ARRAYS}.")
+
+                # Drops rows written after the last flush, which the header does not cover.
+                self.num_rows = shape[0]
+                row_nbytes = self.dtype.itemsize * int(np.prod(row_shape))
+                self.file.seek(self.file.tell() + self.num_rows * row_nbytes)
+                self.file.truncate()
+            else:
+                self._write_header()
+        except BaseException:
+            self.file.close()
+            raise
+
+    def _write_header(self):
+        self.file.seek(0)
+        np.lib.format.write_array_header_1_0(
+            self.file,
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": False,
+                "shape": (self.num_rows, *self.row_shape),
+            },
+        )
+
+    def append(self, rows: np.ndarray):
+        rows = np.ascontiguousarray(rows, dtype=self.dtype).reshape(-1, *self.row_shape)
+        self.file.write(rows.tobytes())
+        self.num_rows += len(rows)
+
+    def flush(self):
+        position = self.file.tell()
+        self._write_header()
+        self.file.seek(position)
+        self.file.flush()
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _json_default(value):
+    """Stores paths (names of read files) as str, NumPy arrays (e.g. a cell) as lists."""
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+
+    raise TypeError(
+        f"Graph metadata of type '{type(value).__name__}' cannot be stored as JSON."
+    )
+
+
+class StoreWriter:
+    """
+    Appends ChemGraphs to a store. The store is valid after 'flush' or 'close'.
+
+    Example:
+    --------
+        with StoreWriter("dataset.cgstore") as writer:
+            for chemgraph in chemgraphs:
+                writer.write(chemgraph)
+    """
+
+    def __init__(self, path: str | Path, append: bool = False):
+        """
+        Args:
+        -----
+            path: str | Path
+                Directory of the store.
+            append: bool
+                Default: False
+                If True, append to an existing store instead of overwriting it.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        append = append and (self.path / "atom_offsets.npy").exists()
+
+        # All files are closed again if opening any of them fails.
+        with ExitStack() as files:
+            self.arrays = dict()
+            for name, (dtype, row_shape) in ARRAYS.items():
+                self.arrays[name] = _NpyAppender(
+                    self.path / f"{name}.npy", dtype, row_shape, append
+                )
+                files.enter_context(self.arrays[name].file)
+
+            self.metadata = files.enter_context(
+                open(self.path / "metadata.jsonl", "ab" if append else "wb")
+            )
+
+            if append:
+                offsets = {
+                    name: np.load(self.path / f"{name}.npy", mmap_mode="r")
+                    for name in ["atom_offsets", "bond_offsets", "metadata_offsets"]
+                }
+                self.num_atoms = int(offsets["atom_offsets"][-1])
+                self.num_bonds = int(offsets["bond_offsets"][-1])
+                self.num_bytes = int(offsets["metadata_offsets"][-1])
+                self.metadata.truncate(self.num_bytes)
+            else:
+                self.num_atoms = self.num_bonds = self.num_bytes = 0
+                for name in ["atom_offsets", "bond_offsets", "metadata_offsets"]:
+                    self.arrays[name].append(np.zeros(1))
+
+            self._files = files.pop_all()
+
+    def write(self, chemgraph):
+        """
+        Appends one ChemGraph to the store.
+        Nodes are stored in row order, bonds as rows local to the molecule.
+
+        Args:
+        -----
+            chemgraph: ChemGraph
+        """
+        num_atoms = len(chemgraph.atomic_numbers)
+        positions = chemgraph.positions
+        if positions is None:
+            positions = np.full((num_atoms, 3), np.nan)
+
+        edges = list(chemgraph.graph.edges(data="bond_order"))
+        bonds = chemgraph.node_rows([edge[:2] for edge in edges]).reshape(-1, 2)
+        bond_orders = np.array(
+            [np.nan if edge[2] is None else edge[2] for edge in edges], dtype=np.float64
+        )
+
+        metadata = {
+            "name": chemgraph.name,
+            "graph": {
+                key: chemgraph.graph.graph.get(key)
+                for key in constants_graph.GRAPH_SCHEMA
+            },
+        }
+        line = (json.dumps(metadata, default=_json_default) + "\n").encode()
+
+        self.num_atoms += num_atoms
+        self.num_bonds += len(bonds)
+        self.num_bytes += len(line)
+
+        self.arrays["positions"].append(positions)
+        self.arrays["atomic_numbers"].append(chemgraph.atomic_numbers)
+        self.arrays["bonds"].append(bonds)
+        self.arrays["bond_orders"].append(bond_orders)
+        self.arrays["atom_offsets"].append(np.array([self.num_atoms]))
+        self.arrays["bond_offsets"].append(np.array([self.num_bonds]))
+        self.arrays["metadata_offsets"].append(np.array([self.num_bytes]))
+        self.metadata.write(line)
+
+    def flush(self):
+        """Rewrites the .npy headers so the store can be opened."""
+        for appender in self.arrays.values():
+            appender.flush()
+        self.metadata.flush()
+
+    def close(self):
+        """Flushes the store. All files are closed, even if flushing fails."""
+        with self._files:
+            self.flush()
+
+    def __enter__(self) -> StoreWriter:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+class Store:
+    """
+    Read access to a store. All arrays are memory-mapped, so opening is independent of
+    the size of the store and molecules are read as zero-copy views.
+    """
+
+    def __init__(self, path: str | Path, mmap_mode: str = "r"):
+        """
+        Args:
+        -----
+            path: str | Path
+                Directory of the store.
+            mmap_mode: str
+                Default: "r"
+                Memory-map mode of np.load. Use "c" for writable copy-on-write positions.
+        """
+        self.path = Path(path)
+        for name in ARRAYS:
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode=mmap_mode))
+
+        path_metadata = self.path / "metadata.jsonl"
+        self.metadata = (
+            np.memmap(path_metadata, dtype=np.uint8, mode="r")
+            if path_metadata.stat().st_size > 0
+            else np.empty(0, dtype=np.uint8)
+        )
+
+    def __len__(self) -> int:
+        return len(self.atom_offsets) - 1
+
+    def read(self, index: int) -> dict:
+        """
+        Reads molecule 'index' as the keyword arguments of a ChemGraph.
+        Positions and atomic numbers are views into the memory-mapped files.
+
+        Args:
+        -----
+            index: int
+                Index of the molecule. Negative indices count from the end.
+
+        Returns:
+        --------
+            dict: {name, graph, positions, atomic_numbers}
+        """
+        num_molecules = len(self)
+        if not -num_molecules <= index < num_molecules:
+            raise IndexError(f"Molecule {index} out of range for {num_molecules}.")
+        index %= num_molecules
+
+        atom_start, atom_stop = self.atom_offsets[index : index + 2].tolist()
+        bond_start, bond_stop = self.bond_offsets[index : index + 2].tolist()
+        byte_start, byte_stop = self.metadata_offsets[index : index + 2].tolist()
+
+        positions = self.positions[atom_start:atom_stop]
+        if np.isnan(positions).all() and atom_stop > atom_start:
+            positions = None
+
+        metadata = json.loads(self.metadata[byte_start:byte_stop].tobytes())
+
+        bond_orders = self.bond_orders[bond_start:bond_stop].tolist()
+        graph = nx.Graph(**metadata["graph"])
+        graph.add_nodes_from(range(atom_stop - atom_start))
+        graph.add_edges_from(
+            (
+                ind_1,
+                ind_2,
+                {"bond_order": None if np.isnan(bond_order) else bond_order},
+            )
+            for (ind_1, ind_2), bond_order in zip(
+                self.bonds[bond_start:bond_stop].tolist(), bond_orders
+            )
+        )
+
+        return {
+            "name": metadata["name"],
+            "graph": graph,
+            "positions": positions,
+            "atomic_numbers": self.atomic_numbers[atom_start:atom_stop],
+        }
+
+    def __getitem__(self, index: int):
+        from ..chemgraph import ChemGraph
+
+        return ChemGraph(**self.read(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+@register_reader("cgstore")
+def read_cgstore(path: str | Path, index: int = 0, mmap_mode: str = "r") -> dict:
+    """
+    Reads one molecule from a memory-mapped ChemGraph store.
+
+    Args:
+    -----
+        path: str | Path
+            Directory of the store.
+        index: int
+            Default: 0
+            Index of the molecule.
+        mmap_mode: str
+            Default: "r"
+            Memory-map mode of np.load.
+
+    Returns:
+    --------
+        dict: {name, graph, positions, atomic_numbers}
+    """
+    return Store(path, mmap_mode=mmap_mode).read(index)
+
+
+@register_iterator("cgstore")
+def iter_cgstore(
+    path: str | Path,
+    start: int = 0,
+    stop: int | None = None,
+    step: int = 1,
+    mmap_mode: str = "r",
+) -> Iterator[dict]:
+    """
+    Streams the molecules of a memory-mapped ChemGraph store.
+
+    Args:
+    -----
+        path: str | Path
+            Directory of the store.
+        start, stop, step: int
+            Slice of the molecules to read.
+        mmap_mode: str
+            Default: "r"
+            Memory-map mode of np.load.
+
+    Yields:
+    -------
+        dict: {name, graph, positions, atomic_numbers}
+    """
+    store = Store(path, mmap_mode=mmap_mode)
+
+    for index in range(len(store))[start:stop:step]:
+        yield store.read(index)
+
+
+@register_writer("cgstore")
+def write_cgstore(chemgraph, path: str | Path, append: bool = False):
+    """
+    Writes a ChemGraph into a memory-mapped ChemGraph store.
+
+    Args:
+    -----
+        chemgraph: ChemGraph
+        path: str | Path
+            Directory of the store.
+        append: bool
+            Default: False
+            If True, append the ChemGraph to an existing store.
+
+    Returns:
+    --------
+        None
+    """
+    with StoreWriter(path, append=append) as writer:
+        writer.write(chemgraph)
+
+    return None
+
+
+@register_frames_writer("cgstore")
+def write_cgstore_frames(chemgraphs: Iterable, path: str | Path, append: bool = False):
+    """
+    Writes many ChemGraphs into a memory-mapped ChemGraph store.
+
+    Args:
+    -----
+        chemgraphs: Iterable[ChemGraph]
+        path: str | Path
+            Directory of the store.
+        append: bool
+            Default: False
+            If True, append the ChemGraphs to an existing store.
+
+    Returns:
+    --------
+        None
+    """
+    with StoreWriter(path, append=append) as writer:
+        for chemgraph in chemgraphs:
+            writer.write(chemgraph)
+
+    return None
@@ -1,14 +1,379 @@
-from .registry import register_reader, register_writer
+from .registry import (
+    register_frames_writer,
+    register_iterator,
+    register_reader,
+    register_writer,
+)
 import networkx as nx
 import numpy as np
 
+import io
+import os
+
+from array import array
+from itertools import count, islice
 from pathlib import Path
+from typing import Iterator, Sequence, TextIO
 
 from ..constants import periodic_table
 
+BUFFER_SIZE = 1 << 20
+"""Default read buffer size in bytes for streaming .xyz files."""
+INDEX_SUFFIX = ".idx.npz"
+"""Suffix of the sidecar file holding the frame index of an .xyz file."""
+
+
+def _read_num_atoms(file: TextIO) -> int | None:
+    """
+    Reads the atom count line of the next frame. Skips blank lines between frames.
+    Returns None at the end of the file.
+    """
+    for line in file:
+        if line.strip():
+            try:
+                return int(line)
+            except ValueError:
+                raise ValueError("Invalid .xyz file format.") from None
+    return None
+
+
+def _atomic_numbers(symbols: np.ndarray) -> np.ndarray:
+    """Maps an array of element symbols onto atomic numbers with one lookup per element."""
+    unique_symbols, inverse = np.unique(symbols, return_inverse=True)
+
+    try:
+        lookup = np.array(
+            [periodic_table.ATOMIC_NUM[symbol] for symbol in unique_symbols.tolist()],
+            dtype=np.int64,
+        )
+    except KeyError as error:
+        raise ValueError(f"Unknown element symbol {error} in .xyz file.") from None
+
+    return lookup[inverse.reshape(-1)]
+
+
+def _parse_block(lines: list[str], num_atoms: int) -> tuple[np.ndarray, np.ndarray]:
+    """Parses all atom lines of a frame in bulk into atomic numbers and positions."""
+    tokens = "".join(lines).split()
+
+    if len(tokens) != 4 * num_atoms:
+        raise ValueError("Invalid .xyz file format.")
+
+    symbols = np.array(tokens[::4])
+    del tokens[::4]  # Only the coordinates remain.
+
+    try:
+        positions = np.array(tokens, dtype=np.float64).reshape(num_atoms, 3)
+    except ValueError:
+        raise ValueError("Invalid .xyz file format.") from None
+
+    return _atomic_numbers(symbols), positions
+
+
+def _parse_lines(lines: list[str], num_atoms: int) -> tuple[np.ndarray, np.ndarray]:
+    """Parses and validates the atom lines of a frame one by one."""
+    atomic_numbers = np.empty(num_atoms, dtype=np.int64)
+    positions = np.empty((num_atoms, 3), dtype=np.float64)
+
+    for ind_line, line in enumerate(lines):
+        parts = line.split()
+
+        if len(parts) != 4:
+            raise ValueError(f"Invalid .xyz file format in atom line {ind_line}.")
+
+        atomic_numbers[ind_line] = periodic_table.ATOMIC_NUM[parts[0]]
+        positions[ind_line] = np.array(parts[1:]).astype(float)
+
+    return atomic_numbers, positions
+
+
+def _parse_frame(file: TextIO, num_atoms: int, strict: bool = False) -> dict:
+    """
+    Parses the comment line and num_atoms atom lines of a frame.
+    The graph is built with one bulk 'add_nodes_from'; ChemGraph binds the node
+    attributes to the returned positions and atomic_numbers arrays.
+    """
+    comment = file.readline().strip()
+    lines = list(islice(file, num_atoms))
+
+    if len(lines) != num_atoms:
+        raise ValueError("Invalid .xyz file format. Frame is truncated.")
+
+    if strict:
+        atomic_numbers, positions = _parse_lines(lines, num_atoms)
+    else:
+        atomic_numbers, positions = _parse_block(lines, num_atoms)
+
+    graph = nx.Graph(description=comment)
+    graph.add_nodes_from(range(num_atoms))
+
+    return {"graph": graph, "positions": positions, "atomic_numbers": atomic_numbers}
+
+
+def _skip_frame(file: TextIO, num_atoms: int):
+    """Skips the comment line and num_atoms atom lines of a frame without parsing."""
+    num_lines = sum(1 for _ in islice(file, num_atoms + 1))
+
+    if num_lines != num_atoms + 1:
+        raise ValueError("Invalid .xyz file format. Frame is truncated.")
+
+
+@register_iterator("xyz")
+def iter_xyz(
+    path_xyz: str | Path,
+    start: int = 0,
+    stop: int | None = None,
+    step: int = 1,
+    buffer_size: int = BUFFER_SIZE,
+    strict: bool = False,
+) -> Iterator[dict]:
+    """
+    Streams the frames of a (multi-frame) .xyz file, e.g. a concatenated trajectory.
+    The file is read incrementally through a fixed-size buffer, so memory use does not
+    depend on the size of the file. Frames outside the slice are skipped without parsing.
+
+    Args:
+    -----
+        path_xyz: str | Path
+            Path to the .xyz file to read.
+        start: int
+            Default: 0
+            Index of the first frame.
+        stop: int | None
+            Default: None
+            Index of the frame to stop before. If None, read until the end of the file.
+        step: int
+            Default: 1
+            Read every step-th frame.
+        buffer_size: int
+            Default: 1 MiB
+            Read buffer size in bytes.
+        strict: bool
+            Default: False
+            If True, validate and parse every atom line on its own.
+            If False, parse the coordinate block of a frame in bulk.
+
+    Yields:
+    -------
+        dict
+            {
+            name: str | Path
+                Name of the molecule. Takes the path as name.
+            graph: nx.Graph
+                Graph representation of the frame.
+                Does not infer bonds.
+            positions: np.ndarray
+                Positions (N, 3).
+            atomic_numbers: np.ndarray
+                Atomic numbers (N,).
+            }
+    """
+    if start < 0 or (stop is not None and stop < 0) or step < 1:
+        raise ValueError(
+            "Frame slicing needs start >= 0, stop >= 0 or None and step >= 1."
+        )
+
+    with open(path_xyz, "r", buffering=buffer_size) as file:
+        for ind_frame in count():
+            if stop is not None and ind_frame >= stop:
+                return
+
+            num_atoms = _read_num_atoms(file)
+            if num_atoms is None:
+                return
+
+            if ind_frame >= start and (ind_frame - start) % step == 0:
+                yield {"name": path_xyz, **_parse_frame(file, num_atoms, strict)}
+            else:
+                _skip_frame(file, num_atoms)
+
+
+def _path_index(path_xyz: str | Path, path_index: str | Path | None) -> Path:
+    """Returns the path of the sidecar index file."""
+    if path_index is None:
+        path_index = Path(f"{path_xyz}{INDEX_SUFFIX}")
+    return Path(path_index)
+
+
+def build_xyz_index(
+    path_xyz: str | Path,
+    path_index: str | Path | None = None,
+    buffer_size: int = BUFFER_SIZE,
+) -> dict:
+    """
+    Builds the frame index of a (multi-frame) .xyz file and stores it in a sidecar file.
+    The index holds the byte offset and atom count of every frame, together with the
+    size and modification time of the .xyz file to detect a stale index.
+
+    Args:
+    -----
+        path_xyz: str | Path
+            Path to the .xyz file to index.
+        path_index: str | Path | None
+            Default: None
+            Path of the sidecar file. If None, '<path_xyz>.idx.npz' is used.
+        buffer_size: int
+            Default: 1 MiB
+            Read buffer size in bytes.
+
+    Returns:
+    --------
+        dict
+            {
+            offsets: np.ndarray
+                Byte offset (F,) of the atom count line of every frame.
+            num_atoms: np.ndarray
+                Atom count (F,) of every frame.
+            file_size: int
+            file_mtime_ns: int
+            }
+    """
+    stat = os.stat(path_xyz)
+    offsets = array("q")
+    num_atoms = array("q")
+
+    with open(path_xyz, "rb", buffering=buffer_size) as file:
+        offset = 0
+
+        for line in file:
+            if not line.strip():
+                offset += len(line)
+                continue
+
+            try:
+                num_atoms_frame = int(line)
+            except ValueError:
+                raise ValueError("Invalid .xyz file format.") from None
+
+            offsets.append(offset)
+            num_atoms.append(num_atoms_frame)
+            offset += len(line)
+
+            num_lines = 0
+            for line_frame in islice(file, num_atoms_frame + 1):
+                offset += len(line_frame)
+                num_lines += 1
+
+            if num_lines != num_atoms_frame + 1:
+                raise ValueError("Invalid .xyz file format. Frame is truncated.")
+
+    index = {
+        "offsets": np.frombuffer(offsets, dtype=np.int64),
+        "num_atoms": np.frombuffer(num_atoms, dtype=np.int64),
+        "file_size": stat.st_size,
+        "file_mtime_ns": stat.st_mtime_ns,
+    }
+
+    with open(_path_index(path_xyz, path_index), "wb") as file:
+        np.savez(file, **index)
+
+    return index
+
+
+def load_xyz_index(
+    path_xyz: str | Path,
+    path_index: str | Path | None = None,
+    rebuild: bool = True,
+) -> dict:
+    """
+    Loads the frame index of an .xyz file from its sidecar file.
+    The index is stale if the size or modification time of the .xyz file changed.
+
+    Args:
+    -----
+        path_xyz: str | Path
+            Path to the indexed .xyz file.
+        path_index: str | Path | None
+            Default: None
+            Path of the sidecar file. If None, '<path_xyz>.idx.npz' is used.
+        rebuild: bool
+            Default: True
+            Build the index if it is missing or stale. If False, raise a ValueError.
+
+    Returns:
+    --------
+        dict
+            See 'build_xyz_index'.
+    """
+    path_index = _path_index(path_xyz, path_index)
+    stat = os.stat(path_xyz)
+
+    if path_index.exists():
+        with np.load(path_index) as data:
+            index = {key: data[key] for key in data.files}
+
+        index["file_size"] = int(index["file_size"])
+        index["file_mtime_ns"] = int(index["file_mtime_ns"])
+
+        if (
+            index["file_size"] == stat.st_size
+            and index["file_mtime_ns"] == stat.st_mtime_ns
+        ):
+            return index
+
+    if not rebuild:
+        raise ValueError(f"Index '{path_index}' is missing or stale.")
+
+    return build_xyz_index(path_xyz, path_index)
+
+
+def read_xyz_frames(
+    path_xyz: str | Path,
+    frames: Sequence[int],
+    path_index: str | Path | None = None,
+    strict: bool = False,
+) -> list[dict]:
+    """
+    Reads a batch of frames from an .xyz file by seeking to their byte offsets.
+    Uses (and if needed builds) the sidecar index, so the cost does not depend on
+    the position of the frames in the file.
+
+    Args:
+    -----
+        path_xyz: str | Path
+            Path to the .xyz file to read.
+        frames: Sequence[int]
+            Indices of the frames to read. Negative indices count from the end.
+        path_index: str | Path | None
+            Default: None
+            Path of the sidecar file. If None, '<path_xyz>.idx.npz' is used.
+        strict: bool
+            Default: False
+            If True, validate and parse every atom line on its own.
+
+    Returns:
+    --------
+        list[dict]
+            {name, graph, positions, atomic_numbers} of every frame in the order of frames. See 'read_xyz'.
+    """
+    index = load_xyz_index(path_xyz, path_index)
+    offsets = index["offsets"]
+    frame_ends = np.append(offsets[1:], index["file_size"])
+
+    frames = np.asarray(frames, dtype=np.int64).reshape(-1)
+    if np.any((frames >= len(offsets)) | (frames < -len(offsets))):
+        raise IndexError(f"Frame index out of range for {len(offsets)} frames.")
+    frames = frames % max(len(offsets), 1)
+
+    parsed = {}
+    with open(path_xyz, "rb") as file:
+        for ind_frame in np.unique(frames).tolist():  # Read in file order.
+            file.seek(offsets[ind_frame])
+            block = file.read(frame_ends[ind_frame] - offsets[ind_frame])
+
+            stream = io.StringIO(block.decode())
+            stream.readline()  # Atom count line.
+            parsed[ind_frame] = _parse_frame(
+                stream, int(index["num_atoms"][ind_frame]), strict
+            )
+
+    return [{"name": path_xyz, **parsed[ind_frame]} for ind_frame in frames.tolist()]
+
 
 @register_reader("xyz")
-def read_xyz(path_xyz: str | Path) -> dict:
+def read_xyz(
+    path_xyz: str | Path, frame: int = 0, index: bool = False, strict: bool = False
+) -> dict:
     """
     Reads a .xyz file into a name and a NetworkX graph.
 
@@ -16,6 +381,17 @@ def read_xyz(path_xyz: str | Path) -> dict:
     -----
         path_xyz: str | Path
             Path to the .xyz file to read.
+        frame: int
+            Default: 0
+            Index of the frame to read from a multi-frame .xyz file.
+        index: bool
+            Default: False
+            If True, seek to the frame with the sidecar index (see 'build_xyz_index')
+            instead of scanning the file from the top.
+        strict: bool
+            Default: False
+            If True, validate and parse every atom line on its own.
+            If False, parse the coordinate block in bulk.
 
     Returns:
     --------
@@ -26,36 +402,163 @@ def read_xyz(path_xyz: str | Path) -> dict:
             graph: nx.Graph
                 Graph representation of the molecule.
                 Does not infer bonds.
+            positions: np.ndarray
+                Positions (N, 3).
+            atomic_numbers: np.ndarray
+                Atomic numbers (N,).
             }
     """
-    with open(path_xyz, "r") as file:
-        lines = file.readlines()
+    if index:
+        return read_xyz_frames(path_xyz, [frame], strict=strict)[0]
+
+    for data in iter_xyz(path_xyz, start=frame, stop=frame + 1, strict=strict):
+        return data
+
+    raise ValueError(f"Frame {frame} not found in '{path_xyz}'.")
+
+
+_SYMBOLS = np.array(
+    [
+        periodic_table.ATOMIC_SYMBOLS.get(atom_number, "X")
+        for atom_number in range(max(periodic_table.ATOMIC_SYMBOLS) + 1)
+    ]
+)
+"""Element symbols indexed by atomic number for vectorized lookups."""
+
+
+def format_xyz_frame(
+    atomic_numbers: np.ndarray,
+    positions: np.ndarray,
+    comment: str = "",
+    precision: str = "%22.15f",
+) -> str:
+    """
+    Formats one frame, atom count line and comment line included, into a single string.
+    The whole (N, 3) coordinate block is formatted with one '%' operation.
+
+    Args:
+    -----
+        atomic_numbers: np.ndarray
+            Atomic numbers (N,).
+        positions: np.ndarray
+            Positions (N, 3).
+        comment: str
+            Default: ""
+            Comment line of the frame.
+        precision: str
+            Default: "%22.15f"
+            Format of a single coordinate.
+
+    Returns:
+    --------
+        str
+    """
+    atomic_numbers = np.asarray(atomic_numbers)
+    positions = np.asarray(positions, dtype=np.float64)
+    num_atoms = len(atomic_numbers)
+
+    if positions.shape != (num_atoms, 3):
+        raise ValueError(
+            f"Positions have shape {positions.shape}, expected ({num_atoms}, 3)."
+        )
+
+    values = np.empty((num_atoms, 4), dtype=object)
+    values[:, 0] = _SYMBOLS[atomic_numbers]
+    values[:, 1:] = positions
+
+    line_format = f"%s {precision} {precision} {precision}\n"
+    block = (line_format * num_atoms) % tuple(values.ravel().tolist())
+
+    return f"{num_atoms}\n{comment.strip()}\n{block}"
+
+
+class XYZWriter:
+    """
+    Writes frames into one (multi-frame) .xyz file through a single open handle.
 
-        comment = lines[1].strip()
-        graph = nx.Graph()
+    Example:
+    --------
+        with XYZWriter("trajectory.xyz") as writer:
+            for chemgraph in chemgraphs:
+                writer.write(chemgraph)
+    """
 
-        for ind_line, line in enumerate(lines[2:]):
-            parts = line.split()
+    def __init__(
+        self,
+        path: str | Path,
+        precision: str = "%22.15f",
+        append: bool = False,
+        buffer_size: int = BUFFER_SIZE,
+    ):
+        """
+        Args:
+        -----
+            path: str | Path
+                Path where to write the .xyz file.
+            precision: str
+                Default: "%22.15f"
+                Format of a single coordinate.
+            append: bool
+                Default: False
+                If True, append frames to an existing file instead of overwriting it.
+            buffer_size: int
+                Default: 1 MiB
+                Write buffer size in bytes.
+        """
+        self.precision = precision
+        self.file = open(path, "a" if append else "w", buffering=buffer_size)
 
-            if len(parts) > 4:
-                raise ValueError("Invalid .xyz file format.")
+    def write(
+        self,
+        chemgraph_or_positions,
+        atomic_numbers: np.ndarray | None = None,
+        comment: str | None = None,
+    ):
+        """
+        Writes one frame.
 
-            atom_type = parts[0]
-            position = np.array(parts[1:]).astype(float)
+        Args:
+        -----
+            chemgraph_or_positions: ChemGraph | np.ndarray
+                ChemGraph, or positions (N, 3) of a frame.
+            atomic_numbers: np.ndarray | None
+                Default: None
+                Atomic numbers (N,). Required if positions are given.
+            comment: str | None
+                Default: None
+                Comment line. If None, the ChemGraph description is used.
+        """
+        if isinstance(chemgraph_or_positions, np.ndarray):
+            if atomic_numbers is None:
+                raise ValueError("Atomic numbers are required to write positions.")
+            positions = chemgraph_or_positions
+        else:
+            positions = chemgraph_or_positions.positions
+            atomic_numbers = chemgraph_or_positions.atomic_numbers
+            if comment is None:
+                comment = chemgraph_or_positions.graph.graph.get("description")
 
-            graph.add_node(
-                node_for_adding=ind_line,
-                atom_number=periodic_table.ATOMIC_NUM[atom_type],
-                position=position,
+        self.file.write(
+            format_xyz_frame(
+                atomic_numbers=atomic_numbers,
+                positions=positions,
+                comment=comment or "",
+                precision=self.precision,
             )
+        )
 
-        graph.graph["description"] = comment
+    def close(self):
+        self.file.close()
 
-    return {"name": path_xyz, "graph": graph}
+    def __enter__(self) -> XYZWriter:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 @register_writer("xyz")
-def write_xyz(chemgraph, path: str | Path, precision="%22.15f"):
+def write_xyz(chemgraph, path: str | Path, precision="%22.15f", append=False):
     """
     Writes a ChemGraph object to a .xyz file.
 
@@ -66,22 +569,61 @@ def write_xyz(chemgraph, path: str | Path, precision="%22.15f"):
         path: str | Path
             Path where to write the .xyz file.
 
+        precision: str
+            Default: "%22.15f"
+            Format of a single coordinate.
+
+        append: bool
+            Default: False
+            If True, append the ChemGraph as a new frame to an existing file.
+
     Returns:
     --------
         None
     """
-    with open(path, "w+") as file:
-        data_graph = chemgraph.graph.nodes(data=True)
+    with XYZWriter(path, precision=precision, append=append) as writer:
+        writer.write(chemgraph)
 
-        file.write(f"{len(data_graph)}\n")
-        file.write(f"{chemgraph.graph.graph.get('description', '').strip()}\n")
+    return None
 
-        for node, data in data_graph:
-            file.write(
-                f"{periodic_table.ATOMIC_SYMBOLS[data['atom_number']]}"
-                + f" {precision % data['position'][0]}"
-                + f" {precision % data['position'][1]}"
-                + f" {precision % data['position'][2]}\n"
-            )
+
+@register_frames_writer("xyz")
+def write_xyz_frames(
+    frames,
+    path: str | Path,
+    atomic_numbers: np.ndarray | None = None,
+    precision="%22.15f",
+    append=False,
+):
+    """
+    Writes many ChemGraph objects, or frames of positions, into one multi-frame .xyz file.
+
+    Args:
+    -----
+        frames: Iterable[ChemGraph] | Iterable[np.ndarray]
+            ChemGraphs, or positions (N, 3) per frame, e.g. an (F, N, 3) array.
+
+        path: str | Path
+            Path where to write the .xyz file.
+
+        atomic_numbers: np.ndarray | None
+            Default: None
+            Atomic numbers (N,). Required if frames are positions.
+
+        precision: str
+            Default: "%22.15f"
+            Format of a single coordinate.
+
+        append: bool
+            Default: False
+            If True, append the frames to an existing file.
+
+    Returns:
+    --------
+        None
+    """
+    with XYZWriter(path, precision=precision, append=append) as writer:
+        for frame in frames:
+            writer.write(frame, atomic_numbers=atomic_numbers)
 
     return None
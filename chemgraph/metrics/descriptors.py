@@ -0,0 +1,339 @@
+"""
+Descriptor engine computing many flexibility descriptors for collections of molecules.
+"""
+
+import numpy as np
+import networkx as nx
+
+import warnings
+
+from functools import cached_property
+from typing import Iterable, Iterator, List
+
+from .. import chemgraph
+from ..constants import periodic_table
+from ..utils import parallel, topology
+from ..utils.plugins import LazyRegistry
+from . import flexibility
+
+REGISTRY_DESCRIPTORS = LazyRegistry(dict(), group="chemgraph.metrics.descriptors")
+
+
+def register_descriptor(name):
+    def wrapper(func):
+        REGISTRY_DESCRIPTORS[name] = func
+        return func
+
+    return wrapper
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+class Molecule:
+    """
+    Preprocessing shared by all descriptors of one molecule.
+    Every quantity is computed on first use and reused by all later descriptors,
+    e.g. the Hydrogen-free graph, the alpha correction and the path counts.
+    The graph of the molecule is never copied or modified. Topology of ChemGraphs
+    is served from their cache (ChemGraph.topology) and outlives the Molecule.
+    """
+
+    def __init__(
+        self,
+        chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+        alpha: bool = False,
+        mode: str = "a",
+        radii: dict = periodic_table.COVALENT_RADII,
+    ):
+        """
+        Args:
+        -----
+            chemgraph_or_graph: ChemGraph | nx.Graph
+                Molecular graph.
+            alpha: bool
+                Default: False
+                Whether to include the alpha correction in the kappa indices.
+            mode: str
+                Default: "a"
+                Mode for alpha correction ('a', 'b', 'legacy').
+            radii: dict
+                Dictionary of covalent radii.
+        """
+        self.chemgraph_or_graph = chemgraph_or_graph
+
+        self.alpha = alpha
+        self.mode = mode
+        self.radii = radii
+        self._num_paths = dict()
+
+    @cached_property
+    def graph_heavy(self) -> nx.Graph:
+        """Read-only view of the graph without Hydrogens."""
+        return flexibility._heavy_atom_view(self.chemgraph_or_graph)
+
+    @cached_property
+    def num_atoms(self) -> int:
+        """Number of atoms of the kappa indices. Hydrogens only count outside legacy mode."""
+        nodes = topology.get(
+            self.chemgraph_or_graph, "nodes", heavy=self.mode == "legacy"
+        )
+        return len(nodes)
+
+    @cached_property
+    def kier_alpha(self) -> float:
+        return flexibility._kier_alpha(
+            self.graph_heavy, radii=self.radii, mode=self.mode
+        )
+
+    @cached_property
+    def molecular_shannon_i(self) -> float:
+        return flexibility._molecular_shannon_i(self.chemgraph_or_graph)
+
+    def kier_mkappa(self, m: int) -> float:
+        num_atoms = self.num_atoms
+
+        if m == 0:
+            return self.molecular_shannon_i * num_atoms
+
+        alf = self.kier_alpha if self.alpha else 0
+        return flexibility._kier_mkappa(num_atoms, self.num_paths(m), m, alf)
+
+    def num_paths(self, m: int) -> int:
+        if m not in self._num_paths:
+            self._num_paths[m] = topology.get(
+                self.chemgraph_or_graph, "num_paths", m, heavy=self.mode == "legacy"
+            )
+        return self._num_paths[m]
+
+    @cached_property
+    def kier_phi(self) -> float:
+        return self.kier_mkappa(1) * self.kier_mkappa(2) / self.num_atoms
+
+    @cached_property
+    def crest_flex(self) -> float:
+        return flexibility._crest_flex(self.chemgraph_or_graph)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+@register_descriptor("kier_alpha")
+def _descriptor_kier_alpha(molecule: Molecule) -> float:
+    return molecule.kier_alpha
+
+
+@register_descriptor("molecular_shannon_i")
+def _descriptor_molecular_shannon_i(molecule: Molecule) -> float:
+    return molecule.molecular_shannon_i
+
+
+@register_descriptor("kier_mkappa_0")
+def _descriptor_kier_mkappa_0(molecule: Molecule) -> float:
+    return molecule.kier_mkappa(0)
+
+
+@register_descriptor("kier_mkappa_1")
+def _descriptor_kier_mkappa_1(molecule: Molecule) -> float:
+    return molecule.kier_mkappa(1)
+
+
+@register_descriptor("kier_mkappa_2")
+def _descriptor_kier_mkappa_2(molecule: Molecule) -> float:
+    return molecule.kier_mkappa(2)
+
+
+@register_descriptor("kier_mkappa_3")
+def _descriptor_kier_mkappa_3(molecule: Molecule) -> float:
+    return molecule.kier_mkappa(3)
+
+
+@register_descriptor("kier_phi")
+def _descriptor_kier_phi(molecule: Molecule) -> float:
+    return molecule.kier_phi
+
+
+@register_descriptor("crest_flex")
+def _descriptor_crest_flex(molecule: Molecule) -> float:
+    return molecule.crest_flex
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def descriptor_row(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    descriptors: List[str],
+    alpha: bool = False,
+    mode: str = "a",
+) -> np.ndarray:
+    """
+    Computes the descriptors of one molecule with shared preprocessing.
+    A descriptor that is undefined for the molecule (ArithmeticError, AssertionError,
+    ValueError) is NaN, other errors are raised.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecular graph.
+        descriptors: List[str]
+            Names of the descriptors, see REGISTRY_DESCRIPTORS.
+        alpha: bool
+            Default: False
+            Whether to include the alpha correction in the kappa indices.
+        mode: str
+            Default: "a"
+            Mode for alpha correction ('a', 'b', 'legacy').
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (D,) of the descriptors.
+    """
+    molecule = Molecule(chemgraph_or_graph, alpha=alpha, mode=mode)
+    row = np.full(len(descriptors), np.nan)
+
+    for ind_descriptor, descriptor in enumerate(descriptors):
+        try:
+            row[ind_descriptor] = REGISTRY_DESCRIPTORS[descriptor](molecule)
+        except (ArithmeticError, AssertionError, ValueError):
+            pass
+
+    return row
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_descriptors(
+    chemgraphs: Iterable[chemgraph.ChemGraph | nx.Graph],
+    descriptors: List[str] | None = None,
+    alpha: bool = False,
+    mode: str = "a",
+    num_workers: int | None = None,
+    chunk_size: int = 64,
+    ordered: bool = True,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Streams the descriptor rows of many molecules computed on a process pool.
+    Molecules that raise an error are yielded as rows of NaN with a warning.
+
+    Args:
+    -----
+        chemgraphs: Iterable[ChemGraph | nx.Graph]
+            Molecules. Consumed lazily.
+        descriptors: List[str] | None
+            Default: None
+            Names of the descriptors, see REGISTRY_DESCRIPTORS. None computes all.
+        alpha: bool
+            Default: False
+            Whether to include the alpha correction in the kappa indices.
+        mode: str
+            Default: "a"
+            Mode for alpha correction ('a', 'b', 'legacy').
+        num_workers: int | None
+            Default: None
+            Number of worker processes. None uses all CPUs.
+            0 or 1 computes in the calling process.
+        chunk_size: int
+            Default: 64
+            Number of molecules sent to a worker at once.
+        ordered: bool
+            Default: True
+            If True, rows are yielded in input order, otherwise as they are finished.
+
+    Yields:
+    -------
+        tuple[int, np.ndarray]
+            Index of the molecule and its float64 descriptor row (D,).
+    """
+    descriptors = _check_descriptors(descriptors)
+
+    for index, row in parallel.iter_map(
+        descriptor_row,
+        chemgraphs,
+        num_workers=num_workers,
+        chunk_size=chunk_size,
+        ordered=ordered,
+        descriptors=descriptors,
+        alpha=alpha,
+        mode=mode,
+    ):
+        if isinstance(row, parallel.TaskError):
+            warnings.warn(f"Descriptors of molecule {index} failed: {row.error}")
+            row = np.full(len(descriptors), np.nan)
+
+        yield index, row
+
+
+def compute_descriptors(
+    chemgraphs: Iterable[chemgraph.ChemGraph | nx.Graph],
+    descriptors: List[str] | None = None,
+    alpha: bool = False,
+    mode: str = "a",
+    num_workers: int | None = None,
+    chunk_size: int = 64,
+) -> np.ndarray:
+    """
+    Computes a dense descriptor table of many molecules on a process pool.
+    Descriptors that cannot be computed for a molecule are NaN.
+
+    Example:
+    --------
+        table = compute_descriptors(chemgraphs, ["kier_phi", "crest_flex"])
+
+    Args:
+    -----
+        chemgraphs: Iterable[ChemGraph | nx.Graph]
+            Molecules.
+        descriptors: List[str] | None
+            Default: None
+            Names of the descriptors (columns), see REGISTRY_DESCRIPTORS.
+            None computes all.
+        alpha: bool
+            Default: False
+            Whether to include the alpha correction in the kappa indices.
+        mode: str
+            Default: "a"
+            Mode for alpha correction ('a', 'b', 'legacy').
+        num_workers: int | None
+            Default: None
+            Number of worker processes. None uses all CPUs.
+            0 or 1 computes in the calling process.
+        chunk_size: int
+            Default: 64
+            Number of molecules sent to a worker at once.
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (molecules, descriptors).
+    """
+    descriptors = _check_descriptors(descriptors)
+
+    rows = [
+        row
+        for _, row in iter_descriptors(
+            chemgraphs,
+            descriptors,
+            alpha=alpha,
+            mode=mode,
+            num_workers=num_workers,
+            chunk_size=chunk_size,
+        )
+    ]
+
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(descriptors))
+
+
+def _check_descriptors(descriptors: List[str] | None) -> List[str]:
+    if descriptors is None:
+        return list(REGISTRY_DESCRIPTORS)
+
+    unknown = [name for name in descriptors if name not in REGISTRY_DESCRIPTORS]
+    if unknown:
+        raise ValueError(
+            f"Unknown descriptors {unknown}. Options: {list(REGISTRY_DESCRIPTORS)}"
+        )
+
+    return list(descriptors)
@@ -1,12 +1,11 @@
 import numpy as np
-from itertools import compress
 from collections import Counter
 import warnings
 import networkx as nx
-import copy
 
 from .. import chemgraph
 from ..constants import periodic_table
+from ..utils import arrays, math, topology, views
 
 # -------------------------------------------------------------------------------------- #
 
@@ -37,6 +36,17 @@ kier_radii = {
 # -------------------------------------------------------------------------------------- #
 
 
+def _heavy_atom_view(chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph) -> nx.Graph:
+    """Read-only graph without Hydrogens, cached on ChemGraphs. Nothing is copied."""
+    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
+        return chemgraph_or_graph.heavy_atom_view()
+
+    return views.heavy_atom_view(chemgraph_or_graph)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
 def kier_alpha(
     chemgraph_or_graph: nx.Graph | chemgraph.ChemGraph,
     radii: dict = periodic_table.COVALENT_RADII,
@@ -57,20 +67,15 @@ def kier_alpha(
     Returns:
         float: Alpha correction value.
     """
-    g = copy.deepcopy(chemgraph_or_graph)
-    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
-        g = chemgraph_or_graph.graph
+    g = _heavy_atom_view(chemgraph_or_graph)
 
-    has_H = any(data.get("atom_number") == 1 for _, data in g.nodes(data=True))
+    return _kier_alpha(g, radii=radii, mode=mode)
 
-    if has_H:
-        indx_H = [
-            ind_n
-            for ind_n, _ in g.nodes(data=True)
-            if g.nodes[ind_n["atom_number"]] == 1
-        ]
-        g.remove_nodes_from(indx_H)
 
+def _kier_alpha(
+    g: nx.Graph, radii: dict = periodic_table.COVALENT_RADII, mode: str = "a"
+) -> float:
+    """Alpha correction of a graph without Hydrogens. Does not modify the graph."""
     k_alpha = 0
 
     if mode == "a":
@@ -80,11 +85,12 @@ def kier_alpha(
             atom_number = node_data["atom_number"]
             k_alpha += (radii[atom_number] / radii[6]) - 1
     elif mode == "b":
-        for ind_node_1, ind_node_2, edge in g.edges(data=True):
-            position_1 = g.nodes[ind_node_1]["position"]
-            position_2 = g.nodes[ind_node_2]["position"]
-            bond_length = np.linalg.norm(np.array(position_1) - np.array(position_2))
-            k_alpha += (bond_length / 1.535) - 1  # Taken from Wiki, Sp3 C-C bond
+        nodes, positions = arrays.gather_positions(g)
+        rows = arrays.index_rows(nodes, arrays.edge_index_array(g))
+        bond_lengths = math.bond_lengths(positions[rows[:, 0]], positions[rows[:, 1]])
+        k_alpha += float(
+            np.sum((bond_lengths / 1.535) - 1)
+        )  # Taken from Wiki, Sp3 C-C bond
     elif mode == "legacy":
         warnings.warn("Legacy mode. Use only for uncharged/non-radical molecules.")
         for ind_node, node_data in g.nodes(data=True):
@@ -128,41 +134,17 @@ def molecular_shannon_i(chemgraph_or_graph: nx.Graph | chemgraph.ChemGraph) -> f
     Returns:
         float: Shannon entropy value.
     """
-    # Unpack if ChemGraph
-    g = copy.deepcopy(chemgraph_or_graph)
-    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
-        g = chemgraph_or_graph.graph
+    return _molecular_shannon_i(chemgraph_or_graph)
 
-    has_H = any(data.get("atom_number") == 1 for _, data in g.nodes(data=True))
 
-    if has_H:
-        indx_H = [
-            ind_n
-            for ind_n, _ in g.nodes(data=True)
-            if g.nodes[ind_n["atom_number"]] == 1
-        ]
-        g.remove_nodes_from(indx_H)
+def _molecular_shannon_i(chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph) -> float:
+    """Shannon entropy without Hydrogens from the (cached) heavy-atom topology."""
+    atom_numbers = topology.get(chemgraph_or_graph, "atom_numbers", heavy=True)
+    # Connectivity of the atoms.
+    degrees = topology.get(chemgraph_or_graph, "degrees", heavy=True)
 
-    num_atoms = len(g.nodes())
-    atom_types = []
-
-    for ind_node, data_node in g.nodes(data=True):
-        # Calculate connectivity of atom.
-        # atom_connectivity = atom.atom_connectivity(graph = g, ind_atom = na)
-        atom_connectivity = g.degree[ind_node]
-        atom_number = data_node["atom_number"]
-
-        # --------------------------- #
-        # Get atom number.
-        # atom_symbol = g.nodes[na]['atom_symbol']
-
-        # if atom_symbol == 'X':
-        #     atom_symbol = 'C'
-        # atom_number = atomic_numbers[atom_symbol]
-
-        # --------------------------- #
-
-        atom_types.append(tuple([atom_number, atom_connectivity]))
+    num_atoms = len(atom_numbers)
+    atom_types = list(zip(atom_numbers.tolist(), degrees.tolist()))
 
     freqs = dict([(k, v / num_atoms) for k, v in Counter(atom_types).items()])
 
@@ -176,71 +158,6 @@ def molecular_shannon_i(chemgraph_or_graph: nx.Graph | chemgraph.ChemGraph) -> f
 # -------------------------------------------------------------------------------------- #
 
 
-def recu_path(
-    g: nx.Graph, na: int, n: int, sub_paths: list = [], path: list | None = None
-):
-    """
-    Recursive helper function to find all unique simple paths of length n starting from node na.
-
-    Args:
-    -----
-        g: nx.Graph
-        na: Int
-            Node index
-        n: Int
-            Length of path remaining
-        sub_paths: List of Lists
-            Default: []
-            Initiation for recursively finding sub paths.
-        path: List | None
-            Default: None
-            Initiation for initial step.
-
-    Returns:
-    --------
-        sub_paths: List of list
-    """
-    if path is None:
-        path = [na]
-    for neighbor in g.neighbors(path[-1]):
-        if neighbor not in path:
-            edge_attributes = g.get_edge_data(path[-1], neighbor)
-            if n - 1 == 0 and edge_attributes["bond_order"] != 0:
-                if neighbor > na:
-                    sub_paths += [path + [neighbor]]
-            else:
-                recu_path(g, na, n - 1, sub_paths, path + [neighbor])
-    return sub_paths
-
-
-def _paths_finder_rev(g: nx.Graph, n: int):
-    """
-    Find all unique simple paths of length n in the graph.
-
-    Args:
-    -----
-        g: networkx.Graph
-            Molecular graph.
-        n: int
-            Path length.
-
-    Returns:
-    --------
-        list: List of paths (each path is a list of node indices).
-    """
-    paths = []
-    if n < 1:
-        for na in g.nodes():
-            paths.append([na])
-    else:
-        for na in g.nodes():
-            paths.extend(recu_path(g, na, n, []))
-    return paths
-
-
-# -------------------------------------------------------------------------------------- #
-
-
 def kier_mkappa(
     chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
     m: int,
@@ -265,21 +182,11 @@ def kier_mkappa(
     --------
         float: m-th order kappa shape index.
     """
-    # Unpack if ChemGraph
-    g = copy.deepcopy(chemgraph_or_graph)
-    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
-        g = chemgraph_or_graph.graph
-
-    if mode == "legacy":
-        indx_H = [
-            ind_n
-            for ind_n, _ in g.nodes(data=True)
-            if g.nodes[ind_n]["atom_number"] == 1
-        ]
-        g.remove_nodes_from(indx_H)
+    # Hydrogens only count in the kappa indices outside of legacy mode.
+    heavy = mode == "legacy"
 
     if alpha:
-        alf = kier_alpha(g, mode=mode)
+        alf = _kier_alpha(_heavy_atom_view(chemgraph_or_graph), mode=mode)
     else:
         alf = 0
 
@@ -287,35 +194,45 @@ def kier_mkappa(
     #     g = no_hydrogen(g)
     # a = g.number_of_nodes()
     # num_atoms, num_H = atom.number_of_atoms(graph = g)          # Number of atoms in the graph. If H is implicit, it will not count those in that number.
-    num_atoms = len(g.nodes())
+    num_atoms = len(topology.get(chemgraph_or_graph, "nodes", heavy=heavy))
 
     if m == 0:
-        return molecular_shannon_i(g) * num_atoms
+        return _molecular_shannon_i(chemgraph_or_graph) * num_atoms
+
+    if m == 3:
+        # TODO
+        warnings.warn("3K may not works with cyclopropanes.")
+
+    if m in [1, 2, 3]:
+        num_paths = topology.get(chemgraph_or_graph, "num_paths", m, heavy=heavy)
+    else:
+        num_paths = None
+
+    return _kier_mkappa(num_atoms, num_paths, m, alf)
+
 
-    elif m == 1:
+def _kier_mkappa(num_atoms: int, num_paths: int, m: int, alf: float) -> float:
+    """
+    m-th order Kier kappa shape index (m = 1, 2, 3) from the number of atoms and
+    the number of paths of length m.
+    """
+    if m == 1:
         num = (num_atoms + alf - 0) * (num_atoms + alf - 1) ** 2
-        p = g.number_of_edges()
 
     elif m == 2:
         num = (num_atoms + alf - 1) * (num_atoms + alf - 2) ** 2
-        unique_paths = _paths_finder_rev(g, m)
-        p = len(unique_paths)
 
     elif m == 3:
         assert num_atoms > 2, f"Needs at least 3 atoms, got '{num_atoms}'."
-        # TODO
-        warnings.warn("3K may not works with cyclopropanes.")
         if num_atoms % 2 == 0:
             num = (num_atoms + alf - 3) * ((num_atoms + alf - 2) ** 2)
         else:
             num = (num_atoms + alf - 1) * ((num_atoms + alf - 3) ** 2)
-        unique_paths = _paths_finder_rev(g, m)
-        p = len(unique_paths)
 
     else:
-        raise NotImplementedError("Invalid 'm', '{m}'.")
+        raise NotImplementedError(f"Invalid 'm', '{m}'.")
 
-    return num / ((p + alf) ** 2)
+    return num / ((num_paths + alf) ** 2)
 
 
 # -------------------------------------------------------------------------------------- #
@@ -345,20 +262,9 @@ def kier_phi(
     --------
         float: Kier phi descriptor.
     """
-    # Unpack if ChemGraph
-    g = copy.deepcopy(chemgraph_or_graph)
-    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
-        g = chemgraph_or_graph.graph
-
-    if mode == "legacy":
-        indx_H = [
-            ind_n
-            for ind_n, _ in g.nodes(data=True)
-            if g.nodes[ind_n["atom_number"]] == 1
-        ]
-        g.remove_nodes_from(indx_H)
-
-    num_of_atoms = len(g.nodes())
+    num_of_atoms = len(
+        topology.get(chemgraph_or_graph, "nodes", heavy=mode == "legacy")
+    )
 
     # # if mode == "legacy":
     # #     num_a = no_hydrogen(g).number_of_nodes()
@@ -367,8 +273,8 @@ def kier_phi(
     # # num_a = g.number_of_nodes()
     # num_of_atoms = atom.number_of_atoms(graph = g)
     return (
-        kier_mkappa(g, 1, alpha=alpha, mode=mode)
-        * kier_mkappa(g, 2, alpha=alpha, mode=mode)
+        kier_mkappa(chemgraph_or_graph, 1, alpha=alpha, mode=mode)
+        * kier_mkappa(chemgraph_or_graph, 2, alpha=alpha, mode=mode)
         / num_of_atoms
     )
 
@@ -398,92 +304,65 @@ def crest_flex(
     --------
         float
     """
-    g = copy.deepcopy(chemgraph_or_graph)
-    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
-        g = chemgraph_or_graph.graph
-
-    has_H = any(data.get("atom_number") == 1 for _, data in g.nodes(data=True))
-
-    if has_H:
-        indx_H = [
-            ind_n
-            for ind_n, _ in g.nodes(data=True)
-            if g.nodes[ind_n["atom_number"]] == 1
-        ]
-        g.remove_nodes_from(indx_H)
+    g = _heavy_atom_view(chemgraph_or_graph)
 
     # if g.graph["graph_type"] != "kenogram":
     #     warnings.warn("Per definition 'crest_flex' works on kenograms.")
+    # Without bond orders all bonds count as bond order 0.
     if not nx.get_edge_attributes(g, bo_label) or bo_label == "":
-        nx.set_edge_attributes(g, 0.0, bo_label)
         warnings.warn("'crest_flex' No bond orders found.")
 
-    cycles = nx.cycle_basis(g)
-    # cycles = structures.all_rings(graph = g, length_haptic_cycle = 3)     # Accounts for ghost nodes and haptic bonds.
-    edges = list(g.edges())
-
-    m = len(edges)
-    av2 = 0.0
-    for ind_node_1, ind_node_2, data_edge in g.edges(data=True):
-        # bond_order = g.edges[edge][bo_label]
-        bond_order = data_edge[bo_label]
-
-        if bond_order != 0:
-            # assert len(edge) == 2
-
-            # ------------------------------------------------ #
-            # Haptic bonds add rigidity and act in that fashion
-            # as if they are single bonds. Accounting for this.
-
-            # if g.edges[edge][bo_label] == 'h':
-            #     bond_order = 1
-
-            # ------------------------------------------------ #
-            # cns = np.array([atom.atom_connectivity(graph = g, ind_atom = ind_atom) for ])
-            # cns = np.array([len(list(g.neighbors(n))) for n in edge])
-
-            cns = [g.degree[ind_node_1], g.degree[ind_node_2]]
-            # for ind_atom in edge:
-            #     connectivity = atom.atom_connectivity(graph = g, ind_atom = ind_atom)
-            #     cns.append(connectivity)
+    return _crest_flex(chemgraph_or_graph, bo_label=bo_label)
 
-            cns = np.array(cns)
-            # ------------------------------------------------ #
 
-            hybf = 1.0
-
-            hybf *= (
-                0.5 if g.nodes[ind_node_1]["atom_number"] == 6 and cns[0] < 4 else 1.0
-            )
-            hybf *= (
-                0.5 if g.nodes[ind_node_2]["atom_number"] == 6 and cns[1] < 4 else 1.0
-            )
-
-            # for ind_edge in range(len(edge)):
-            #     node = g.nodes[edge[ind_edge]]
-            #     atom_number = atomic_numbers[node['atom_symbol']]
+def _crest_flex(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph, bo_label: str = "bond_order"
+) -> float:
+    """
+    Flexibility score without Hydrogens from the (cached) heavy-atom topology.
+    Does not modify the graph. Bonds without bond order (missing or None) count as
+    bond order 0, i.e. they are skipped.
+    """
+    g = _heavy_atom_view(chemgraph_or_graph)
 
-            #     if atom_number == 6 and cns[ind_edge] < 4:
-            #         hybf*= 0.5
+    # cycles = structures.all_rings(graph = g, length_haptic_cycle = 3)     # Accounts for ghost nodes and haptic bonds.
+    nodes = topology.get(chemgraph_or_graph, "nodes", heavy=True)
+    edges = topology.get(chemgraph_or_graph, "edges", heavy=True)
+    rows = arrays.index_rows(nodes, edges)
 
-            # ------------------------------------------------ #
+    m = len(edges)
+    if m == 0:
+        return 0.0
+
+    bond_orders = np.array(
+        [
+            0.0 if bond_order is None else bond_order
+            for _, _, bond_order in g.edges(data=bo_label, default=0.0)
+        ],
+        dtype=np.float64,
+    )
+    atom_numbers = topology.get(chemgraph_or_graph, "atom_numbers", heavy=True)
+    degrees = topology.get(chemgraph_or_graph, "degrees", heavy=True)
 
-            doublef = 1.0 - np.exp(-4.0 * (bond_order - 2.0) ** 6)
-            branch = 2.0 / np.sqrt(np.prod(cns))
+    # ------------------------------------------------ #
+    # Haptic bonds add rigidity and act in that fashion
+    # as if they are single bonds. Not accounted for yet.
 
-            iring = [np.isin([ind_node_1, ind_node_2], x).any() for x in cycles]
+    # Bonds with bond order 0 do not contribute.
+    mask = bond_orders != 0
+    rows = rows[mask]
+    bond_orders = bond_orders[mask]
+    cns = degrees[rows]
 
-            try:
-                k = min([len(x) for x in list(compress(cycles, iring))])
-            except ValueError:
-                k = 0
+    hybf = np.prod(np.where((atom_numbers[rows] == 6) & (cns < 4), 0.5, 1.0), axis=1)
+    doublef = 1.0 - np.exp(-4.0 * (bond_orders - 2.0) ** 6)
+    branch = 2.0 / np.sqrt(np.prod(cns, axis=1))
 
-            ringf = 0.5 * (1.0 - np.exp(-0.06 * k)) if k > 0 else 1.0
-            val = branch * ringf * doublef * hybf
-            av2 += val**2
+    k = topology.get(chemgraph_or_graph, "bond_ring_sizes", heavy=True)[mask]
+    ringf = np.where(k > 0, 0.5 * (1.0 - np.exp(-0.06 * k)), 1.0)
 
-    av2 = np.sqrt(av2 / m) if m > 0 else av2
-    return av2
+    val = branch * ringf * doublef * hybf
+    return float(np.sqrt(np.sum(val**2) / m))
 
 
 # -------------------------------------------------------------------------------------- #
@@ -0,0 +1,264 @@
+"""
+Opt-in timing of the registry dispatches.
+
+While profiling is enabled, every function looked up in a registry (readers, writers,
+iterators, bond inference methods, geometry parsers and kernels, descriptors) is
+wrapped to record its wall time and the number of atoms it processed. Records are
+keyed by '<registry>:<name>', e.g. 'io.readers:xyz' or 'inference.bonds:cell_list'.
+Streaming iterators record one call per yielded frame. Parallel maps
+(utils.parallel) send the records of their workers back to the calling process.
+
+While profiling is disabled, registry lookups return the plain functions, so the only
+cost is one check per lookup.
+
+Example:
+--------
+    with profiling.profile() as prof:
+        chemgraph = ChemGraph.from_file("molecule.xyz").infer_bonds("cell_list")
+    print(prof.report_text())
+"""
+
+import networkx as nx
+import numpy as np
+
+import time
+
+from contextlib import contextmanager
+from functools import wraps
+from types import GeneratorType
+from typing import Callable, Iterator
+
+PERCENTILES = (50, 90, 99)
+"""Percentiles of the wall time per call in the report."""
+
+_active = None
+
+# -------------------------------------------------------------------------------------- #
+
+
+class Profile:
+    """
+    Records of one profiling session.
+
+    Attributes:
+    -----------
+        records: dict
+            {key: (durations, atoms)} with the wall times in seconds (list) of all
+            calls and the total number of atoms processed (int).
+    """
+
+    def __init__(self):
+        self.records = dict()
+
+    def add(self, key: str, seconds: float, atoms: int = 0):
+        """Records one call."""
+        durations, total_atoms = self.records.get(key, ([], 0))
+        durations.append(seconds)
+        self.records[key] = (durations, total_atoms + atoms)
+
+    def merge(self, records: dict):
+        """Adds the records of another session, e.g. of a worker process."""
+        for key, (durations, atoms) in records.items():
+            durations_self, atoms_self = self.records.get(key, ([], 0))
+            durations_self.extend(durations)
+            self.records[key] = (durations_self, atoms_self + atoms)
+
+    def reset(self):
+        """Drops all records."""
+        self.records = dict()
+
+    # ============================================================= #
+
+    def report(self) -> dict:
+        """
+        Summarizes the records, sorted by total time.
+
+        Returns:
+        --------
+            dict
+                {key: {'calls', 'total_s', 'mean_s', 'p50_s', 'p90_s', 'p99_s',
+                'max_s', 'atoms', 'atoms_per_s'}}
+        """
+        report = dict()
+        for key, (durations, atoms) in self.records.items():
+            durations = np.asarray(durations, dtype=np.float64)
+            total = float(durations.sum())
+
+            report[key] = {
+                "calls": len(durations),
+                "total_s": total,
+                "mean_s": total / len(durations),
+                **{
+                    f"p{percentile}_s": float(value)
+                    for percentile, value in zip(
+                        PERCENTILES, np.percentile(durations, PERCENTILES)
+                    )
+                },
+                "max_s": float(durations.max()),
+                "atoms": atoms,
+                "atoms_per_s": atoms / total if total > 0.0 else 0.0,
+            }
+
+        return dict(
+            sorted(report.items(), key=lambda item: item[1]["total_s"], reverse=True)
+        )
+
+    def report_text(self) -> str:
+        """
+        Formats the report as a text table, see Profile.report.
+
+        Returns:
+        --------
+            str
+        """
+        report = self.report()
+        columns = ["calls", "total_s", "mean_s"]
+        columns += [f"p{percentile}_s" for percentile in PERCENTILES]
+        columns += ["max_s", "atoms", "atoms_per_s"]
+
+        width_key = max([len("function")] + [len(key) for key in report])
+        lines = [f"{'function':<{width_key}}" + "".join(f"{c:>13}" for c in columns)]
+
+        for key, row in report.items():
+            cells = [f"{row['calls']:>13d}"]
+            cells += [f"{row[column]:>13.3e}" for column in columns[1:-2]]
+            cells += [f"{row['atoms']:>13d}", f"{row['atoms_per_s']:>13.3e}"]
+            lines.append(f"{key:<{width_key}}" + "".join(cells))
+
+        return "\n".join(lines)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def enabled() -> bool:
+    """True if a profiling session is active."""
+    return _active is not None
+
+
+def current() -> Profile | None:
+    """Active profiling session, None if profiling is disabled."""
+    return _active
+
+
+def enable() -> Profile:
+    """
+    Starts a new profiling session, replacing the active one.
+
+    Returns:
+    --------
+        Profile
+    """
+    global _active
+    _active = Profile()
+    return _active
+
+
+def disable() -> Profile | None:
+    """
+    Stops profiling.
+
+    Returns:
+    --------
+        Profile | None
+            The stopped session.
+    """
+    global _active
+    profile, _active = _active, None
+    return profile
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Profiles the registry dispatches within the context. The previous session (if any)
+    is restored on exit.
+
+    Yields:
+    -------
+        Profile
+    """
+    global _active
+    previous, _active = _active, Profile()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def num_atoms(data) -> int:
+    """
+    Number of atoms of a ChemGraph, graph, descriptors.Molecule or reader output dict.
+    0 for anything else.
+    """
+    if isinstance(data, dict):
+        for key in ("atomic_numbers", "positions", "graph"):
+            if data.get(key) is not None:
+                return len(data[key])
+        return 0
+
+    data = getattr(data, "chemgraph_or_graph", data)
+    if getattr(data, "atomic_numbers", None) is not None:
+        return len(data.atomic_numbers)
+    if isinstance(data, nx.Graph):
+        return data.number_of_nodes()
+
+    return 0
+
+
+def instrument(key: str, func: Callable) -> Callable:
+    """
+    Wraps a function to record its calls in the active session.
+
+    Args:
+    -----
+        key: str
+            Name of the records.
+        func: Callable
+            Function to wrap. Atoms are counted from its first argument, or from
+            the result if the first argument has none (readers).
+
+    Returns:
+    --------
+        Callable
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        if isinstance(result, GeneratorType):
+            return _instrument_frames(key, result, seconds)
+
+        if _active is not None:
+            atoms = num_atoms(args[0]) if args else 0
+            _active.add(key, seconds, atoms or num_atoms(result))
+
+        return result
+
+    return wrapper
+
+
+def _instrument_frames(key: str, frames: Iterator, seconds: float) -> Iterator:
+    """Records every frame of a stream as one call."""
+    try:
+        while True:
+            start = time.perf_counter()
+            frame = next(frames, StopIteration)
+            seconds += time.perf_counter() - start
+
+            if frame is StopIteration:
+                return
+
+            if _active is not None:
+                _active.add(key, seconds, num_atoms(frame))
+            seconds = 0.0
+
+            yield frame
+    finally:
+        frames.close()
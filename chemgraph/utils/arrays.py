@@ -0,0 +1,114 @@
+import networkx as nx
+import numpy as np
+
+from .. import chemgraph
+
+# -------------------------------------------------------------------------------------- #
+
+
+def gather_positions(g: nx.Graph) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gathers the node positions of a graph into one contiguous array.
+
+    Args:
+    -----
+        g: nx.Graph
+            Graph with a 'position' attribute on every node.
+
+    Returns:
+    --------
+        nodes: np.ndarray
+            Node indices (N,) in graph order.
+        positions: np.ndarray
+            Float64 array (N, 3). Row k holds the position of nodes[k].
+    """
+    nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+    positions = np.empty((len(nodes), 3), dtype=np.float64)
+
+    for ind_row, (_, position) in enumerate(g.nodes(data="position")):
+        positions[ind_row] = position
+
+    return nodes, positions
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def columns(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+) -> tuple[nx.Graph, np.ndarray, np.ndarray]:
+    """
+    Returns the graph, node indices and positions of a ChemGraph or nx.Graph.
+    The columnar arrays of a ChemGraph are used as is, a nx.Graph is gathered.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+
+    Returns:
+    --------
+        g: nx.Graph
+        nodes: np.ndarray
+            Node indices (N,) in row order.
+        positions: np.ndarray
+            Float64 array (N, 3).
+    """
+    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
+        return (
+            chemgraph_or_graph.graph,
+            chemgraph_or_graph.node_indices,
+            chemgraph_or_graph.positions,
+        )
+
+    nodes, positions = gather_positions(chemgraph_or_graph)
+    return chemgraph_or_graph, nodes, positions
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def index_rows(nodes: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Maps node indices onto the rows of the arrays gathered with 'gather_positions'.
+
+    Args:
+    -----
+        nodes: np.ndarray
+            Node indices (N,) in row order.
+        indices: np.ndarray
+            Array of node indices of any shape.
+
+    Returns:
+    --------
+        rows: np.ndarray
+            Array with the same shape as indices.
+    """
+    order = np.argsort(nodes, kind="stable")
+    rows = order[np.searchsorted(nodes[order], indices)]
+    return rows
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def edge_index_array(g: nx.Graph) -> np.ndarray:
+    """
+    Returns the edges of a graph as an integer array (M, 2).
+
+    Args:
+    -----
+        g: nx.Graph
+
+    Returns:
+    --------
+        np.ndarray
+    """
+    edges = np.fromiter(
+        (ind for edge in g.edges() for ind in edge),
+        dtype=np.int64,
+        count=2 * g.number_of_edges(),
+    )
+    return edges.reshape(-1, 2)
+
+
+# -------------------------------------------------------------------------------------- #
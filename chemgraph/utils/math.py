@@ -161,3 +161,229 @@ def dihedral_angle(
     if dihedral_angle < 0:
         dihedral_angle += 360.0
     return dihedral_angle
+
+
+# ---------------------------------------------------------------------------------------------------------- #
+# Batched kernels
+#
+# The functions below broadcast over leading dimensions: positions can be (3,), (M, 3) or
+# (F, M, 3) stacks. Degenerate cases are handled with masks and the result can be written
+# into a preallocated 'out' buffer of the broadcast shape without the last axis.
+# ---------------------------------------------------------------------------------------------------------- #
+
+
+def _dot(vectors_1: np.ndarray, vectors_2: np.ndarray, out: np.ndarray | None = None):
+    """Row-wise dot product over the last axis."""
+    return np.einsum("...i,...i->...", vectors_1, vectors_2, out=out)
+
+
+def _output_buffer(out: np.ndarray | None, *arrays: np.ndarray) -> np.ndarray:
+    """Returns 'out' or a new float64 buffer with the broadcast shape of arrays[..., 0]."""
+    shape = np.broadcast_shapes(*(np.shape(array) for array in arrays))[:-1]
+
+    if out is None:
+        return np.empty(shape, dtype=np.float64)
+
+    if out.shape != shape:
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}.")
+    return out
+
+
+# ---------------------------------------------------------------------------------------------------------- #
+
+
+def bond_lengths(
+    pos_1: np.ndarray, pos_2: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Returns the bond lengths between stacks of positions.
+
+    Args:
+    -----
+        pos_1: np.ndarray
+            Positions (..., 3) of the first atoms.
+
+        pos_2: np.ndarray
+            Positions (..., 3) of the second atoms.
+
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,) the bond lengths are written into.
+
+    Returns:
+    --------
+        bond_lengths: np.ndarray
+            Bond lengths (...,).
+    """
+    out = _output_buffer(out, pos_1, pos_2)
+
+    bond_vectors = np.subtract(pos_1, pos_2)
+    _dot(bond_vectors, bond_vectors, out=out)
+    np.sqrt(out, out=out)
+    return out
+
+
+# ---------------------------------------------------------------------------------------------------------- #
+
+
+def bond_angles(
+    pos_center: np.ndarray,
+    pos_1: np.ndarray,
+    pos_2: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Returns the bond angles pos_1-pos_center-pos_2 in degrees for stacks of positions.
+    Angles for which pos_1 equals pos_2 or a bond has zero length are 0.0.
+
+    Args:
+    -----
+        pos_center: np.ndarray
+            Positions (..., 3) of the central atoms.
+
+        pos_1: np.ndarray
+            Positions (..., 3) of atoms bound to the central atoms.
+
+        pos_2: np.ndarray
+            Positions (..., 3) of other atoms bound to the central atoms.
+
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,) the angles are written into.
+
+    Returns:
+    --------
+        bond_angles: np.ndarray
+            Bond angles (...,) in degrees.
+    """
+    out = _output_buffer(out, pos_center, pos_1, pos_2)
+
+    bond_vectors_1 = np.subtract(pos_center, pos_1)
+    bond_vectors_2 = np.subtract(pos_center, pos_2)
+
+    norms = np.empty_like(out)
+    np.multiply(
+        _dot(bond_vectors_1, bond_vectors_1),
+        _dot(bond_vectors_2, bond_vectors_2),
+        out=norms,
+    )
+    np.sqrt(norms, out=norms)
+
+    degenerate = (norms == 0.0) | np.all(np.equal(pos_1, pos_2), axis=-1)
+    np.copyto(norms, 1.0, where=degenerate)
+
+    _dot(bond_vectors_1, bond_vectors_2, out=out)
+    np.divide(out, norms, out=out)
+    np.clip(out, -1.0, 1.0, out=out)
+    np.arccos(out, out=out)
+    np.rad2deg(out, out=out)
+    np.copyto(out, 0.0, where=degenerate)
+    return out
+
+
+# ---------------------------------------------------------------------------------------------------------- #
+
+
+def dihedral_angles(
+    pos_1: np.ndarray,
+    pos_2: np.ndarray,
+    pos_3: np.ndarray,
+    pos_4: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Returns the dihedral angles in degrees [0, 360) for stacks of 4 positions.
+    Dihedrals with a central bond of zero length are 0.0.
+
+    Args:
+    -----
+        pos_1, pos_2, pos_3, pos_4: np.ndarray
+            Positions (..., 3) of the first, second, third and fourth atoms.
+
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (...,) the angles are written into.
+
+    Returns:
+    --------
+        dihedral_angles: np.ndarray
+            Dihedral angles (...,) in degrees.
+    """
+    out = _output_buffer(out, pos_1, pos_2, pos_3, pos_4)
+
+    bond_1 = np.subtract(pos_1, pos_2)  # Sign is important, see dihedral_angle.
+    bond_center = np.subtract(pos_3, pos_2)
+    bond_2 = np.subtract(pos_3, pos_4)
+
+    length_center = np.empty_like(out)
+    _dot(bond_center, bond_center, out=length_center)
+    np.sqrt(length_center, out=length_center)
+    degenerate = length_center == 0.0
+    np.copyto(length_center, 1.0, where=degenerate)
+    bond_center /= length_center[..., None]  # Make unit vector.
+
+    # Projections of bond_1 and bond_2 onto the plane perpendicular to the central bond.
+    v = bond_1 - _dot(bond_1, bond_center)[..., None] * bond_center
+    w = bond_2 - _dot(bond_2, bond_center)[..., None] * bond_center
+
+    x = _dot(v, w)
+    y = _dot(np.cross(bond_center, v), w)
+
+    np.arctan2(y, x, out=out)
+    np.rad2deg(out, out=out)
+    np.add(out, 360.0, out=out, where=out < 0)
+    np.copyto(out, 0.0, where=degenerate)
+    return out
+
+
+# ---------------------------------------------------------------------------------------------------------- #
+
+
+def centers_of_mass(
+    positions: np.ndarray,
+    weights: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Calculates the centers of mass for stacks of positions.
+    If no weights are specified, they are assumed equivalent.
+
+    Args:
+    -----
+        positions: np.ndarray
+            Positions (..., N, 3), e.g. (N, 3) for one molecule or (F, N, 3) for F frames.
+
+        weights: (Optional) np.ndarray
+            Default: None
+            Weights (N,) or (..., N) broadcastable against positions[..., 0].
+
+        out: (Optional) np.ndarray
+            Default: None
+            Float64 buffer (..., 3) the centers of mass are written into.
+
+    Returns:
+    --------
+        centers_of_mass: np.ndarray
+            Centers of mass (..., 3).
+    """
+    positions = np.asarray(positions)
+    shape = positions.shape[:-2] + (3,)
+
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    elif out.shape != shape:
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}.")
+
+    if weights is None:
+        return np.mean(positions, axis=-2, out=out)
+
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape[-1] != positions.shape[-2]:
+        raise ValueError("Positions and weights do not have same length!")
+
+    np.einsum("...ni,...n->...i", positions, weights, out=out)
+    out /= np.sum(weights, axis=-1)[..., None]
+    return out
+
+
+# ---------------------------------------------------------------------------------------------------------- #
@@ -0,0 +1,343 @@
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+import traceback
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+from .. import profiling
+
+# -------------------------------------------------------------------------------------- #
+
+
+@dataclass
+class TaskError:
+    """Error of a single item of a parallel map, returned in place of its result."""
+
+    item: Any
+    """Item the function failed on."""
+    error: str
+    """repr of the raised exception."""
+    traceback: str = ""
+    """Formatted traceback of the raised exception."""
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def run_chunk(function: Callable, chunk: list, kwargs: dict) -> list:
+    """
+    Applies function to every item of a chunk. Exceptions are caught per item.
+
+    Args:
+    -----
+        function: Callable
+            Picklable function called as function(item, **kwargs).
+        chunk: list
+            List of (index, item).
+        kwargs: dict
+            Keyword arguments of function.
+
+    Returns:
+    --------
+        list
+            List of (index, result | TaskError).
+    """
+    results = []
+    for index, item in chunk:
+        try:
+            result = function(item, **kwargs)
+        except Exception as error:
+            result = TaskError(item, repr(error), traceback.format_exc())
+        results.append((index, result))
+
+    return results
+
+
+def _run_chunk_profiled(function: Callable, chunk: list, kwargs: dict) -> tuple:
+    """Runs a chunk in a worker with profiling, see run_chunk and chemgraph.profiling."""
+    with profiling.profile() as profile:
+        results = run_chunk(function, chunk, kwargs)
+
+    return results, profile.records
+
+
+def _merge_records(message: tuple) -> Any:
+    """Adds the profiling records of a worker to the active session."""
+    result, records = message
+    if profiling.enabled():
+        profiling.current().merge(records)
+
+    return result
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_map(
+    function: Callable,
+    items: Iterable,
+    num_workers: int | None = None,
+    chunk_size: int = 16,
+    ordered: bool = True,
+    max_pending: int | None = None,
+    **kwargs,
+) -> Iterator[tuple[int, Any]]:
+    """
+    Maps function over items on a process pool, sending items to workers in chunks.
+    Failing items produce a TaskError instead of aborting the map.
+    If profiling is enabled, the records of the workers are merged into the session
+    of the calling process.
+
+    Args:
+    -----
+        function: Callable
+            Picklable (module-level) function called as function(item, **kwargs).
+        items: Iterable
+            Items to map over. Consumed lazily, so generators of any length work.
+        num_workers: int | None
+            Default: None
+            Number of worker processes. None uses os.cpu_count().
+            0 or 1 runs in the calling process without a pool.
+        chunk_size: int
+            Default: 16
+            Number of items sent to a worker at once.
+        ordered: bool
+            Default: True
+            If True, results are yielded in input order.
+            If False, results are yielded as soon as their chunk is finished.
+        max_pending: int | None
+            Default: None
+            Maximum number of chunks in flight. None uses 4 * num_workers.
+        **kwargs:
+            Passed to function.
+
+    Yields:
+    -------
+        tuple[int, Any]
+            Input index of the item and its result or TaskError.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    chunks = _iter_chunks(items, chunk_size)
+
+    if num_workers <= 1:
+        for chunk in chunks:
+            yield from run_chunk(function, chunk, kwargs)
+        return
+
+    if max_pending is None:
+        max_pending = 4 * num_workers
+
+    run = _run_chunk_profiled if profiling.enabled() else run_chunk
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(run, function, chunk, kwargs))
+            if len(pending) >= max_pending:
+                pending = yield from _drain(pending, ordered)
+
+        while pending:
+            pending = yield from _drain(pending, ordered)
+
+
+def _iter_chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    chunk = []
+    for item in enumerate(items):
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chunk_results(future) -> list:
+    """Results of a finished chunk, merging the profiling records of the worker."""
+    results = future.result()
+    if isinstance(results, tuple):
+        results = _merge_records(results)
+
+    return results
+
+
+def _drain(pending: list, ordered: bool):
+    """Yields the results of at least one finished chunk, returns the pending chunks."""
+    if ordered:
+        yield from _chunk_results(pending[0])
+        return pending[1:]
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        yield from _chunk_results(future)
+    return [future for future in pending if future not in done]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def _timeout_worker(connection, function: Callable, kwargs: dict, profiled: bool):
+    """
+    Worker loop of iter_map_timeout: one (index, item) in, one (index, result) out.
+    With profiling, ((index, result), records) is sent instead.
+    """
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+
+        if profiled:
+            results, records = _run_chunk_profiled(function, [task], kwargs)
+            connection.send((results[0], records))
+        else:
+            connection.send(run_chunk(function, [task], kwargs)[0])
+
+
+class _TimeoutWorker:
+    """Worker process of iter_map_timeout with its pipe and current task."""
+
+    def __init__(self, function: Callable, kwargs: dict, profiled: bool = False):
+        self.connection, connection_child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_timeout_worker,
+            args=(connection_child, function, kwargs, profiled),
+            daemon=True,
+        )
+        self.process.start()
+        connection_child.close()
+
+        self.task = None
+        self.start = 0.0
+
+    def submit(self, task: tuple[int, Any]):
+        self.task = task
+        self.start = time.monotonic()
+        self.connection.send(task)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def close(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def iter_map_timeout(
+    function: Callable,
+    items: Iterable,
+    timeout: float,
+    num_workers: int | None = None,
+    ordered: bool = True,
+    **kwargs,
+) -> Iterator[tuple[int, Any]]:
+    """
+    Maps function over items on worker processes with a time limit per item.
+    A worker exceeding the time limit is killed and replaced, so functions stuck
+    in native code (which cannot be interrupted from Python) are aborted as well.
+    Items that fail, time out or crash their worker produce a TaskError.
+    If profiling is enabled, the records of the workers are merged into the session
+    of the calling process.
+
+    Args:
+    -----
+        function: Callable
+            Picklable (module-level) function called as function(item, **kwargs).
+        items: Iterable
+            Items to map over. Consumed lazily.
+        timeout: float
+            Time limit per item in seconds.
+        num_workers: int | None
+            Default: None
+            Number of worker processes, at least 1. None uses os.cpu_count().
+        ordered: bool
+            Default: True
+            If True, results are yielded in input order.
+        **kwargs:
+            Passed to function.
+
+    Yields:
+    -------
+        tuple[int, Any]
+            Input index of the item and its result or TaskError.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    tasks = enumerate(items)
+    profiled = profiling.enabled()
+    workers = [
+        _TimeoutWorker(function, kwargs, profiled) for _ in range(max(1, num_workers))
+    ]
+    finished = dict()
+    next_index = 0
+
+    try:
+        while True:
+            for worker in workers:
+                if worker.task is None:
+                    task = next(tasks, None)
+                    if task is not None:
+                        worker.submit(task)
+
+            busy = [worker for worker in workers if worker.task is not None]
+            if not busy:
+                break
+
+            wait_time = max(
+                0.0, min(w.start for w in busy) + timeout - time.monotonic()
+            )
+            ready = multiprocessing.connection.wait(
+                [worker.connection for worker in busy], timeout=wait_time
+            )
+
+            for ind_worker, worker in enumerate(workers):
+                if worker.task is None:
+                    continue
+
+                index, item = worker.task
+                if worker.connection in ready:
+                    try:
+                        message = worker.connection.recv()
+                        if profiled:
+                            message = _merge_records(message)
+                        finished[index] = message[1]
+                        worker.task = None
+                        continue
+                    except (EOFError, OSError) as error:
+                        result = TaskError(item, f"Worker died: {error!r}")
+                elif time.monotonic() - worker.start > timeout:
+                    result = TaskError(
+                        item, repr(TimeoutError(f"Timeout after {timeout} s."))
+                    )
+                else:
+                    continue
+
+                worker.kill()
+                workers[ind_worker] = _TimeoutWorker(function, kwargs, profiled)
+                finished[index] = result
+
+            if ordered:
+                while next_index in finished:
+                    yield next_index, finished.pop(next_index)
+                    next_index += 1
+            else:
+                yield from finished.items()
+                finished.clear()
+
+    finally:
+        for worker in workers:
+            worker.close()
@@ -1,13 +1,24 @@
 import networkx as nx
+import numpy as np
+
+from itertools import chain, islice
+from typing import Iterator
+
+from . import arrays
 
 # -------------------------------------------------------------------------------------- #
 
 
 def recu_path(
-    g: nx.Graph, na: int, n: int, sub_paths: list = [], path: list | None = None
+    g: nx.Graph,
+    na: int,
+    n: int,
+    sub_paths: list | None = None,
+    path: list | None = None,
 ):
     """
     Recursive helper function to find all unique simple paths of length n starting from node na.
+    Prefer 'iter_paths', which streams the same paths without recursion.
 
     Args:
     -----
@@ -16,8 +27,8 @@ def recu_path(
             Node index
         n: Int
             Length of path remaining
-        sub_paths: List of Lists
-            Default: []
+        sub_paths: List of Lists | None
+            Default: None
             Initiation for recursively finding sub paths.
         path: List | None
             Default: None
@@ -27,6 +38,8 @@ def recu_path(
     --------
         sub_paths: List of list
     """
+    if sub_paths is None:
+        sub_paths = []
     if path is None:
         path = [na]
     for neighbor in g.neighbors(path[-1]):
@@ -40,6 +53,122 @@ def recu_path(
     return sub_paths
 
 
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_paths(g: nx.Graph, n: int) -> Iterator[tuple]:
+    """
+    Streams all unique simple paths of length n in the graph.
+    Non-recursive depth-first search that yields the paths in the same order as
+    'recu_path'. A path is unique if its last node is larger than its first node.
+    Paths whose last bond has a bond order of 0 are skipped.
+
+    Args:
+    -----
+        g: networkx.Graph
+            Molecular graph.
+        n: int
+            Path length (number of bonds).
+
+    Yields:
+    -------
+        tuple: Path of n + 1 node indices.
+    """
+    if n < 1:
+        for na in g.nodes():
+            yield (na,)
+        return
+
+    adj = g.adj
+
+    for na in g.nodes():
+        path = [na]
+        on_path = {na}
+        stack = [iter(adj[na])]
+
+        while stack:
+            for neighbor in stack[
+                -1
+            ]:  # Resumes the neighbor iterator of the last node.
+                if neighbor in on_path:
+                    continue
+
+                if len(path) == n:  # Last step of the path.
+                    if neighbor > na and adj[path[-1]][neighbor].get("bond_order") != 0:
+                        yield (*path, neighbor)
+                else:
+                    path.append(neighbor)
+                    on_path.add(neighbor)
+                    stack.append(iter(adj[neighbor]))
+                    break
+            else:  # All neighbors visited, step back.
+                stack.pop()
+                on_path.discard(path.pop())
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def iter_path_chunks(
+    g: nx.Graph, n: int, chunk_size: int = 65536
+) -> Iterator[np.ndarray]:
+    """
+    Streams all unique simple paths of length n as integer arrays.
+    Memory use is bounded by chunk_size, independent of the number of paths.
+
+    Args:
+    -----
+        g: networkx.Graph
+            Molecular graph.
+        n: int
+            Path length (number of bonds).
+        chunk_size: int
+            Default: 65536
+            Maximum number of paths per chunk.
+
+    Yields:
+    -------
+        np.ndarray: Int64 array (chunk, n + 1) of node indices.
+    """
+    width = max(n, 0) + 1
+    paths = iter_paths(g, n)
+
+    while True:
+        chunk = np.fromiter(
+            chain.from_iterable(islice(paths, chunk_size)), dtype=np.int64
+        ).reshape(-1, width)
+
+        if len(chunk) == 0:
+            return
+
+        yield chunk
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def path_index_array(g: nx.Graph, n: int) -> np.ndarray:
+    """
+    Returns all unique simple paths of length n as one integer array.
+
+    Args:
+    -----
+        g: networkx.Graph
+            Molecular graph.
+        n: int
+            Path length (number of bonds).
+
+    Returns:
+    --------
+        np.ndarray: Int64 array (M, n + 1) of node indices.
+    """
+    paths = np.fromiter(chain.from_iterable(iter_paths(g, n)), dtype=np.int64)
+    return paths.reshape(-1, max(n, 0) + 1)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
 def _paths_finder_rev(g: nx.Graph, n: int):
     """
     Find all unique simple paths of length n in the graph.
@@ -55,14 +184,62 @@ def _paths_finder_rev(g: nx.Graph, n: int):
     --------
         list: List of paths (each path is a list of node indices).
     """
-    paths = []
+    return [list(path) for path in iter_paths(g, n)]
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def count_paths(g: nx.Graph, n: int) -> int:
+    """
+    Counts all unique simple paths of length n without enumerating them.
+    For n <= 3 the count follows from the node degrees d:
+        n = 0: number of nodes
+        n = 1: number of edges
+        n = 2: sum over nodes of d * (d - 1) / 2
+        n = 3: sum over edges (u, v) of (d_u - 1) * (d_v - 1) - 3 * number of triangles
+    The triangle term removes the 3-cycles u-v-w-u that the edge products count as paths.
+    Bonds of order 0 are counted for n = 1, as in the first Kier kappa index. Longer
+    paths, and graphs with bond orders of 0 (which 'iter_paths' skips as last bond of a
+    path), are counted by streaming the enumeration.
+
+    Args:
+    -----
+        g: networkx.Graph
+            Molecular graph.
+        n: int
+            Path length (number of bonds).
+
+    Returns:
+    --------
+        int: Number of paths, equal to len(_paths_finder_rev(g, n)) for n != 1.
+    """
     if n < 1:
-        for na in g.nodes():
-            paths.append([na])
-    else:
-        for na in g.nodes():
-            paths.extend(recu_path(g, na, n, []))
-    return paths
+        return g.number_of_nodes()
+    if n == 1:
+        return g.number_of_edges()
+
+    has_zero_bond_order = any(
+        bond_order == 0 for _, _, bond_order in g.edges(data="bond_order")
+    )
+    if n > 3 or has_zero_bond_order:
+        return sum(1 for _ in iter_paths(g, n))
+
+    nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+    degrees = np.fromiter(
+        (degree for _, degree in g.degree(nodes.tolist())),
+        dtype=np.int64,
+        count=len(nodes),
+    )
+
+    if n == 2:
+        return int(np.sum(degrees * (degrees - 1)) // 2)
+
+    rows = arrays.index_rows(nodes, arrays.edge_index_array(g))
+    num_paths = np.sum((degrees[rows[:, 0]] - 1) * (degrees[rows[:, 1]] - 1))
+    num_triangles = sum(nx.triangles(g).values()) // 3
+
+    return int(num_paths) - 3 * num_triangles
 
 
 # -------------------------------------------------------------------------------------- #
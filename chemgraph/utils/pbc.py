@@ -0,0 +1,214 @@
+"""
+Periodic boundary conditions.
+
+The cell (3 x 3, lattice vectors as rows) and the periodic flags (3,) are stored in the
+graph metadata under 'cell' and 'pbc'. A bond crossing the cell boundary carries the
+integer image shift of the bond as edge attribute 'shift'. The shift belongs to the bond
+oriented from the smaller to the larger node index:
+
+    bond vector = position[larger] + shift @ cell - position[smaller]
+
+Bonds without 'shift' lie within the cell.
+"""
+
+import networkx as nx
+import numpy as np
+
+from . import arrays
+
+# -------------------------------------------------------------------------------------- #
+
+
+def cell(g: nx.Graph) -> np.ndarray | None:
+    """
+    Returns the cell of a periodic graph.
+
+    Args:
+    -----
+        g: nx.Graph
+
+    Returns:
+    --------
+        np.ndarray | None
+            Float64 array (3, 3) with the lattice vectors as rows.
+            None if the graph is not periodic along any axis.
+    """
+    cell_g = g.graph.get("cell")
+    pbc_g = g.graph.get("pbc")
+
+    if cell_g is None or pbc_g is None or not np.any(pbc_g):
+        return None
+
+    return np.asarray(cell_g, dtype=np.float64).reshape(3, 3)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def edge_shifts(g: nx.Graph) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gathers the image shifts of all bonds crossing the cell boundary.
+
+    Args:
+    -----
+        g: nx.Graph
+
+    Returns:
+    --------
+        edges: np.ndarray
+            Int64 array (E, 2) of node indices, smaller index first, sorted.
+        shifts: np.ndarray
+            Int64 array (E, 3) of image shifts.
+    """
+    data = [
+        (min(ind_1, ind_2), max(ind_1, ind_2), *shift)
+        for ind_1, ind_2, shift in g.edges(data="shift")
+        if shift is not None and any(shift)
+    ]
+    data = np.array(data, dtype=np.int64).reshape(-1, 5)
+    data = data[np.lexsort((data[:, 1], data[:, 0]))]
+
+    return data[:, :2], data[:, 2:]
+
+
+def orient_shifts(
+    edges: np.ndarray, shifts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Orients bonds from the smaller to the larger node index, negating the shifts of
+    flipped bonds.
+
+    Args:
+    -----
+        edges: np.ndarray
+            Node indices (E, 2). The shifts belong to the nodes edges[:, 1].
+        shifts: np.ndarray
+            Int64 array (E, 3).
+
+    Returns:
+    --------
+        edges, shifts: np.ndarray
+    """
+    flip = edges[:, 0] > edges[:, 1]
+    edges = np.where(flip[:, None], edges[:, ::-1], edges)
+    shifts = np.where(flip[:, None], -shifts, shifts)
+
+    return edges, shifts
+
+
+def lookup_shifts(
+    edges: np.ndarray, shifts: np.ndarray, ind_1: np.ndarray, ind_2: np.ndarray
+) -> np.ndarray:
+    """
+    Image shifts of the bonds ind_1 -> ind_2, for any orientation.
+
+    Args:
+    -----
+        edges, shifts: np.ndarray
+            Output of 'edge_shifts'.
+        ind_1, ind_2: np.ndarray
+            Node indices (P,) of the bonds.
+
+    Returns:
+    --------
+        np.ndarray
+            Int64 array (P, 3). Zero for bonds without shift.
+    """
+    result = np.zeros((len(ind_1), 3), dtype=np.int64)
+    if len(edges) == 0 or len(ind_1) == 0:
+        return result
+
+    low = np.minimum(ind_1, ind_2)
+    high = np.maximum(ind_1, ind_2)
+
+    # Sort key of (low, high) pairs.
+    offset = max(int(edges.max()), int(high.max())) + 1
+    keys = edges[:, 0] * offset + edges[:, 1]
+    keys_query = low * offset + high
+
+    pos = np.minimum(np.searchsorted(keys, keys_query), len(keys) - 1)
+    found = keys[pos] == keys_query
+
+    sign = np.where(ind_1 < ind_2, 1, -1)[found]
+    result[found] = sign[:, None] * shifts[pos[found]]
+
+    return result
+
+
+def minimum_image(vectors: np.ndarray, cell: np.ndarray, pbc: np.ndarray) -> np.ndarray:
+    """
+    Maps vectors to their shortest periodic image by rounding fractional coordinates.
+    Exact for vectors shorter than half of every interplanar spacing of the cell,
+    which holds for bonds in any sensible simulation cell.
+
+    Args:
+    -----
+        vectors: np.ndarray
+            Vectors (..., 3).
+        cell: np.ndarray
+            Cell (3, 3) with the lattice vectors as rows.
+        pbc: np.ndarray
+            Periodic flags (3,).
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (..., 3).
+    """
+    fractional = vectors @ np.linalg.inv(cell)
+    fractional -= np.where(pbc, np.round(fractional), 0.0)
+
+    return fractional @ cell
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def path_positions(
+    g: nx.Graph,
+    nodes: np.ndarray,
+    positions: np.ndarray,
+    indices: np.ndarray,
+    shifts: tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    """
+    Positions of the atoms of bonded paths (bonds, angles, dihedrals), unwrapped
+    across the cell boundary so that consecutive atoms are bonded images.
+
+    Args:
+    -----
+        g: nx.Graph
+        nodes: np.ndarray
+            Node indices (N,) in row order.
+        positions: np.ndarray
+            Positions (N, 3).
+        indices: np.ndarray
+            Node indices (P, L) of the paths.
+        shifts: tuple[np.ndarray, np.ndarray] | None
+            Default: None
+            Output of 'edge_shifts'. Gathered from the graph if None.
+
+    Returns:
+    --------
+        np.ndarray
+            Float64 array (P, L, 3).
+    """
+    rows = arrays.index_rows(nodes, indices)
+    path_pos = positions[rows]
+
+    cell_g = cell(g)
+    if cell_g is None:
+        return path_pos
+
+    edges, shifts_edges = edge_shifts(g) if shifts is None else shifts
+    if len(edges) == 0:
+        return path_pos
+
+    shift = np.zeros((len(indices), 3), dtype=np.int64)
+    for ind_col in range(1, indices.shape[1]):
+        shift += lookup_shifts(
+            edges, shifts_edges, indices[:, ind_col - 1], indices[:, ind_col]
+        )
+        path_pos[:, ind_col] += shift @ cell_g
+
+    return path_pos
@@ -0,0 +1,134 @@
+"""
+Lazily loaded registries.
+
+A LazyRegistry knows the name of every built-in entry up front, together with the
+module that registers it. The module is only imported the first time the name is
+looked up, so backends with heavy dependencies (RDKit, ASE) are not imported for jobs
+that never use them.
+
+Third-party packages add entries through the entry point group of a registry, e.g. in
+their pyproject.toml:
+
+    [project.entry-points."chemgraph.io.readers"]
+    pdb = "my_package.pdb"
+
+The value is either a module that registers the name with the usual decorator when
+imported, or a 'module:function' reference that is registered as is.
+"""
+
+import importlib
+import importlib.metadata
+
+from .. import profiling
+
+from collections.abc import MutableMapping
+from functools import cache
+from typing import Callable, Iterator
+
+# -------------------------------------------------------------------------------------- #
+
+
+@cache
+def entry_points(group: str) -> dict:
+    """
+    Entry points of a group, discovered once per process.
+
+    Args:
+    -----
+        group: str
+            Name of the entry point group.
+
+    Returns:
+    --------
+        dict
+            {name: importlib.metadata.EntryPoint}
+    """
+    return {
+        entry_point.name: entry_point
+        for entry_point in importlib.metadata.entry_points(group=group)
+    }
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+class LazyRegistry(MutableMapping):
+    """
+    Registry {name: function} that imports the module of an entry on first use.
+
+    Membership tests and iteration cover every known name without importing
+    anything, lookups import the backing module if the entry is not loaded yet.
+    While profiling is enabled, lookups return instrumented functions, see
+    chemgraph.profiling.
+
+    Args:
+    -----
+        modules: dict
+            {name: module} of the built-in entries. Relative module names are
+            resolved against the chemgraph package.
+        group: str | None
+            Default: None
+            Entry point group of third-party entries.
+    """
+
+    def __init__(self, modules: dict[str, str], group: str | None = None):
+        self.modules = dict(modules)
+        self.group = group
+        self.label = "registry" if group is None else group.removeprefix("chemgraph.")
+        self._functions = dict()
+
+    def _entry_points(self) -> dict:
+        return dict() if self.group is None else entry_points(self.group)
+
+    def _load(self, name: str):
+        """Imports the module registering name. Raises KeyError for unknown names."""
+        if name in self.modules:
+            importlib.import_module(self.modules[name], package="chemgraph")
+        elif name in self._entry_points():
+            loaded = self._entry_points()[name].load()
+            if name not in self._functions and callable(loaded):
+                self._functions[name] = loaded
+
+        if name not in self._functions:
+            raise KeyError(name)
+
+    # ============================================================= #
+
+    def is_loaded(self, name: str) -> bool:
+        """True if the function of name is registered."""
+        return name in self._functions
+
+    # ============================================================= #
+
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self._functions:
+            self._load(name)
+
+        if profiling.enabled():
+            return profiling.instrument(f"{self.label}:{name}", self._functions[name])
+        return self._functions[name]
+
+    def __setitem__(self, name: str, func: Callable):
+        self._functions[name] = func
+
+    def __delitem__(self, name: str):
+        self._functions.pop(name, None)
+        self.modules.pop(name, None)
+
+    def __contains__(self, name) -> bool:
+        return (
+            name in self._functions
+            or name in self.modules
+            or name in self._entry_points()
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(
+            dict.fromkeys([*self.modules, *self._functions, *self._entry_points()])
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
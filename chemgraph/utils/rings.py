@@ -0,0 +1,72 @@
+import networkx as nx
+import numpy as np
+
+from . import arrays
+
+# -------------------------------------------------------------------------------------- #
+
+
+def atom_ring_sizes(g: nx.Graph, nodes: np.ndarray | None = None) -> np.ndarray:
+    """
+    Size of the smallest cycle of the cycle basis (nx.cycle_basis) every atom is part of.
+    The cycle basis is traversed once, updating the minimum of all atoms of a cycle.
+
+    Args:
+    -----
+        g: nx.Graph
+            Molecular graph.
+        nodes: np.ndarray | None
+            Default: None
+            Node indices (N,) defining the order of the result. None uses graph order.
+
+    Returns:
+    --------
+        np.ndarray
+            Integer array (N,). 0 for atoms that are not part of a cycle.
+    """
+    if nodes is None:
+        nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+
+    sizes = np.full(len(nodes), np.iinfo(np.int64).max, dtype=np.int64)
+
+    for cycle in nx.cycle_basis(g):
+        rows = arrays.index_rows(nodes, np.asarray(cycle, dtype=np.int64))
+        np.minimum.at(sizes, rows, len(cycle))
+
+    sizes[sizes == np.iinfo(np.int64).max] = 0
+    return sizes
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def bond_ring_sizes(g: nx.Graph, edges: np.ndarray | None = None) -> np.ndarray:
+    """
+    Size of the smallest cycle of the cycle basis that contains either atom of a bond.
+    Equal to the minimum over the atom_ring_sizes of both atoms.
+
+    Args:
+    -----
+        g: nx.Graph
+            Molecular graph.
+        edges: np.ndarray | None
+            Default: None
+            Bonds (M, 2) as node indices. None uses the edges of the graph in graph order.
+
+    Returns:
+    --------
+        np.ndarray
+            Integer array (M,). 0 for bonds without an atom in a cycle.
+    """
+    if edges is None:
+        edges = arrays.edge_index_array(g)
+
+    nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+    sizes = atom_ring_sizes(g, nodes)[arrays.index_rows(nodes, edges)]
+
+    # Atoms outside of cycles (0) must not win the minimum.
+    sizes[sizes == 0] = np.iinfo(np.int64).max
+    sizes = sizes.min(axis=1)
+    sizes[sizes == np.iinfo(np.int64).max] = 0
+
+    return sizes
@@ -0,0 +1,168 @@
+"""
+Derived topology of molecular graphs, memoized on ChemGraph instances.
+
+Every entry of REGISTRY_TOPOLOGY computes one property from the graph alone
+(no positions), e.g. degrees, the cycle basis or all paths of length n.
+'get' serves it from the version-stamped cache of a ChemGraph, or computes it
+directly for a plain nx.Graph.
+"""
+
+import networkx as nx
+import numpy as np
+
+from .. import chemgraph
+from . import arrays, pathfinder, pbc, rings, views
+
+TOPOLOGY_CACHE_SIZE = 64
+"""Maximum number of derived properties cached per ChemGraph."""
+
+REGISTRY_TOPOLOGY = dict()
+
+
+def register_topology(name):
+    def wrapper(func):
+        REGISTRY_TOPOLOGY[name] = func
+        return func
+
+    return wrapper
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+def get(
+    chemgraph_or_graph: chemgraph.ChemGraph | nx.Graph,
+    name: str,
+    *args,
+    heavy: bool = False,
+):
+    """
+    Returns a derived topological property of a molecule.
+    For a ChemGraph the result is cached until the graph changes.
+    Cached arrays are read-only.
+
+    Args:
+    -----
+        chemgraph_or_graph: ChemGraph | nx.Graph
+            Molecular graph.
+        name: str
+            Name of the property, see REGISTRY_TOPOLOGY.
+        *args:
+            Arguments of the property, e.g. the path length of 'paths'.
+        heavy: bool
+            Default: False
+            If True, the property of the graph without Hydrogens is returned.
+
+    Returns:
+    --------
+        Any
+    """
+    if isinstance(chemgraph_or_graph, chemgraph.ChemGraph):
+        return chemgraph_or_graph.topology(name, *args, heavy=heavy)
+
+    g = views.heavy_atom_view(chemgraph_or_graph) if heavy else chemgraph_or_graph
+    return REGISTRY_TOPOLOGY[name](g, *args)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+@register_topology("nodes")
+def nodes(g: nx.Graph) -> np.ndarray:
+    """Node indices (N,) in graph order."""
+    return np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+
+
+@register_topology("atom_numbers")
+def atom_numbers(g: nx.Graph) -> np.ndarray:
+    """Atomic numbers (N,) in graph order."""
+    return np.fromiter(
+        (atom_number for _, atom_number in g.nodes(data="atom_number")),
+        dtype=np.int64,
+        count=g.number_of_nodes(),
+    )
+
+
+@register_topology("edges")
+def edges(g: nx.Graph) -> np.ndarray:
+    """Node indices (M, 2) of all bonds in graph order."""
+    return arrays.edge_index_array(g)
+
+
+@register_topology("edge_shifts")
+def edge_shifts(g: nx.Graph) -> tuple[np.ndarray, np.ndarray]:
+    """Image shifts of the bonds crossing the cell boundary, see pbc.edge_shifts."""
+    return pbc.edge_shifts(g)
+
+
+@register_topology("degrees")
+def degrees(g: nx.Graph) -> np.ndarray:
+    """Degrees (N,) in graph order."""
+    return np.fromiter(
+        (degree for _, degree in g.degree()),
+        dtype=np.int64,
+        count=g.number_of_nodes(),
+    )
+
+
+@register_topology("adjacency")
+def adjacency(g: nx.Graph) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Adjacency in compressed sparse row format over node rows (graph order).
+    The neighbors of row k are indices[indptr[k]:indptr[k + 1]].
+
+    Returns:
+    --------
+        indptr: np.ndarray
+            Int64 array (N + 1,).
+        indices: np.ndarray
+            Int64 array (2 * M,) of neighbor rows.
+    """
+    nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+    rows = arrays.index_rows(nodes, arrays.edge_index_array(g))
+
+    rows_from = np.concatenate([rows[:, 0], rows[:, 1]])
+    rows_to = np.concatenate([rows[:, 1], rows[:, 0]])
+    order = np.argsort(rows_from, kind="stable")
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows_from, minlength=len(nodes)), out=indptr[1:])
+
+    return indptr, rows_to[order]
+
+
+@register_topology("cycle_basis")
+def cycle_basis(g: nx.Graph) -> list:
+    """Cycle basis as lists of node indices (nx.cycle_basis)."""
+    return nx.cycle_basis(g)
+
+
+@register_topology("bond_ring_sizes")
+def bond_ring_sizes(g: nx.Graph) -> np.ndarray:
+    """Smallest ring size (M,) per bond in graph order, see rings.bond_ring_sizes."""
+    return rings.bond_ring_sizes(g)
+
+
+@register_topology("connected_components")
+def connected_components(g: nx.Graph) -> np.ndarray:
+    """Label (N,) of the connected component of every node in graph order."""
+    nodes = np.fromiter(g.nodes(), dtype=np.int64, count=g.number_of_nodes())
+    labels = np.empty(len(nodes), dtype=np.int64)
+
+    for label, component in enumerate(nx.connected_components(g)):
+        rows = arrays.index_rows(nodes, np.fromiter(component, dtype=np.int64))
+        labels[rows] = label
+
+    return labels
+
+
+@register_topology("paths")
+def paths(g: nx.Graph, n: int) -> np.ndarray:
+    """Node indices (P, n + 1) of all unique paths of length n."""
+    return pathfinder.path_index_array(g, n)
+
+
+@register_topology("num_paths")
+def num_paths(g: nx.Graph, n: int) -> int:
+    """Number of unique paths of length n."""
+    return pathfinder.count_paths(g, n)
@@ -0,0 +1,107 @@
+import networkx as nx
+
+from functools import cached_property, wraps
+
+# -------------------------------------------------------------------------------------- #
+
+
+def heavy_atom_view(g: nx.Graph) -> nx.Graph:
+    """
+    Read-only view of a graph without its Hydrogens. Nothing is copied.
+    The view follows later edits of the graph, including changed atom numbers.
+
+    Args:
+    -----
+        g: nx.Graph
+            Graph with an 'atom_number' attribute on every node.
+
+    Returns:
+    --------
+        nx.Graph
+            Frozen subgraph view (nx.subgraph_view).
+    """
+    nodes = g._node
+
+    def filter_node(ind_node) -> bool:
+        return nodes[ind_node].get("atom_number") != 1
+
+    return nx.subgraph_view(g, filter_node=filter_node)
+
+
+# -------------------------------------------------------------------------------------- #
+
+
+class EditCountingGraph(nx.Graph):
+    """
+    nx.Graph counting every call adding or removing nodes and edges in 'num_edits'.
+    ChemGraph wraps plain nx.Graph instances in this class to detect edits of its
+    graph, see track_edits and ChemGraph.topology.
+    """
+
+    num_edits = 0
+
+
+def _count_edits(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.num_edits += 1
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+for _method in (
+    "add_node",
+    "add_nodes_from",
+    "remove_node",
+    "remove_nodes_from",
+    "add_edge",
+    "add_edges_from",
+    "add_weighted_edges_from",
+    "remove_edge",
+    "remove_edges_from",
+    "update",
+    "clear",
+    "clear_edges",
+):
+    setattr(EditCountingGraph, _method, _count_edits(getattr(nx.Graph, _method)))
+
+
+def track_edits(g: nx.Graph) -> nx.Graph:
+    """
+    Wraps a plain nx.Graph in an EditCountingGraph sharing its node, edge and graph
+    attribute dicts. Nothing is copied. Only edits through the returned graph are
+    counted, edits through the original object are not.
+
+    Args:
+    -----
+        g: nx.Graph
+
+    Returns:
+    --------
+        nx.Graph
+            EditCountingGraph. Graphs of other classes are returned unchanged.
+    """
+    if type(g) is not nx.Graph:
+        return g
+
+    # Cached views (nodes, edges, ...) hold the original object and are rebuilt lazily.
+    tracked = EditCountingGraph.__new__(EditCountingGraph)
+    tracked.__dict__.update(
+        (key, value)
+        for key, value in vars(g).items()
+        if not isinstance(getattr(nx.Graph, key, None), cached_property)
+    )
+    return tracked
+
+
+def edit_stamp(g: nx.Graph):
+    """
+    Value that changes with every edit of the nodes and edges of a graph.
+    Graphs that are not tracked (see track_edits) fall back to the numbers of nodes
+    and edges, which miss edits keeping both (e.g. moving a bond).
+    """
+    if isinstance(g, EditCountingGraph):
+        return g.num_edits
+
+    return (g.number_of_nodes(), g.number_of_edges())
@@ -0,0 +1,170 @@
+import networkx as nx
+import numpy as np
+
+from chemgraph.chemgraph import ChemGraph as cg
+from pathlib import Path
+
+import os
+import subprocess
+import sys
+
+PATH_XYZ_AZULENE = Path(__file__).parent / "files" / "azulene.xyz"
+
+
+def test_columnar_arrays():
+    """
+    Positions and atomic numbers are stored as arrays, node positions are views.
+    """
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_AZULENE, fmt="xyz")
+    num_atoms = len(chemgraph.graph.nodes)
+
+    assert chemgraph.positions.shape == (num_atoms, 3)
+    assert chemgraph.positions.dtype == np.float64
+    assert chemgraph.atomic_numbers.shape == (num_atoms,)
+
+    for ind_row, (node, data) in enumerate(chemgraph.graph.nodes(data=True)):
+        assert np.shares_memory(data["position"], chemgraph.positions)
+        assert data["atom_number"] == chemgraph.atomic_numbers[ind_row]
+
+    chemgraph.positions[0, 0] = 100.0
+    assert chemgraph.graph.nodes[0]["position"][0] == 100.0
+
+
+def test_supress_hydrogens():
+    """
+    Removing hydrogens keeps node indices and compacts the arrays.
+    """
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_AZULENE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cov_radii")
+    positions_C = chemgraph.positions[chemgraph.atomic_numbers == 6]
+
+    chemgraph.supress_hydrogens()
+
+    assert np.all(chemgraph.atomic_numbers == 6)
+    assert np.array_equal(chemgraph.positions, positions_C)
+    assert len(chemgraph.graph.nodes) == 10
+    assert chemgraph.node_rows(chemgraph.node_indices[[2, 7]]).tolist() == [2, 7]
+
+    for node, data in chemgraph.graph.nodes(data=True):
+        row = chemgraph.node_rows(node)
+        assert np.shares_memory(data["position"], chemgraph.positions[row])
+
+
+def test_topology_cache():
+    chemgraph = cg.from_file(PATH_XYZ_AZULENE).infer_bonds()
+    version = chemgraph.version
+
+    degrees = chemgraph.topology("degrees")
+    assert degrees is chemgraph.topology("degrees")
+    assert not degrees.flags.writeable
+    assert (degrees == [d for _, d in chemgraph.graph.degree()]).all()
+
+    paths = chemgraph.topology("paths", 2)
+    parsed = chemgraph.parse_geometry("angles", as_arrays=True)["angles"]
+    assert parsed.indices is paths
+
+    indptr, indices = chemgraph.topology("adjacency")
+    rows = chemgraph.node_rows(np.array(list(chemgraph.graph.neighbors(0))))
+    assert sorted(indices[indptr[0] : indptr[1]].tolist()) == sorted(rows.tolist())
+
+    # Edits of the graph are detected, attribute edits need explicit invalidation.
+    chemgraph.graph.remove_edge(*next(iter(chemgraph.graph.edges())))
+    assert chemgraph.topology("degrees") is not degrees
+    assert chemgraph.topology("connected_components").max() == 0
+
+    # Swapping a bond keeps the numbers of nodes and edges.
+    edges = chemgraph.topology("edges")
+    ind_1, ind_2 = edges[0]
+    chemgraph.graph.remove_edge(ind_1, ind_2)
+    chemgraph.graph.add_edge(ind_1, ind_2 + 1)
+    edges_swapped = chemgraph.topology("edges")
+    assert len(edges_swapped) == len(edges)
+    assert not np.array_equal(edges_swapped, edges)
+    assert [ind_1, ind_2 + 1] in edges_swapped.tolist()
+
+    # The graph passed in is wrapped, not modified, and shares its data.
+    graph = nx.Graph([(0, 1)])
+    chemgraph_wrapped = cg(graph=graph)
+    assert type(graph) is nx.Graph
+    chemgraph_wrapped.topology("degrees")
+    chemgraph_wrapped.graph.add_edge(1, 2)
+    assert graph.has_edge(1, 2)
+    assert len(chemgraph_wrapped.topology("degrees")) == 3
+
+    chemgraph.supress_hydrogens()
+    assert chemgraph.version > version
+    assert len(chemgraph.topology("nodes")) == 10
+
+    labels = chemgraph.invalidate_cache().topology("connected_components")
+    assert labels is not chemgraph.topology("connected_components", heavy=True)
+
+
+def test_lazy_registries(tmp_path):
+    """
+    Importing chemgraph does not import the RDKit and ASE backends, reading xyz and
+    computing Kier indices neither. Readers of plugins are found through entry points.
+    """
+    (tmp_path / "chemgraph_plugin.py").write_text(
+        "import networkx as nx\n"
+        "def read_single_atom(path_or_file):\n"
+        "    graph = nx.Graph()\n"
+        "    graph.add_node(0, atom_number=1, position=[0.0, 0.0, 0.0])\n"
+        "    return {'name': 'plugin', 'graph': graph}\n"
+    )
+    dist_info = tmp_path / "chemgraph_plugin-0.1.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: chemgraph_plugin\nVersion: 0.1\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[chemgraph.io.readers]\nsingle = chemgraph_plugin:read_single_atom\n"
+    )
+
+    script = f"""
+import sys
+from chemgraph.chemgraph import ChemGraph
+from chemgraph.io import registry
+from chemgraph.metrics import flexibility
+
+chemgraph = ChemGraph.from_file({str(PATH_XYZ_AZULENE)!r}, fmt="xyz")
+chemgraph.infer_bonds(method="cell_list")
+flexibility.kier_alpha(chemgraph)
+chemgraph.parse_geometry("angles", as_arrays=True)
+assert "rdkit" not in sys.modules and "ase" not in sys.modules
+
+assert "single" in registry.readers and "mol" in registry.readers
+assert len(ChemGraph.from_file(None, fmt="single").graph) == 1
+assert "rdkit" not in sys.modules
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(tmp_path), str(Path(__file__).parents[1])]
+        + [path for path in env.get("PYTHONPATH", "").split(os.pathsep) if path]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_string_node_labels():
+    """
+    Graphs with non-integer node labels map their nodes onto rows by label.
+    """
+    chemgraph_int = cg.from_file(path_or_file=PATH_XYZ_AZULENE, fmt="xyz")
+    graph = nx.relabel_nodes(chemgraph_int.graph, lambda node: f"a{node}")
+    chemgraph = cg(graph=graph)
+
+    assert chemgraph.node_indices.tolist() == list(graph.nodes)
+    assert np.array_equal(chemgraph.positions, chemgraph_int.positions)
+    assert chemgraph.node_rows(np.array(["a7", "a2"])).tolist() == [7, 2]
+    assert chemgraph.node_rows([("a0", "a3")]).tolist() == [[0, 3]]
+
+    chemgraph.infer_bonds(method="cell_list")
+    chemgraph_int.infer_bonds(method="cell_list")
+    assert sorted(chemgraph.graph.edges) == sorted(
+        (f"a{node_1}", f"a{node_2}") for node_1, node_2 in chemgraph_int.graph.edges
+    )
+
+    chemgraph.supress_hydrogens()
+    assert np.all(chemgraph.atomic_numbers == 6)
+    assert chemgraph.node_rows(chemgraph.node_indices[[2, 7]]).tolist() == [2, 7]
@@ -1,6 +1,9 @@
 from chemgraph.chemgraph import ChemGraph as cg
+from chemgraph.utils import math
 from pathlib import Path
 
+import numpy as np
+
 PATH_XYZ_CYCLOHEXANE = Path(__file__).parent / "files" / "cyclohexane.xyz"
 
 
@@ -22,5 +25,130 @@ def test_geometry_parser():
     assert len(parsed_all) == 3
 
 
+def test_geometry_parser_arrays():
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_CYCLOHEXANE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cov_radii")
+
+    parsed_lists = chemgraph.parse_geometry(
+        geometry_parser=["bonds", "angles", "dihedrals"]
+    )
+    parsed_arrays = chemgraph.parse_geometry(
+        geometry_parser=["bonds", "angles", "dihedrals"], as_arrays=True
+    )
+
+    for parser, n_indices in [("bonds", 2), ("angles", 3), ("dihedrals", 4)]:
+        parsed = parsed_arrays[parser]
+
+        assert parsed.indices.shape == (len(parsed), n_indices)
+        assert parsed.values.dtype == np.float64
+        assert len(parsed) == len(parsed_lists[parser])
+
+        for (indices, value), (indices_ref, value_ref) in zip(
+            parsed.to_list(), parsed_lists[parser]
+        ):
+            assert indices == indices_ref
+            assert value == value_ref
+
+
+def test_geometry_parser_arrays_match_math():
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_CYCLOHEXANE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cov_radii")
+    nodes = chemgraph.graph.nodes
+
+    parsed = chemgraph.parse_geometry(
+        geometry_parser=["bonds", "angles", "dihedrals"], as_arrays=True
+    )
+
+    for (ind_1, ind_2), value in parsed["bonds"].to_list():
+        _, ref = math.bond_length(nodes[ind_1]["position"], nodes[ind_2]["position"])
+        assert np.isclose(value, ref)
+
+    for (ind_1, ind_center, ind_2), value in parsed["angles"].to_list():
+        ref = math.bond_angle(
+            nodes[ind_center]["position"],
+            nodes[ind_1]["position"],
+            nodes[ind_2]["position"],
+        )
+        assert np.isclose(value, ref)
+
+    for indices, value in parsed["dihedrals"].to_list():
+        ref = math.dihedral_angle(*[nodes[ind]["position"] for ind in indices])
+        assert np.isclose(value, ref)
+
+
+def test_iter_geometry():
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_CYCLOHEXANE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cov_radii")
+
+    for parser in ["bonds", "angles", "dihedrals"]:
+        parsed = chemgraph.parse_geometry(geometry_parser=parser, as_arrays=True)
+        chunks = list(chemgraph.iter_geometry(geometry_parser=parser, chunk_size=5))
+
+        assert all(len(chunk) <= 5 for chunk in chunks)
+        assert np.array_equal(
+            np.concatenate([chunk.indices for chunk in chunks]), parsed[parser].indices
+        )
+        assert np.array_equal(
+            np.concatenate([chunk.values for chunk in chunks]), parsed[parser].values
+        )
+
+
+def test_parse_trajectory(tmp_path):
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_CYCLOHEXANE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cov_radii")
+    parsers = ["bonds", "angles", "dihedrals"]
+
+    rng = np.random.default_rng(0)
+    frames = chemgraph.positions + rng.normal(
+        0.0, 0.05, (7, len(chemgraph.positions), 3)
+    )
+
+    expected = []
+    for frame in frames:
+        chemgraph_frame = cg(graph=chemgraph.graph.copy(), positions=frame)
+        expected.append(chemgraph_frame.parse_geometry(parsers, as_arrays=True))
+
+    for parsed in [
+        chemgraph.parse_trajectory(frames, parsers, chunk_size=100),
+        chemgraph.parse_trajectory(iter(frames), parsers, chunk_size=1),
+        chemgraph.parse_trajectory(frames, parsers, path_out=tmp_path),
+    ]:
+        for parser in parsers:
+            assert parsed[parser].values.shape == (7, len(expected[0][parser]))
+            for ind_frame, expected_frame in enumerate(expected):
+                assert np.array_equal(
+                    parsed[parser].indices, expected_frame[parser].indices
+                )
+                assert np.allclose(
+                    parsed[parser].values[ind_frame], expected_frame[parser].values
+                )
+
+    assert np.array_equal(
+        np.load(tmp_path / "dihedrals.npy"), parsed["dihedrals"].values
+    )
+
+    # A subset of the angles; the indices passed in are not modified.
+    indices = {"angles": expected[0]["angles"].indices[::3]}
+    parsed = chemgraph.parse_trajectory(frames, ["angles", "bonds"], indices=indices)
+    assert list(indices) == ["angles"]
+    assert np.array_equal(parsed["angles"].indices, indices["angles"])
+    assert np.allclose(
+        parsed["angles"].values,
+        np.stack([e["angles"].values[::3] for e in expected]),
+    )
+    assert len(parsed["bonds"].indices) == len(expected[0]["bonds"])
+
+    # Frames wrapped into a periodic cell.
+    cell = np.diag([4.0, 5.0, 6.0])
+    chemgraph.graph.graph.update(cell=cell.tolist(), pbc=[True, True, True])
+    wrapped = frames - np.floor(frames @ np.linalg.inv(cell)) @ cell
+    parsed = chemgraph.parse_trajectory(wrapped, parsers)
+
+    for parser in parsers:
+        assert np.allclose(
+            parsed[parser].values, np.stack([e[parser].values for e in expected])
+        )
+
+
 #
 # def test_bond_parser():
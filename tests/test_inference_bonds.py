@@ -1,6 +1,19 @@
 from chemgraph.chemgraph import ChemGraph as cg
+from chemgraph.inference import bonds, cell_list, reactions, tracking, valence
+from chemgraph.utils import parallel
+from chemgraph.utils.parallel import TaskError
 from pathlib import Path
 
+from rdkit.Chem import AllChem, rdDetermineBonds
+
+import rdkit.Chem
+
+import ase
+import networkx as nx
+import numpy as np
+import pytest
+import time
+
 PATH_XYZ_CYCLOHEXANE = Path(__file__).parent / "files" / "cyclohexane.xyz"
 PATH_XYZ_AZULENE = Path(__file__).parent / "files" / "azulene.xyz"
 
@@ -31,3 +44,289 @@ def test_inference_bonds_rdkit():
     chemgraph = chemgraph.infer_bonds(method="rdkit")
 
     assert len(chemgraph.graph.edges) != 0
+
+
+def test_inference_bonds_cell_list():
+    """
+    Infers bonds with cell lists and compares them to the ASE neighbor list.
+    """
+    for path in [PATH_XYZ_AZULENE, PATH_XYZ_CYCLOHEXANE]:
+        chemgraph = cg.from_file(path_or_file=path, fmt="xyz")
+        edges = set(chemgraph.infer_bonds(method="cov_radii").graph.edges())
+
+        chemgraph = cg.from_file(path_or_file=path, fmt="xyz")
+        chemgraph = chemgraph.infer_bonds(method="cell_list")
+
+        assert set(chemgraph.graph.edges()) == edges
+        assert all(bo == 1 for _, _, bo in chemgraph.graph.edges(data="bond_order"))
+
+    # Small systems compare all pairs directly, large ones use the grid.
+    rng = np.random.default_rng(0)
+    for num_atoms, size in [(cell_list.BRUTE_FORCE_SIZE, 6.0), (2000, 15.0)]:
+        positions = rng.uniform(0.0, size, (num_atoms, 3))
+        atomic_numbers = rng.choice([1, 6, 7, 8, 17], num_atoms)
+
+        graph = nx.Graph()
+        graph.add_nodes_from(range(num_atoms))
+        chemgraph = cg(graph=graph, positions=positions, atomic_numbers=atomic_numbers)
+
+        rows = cell_list.bond_rows(positions, atomic_numbers)
+        distances = np.linalg.norm(positions[:, None] - positions[None, :], axis=2)
+        cutoffs = cell_list.cutoff_matrix()[atomic_numbers[:, None], atomic_numbers]
+        expected = np.argwhere(np.triu(distances < cutoffs, k=1))
+
+        assert len(expected) > 0
+        assert (rows == expected).all()
+        assert len(cell_list.infer_bonds_cell_list(chemgraph)) == len(expected)
+
+
+def test_inference_bonds_periodic():
+    """
+    Infers bonds across the boundary of a triclinic cell.
+    The parsed geometry of the wrapped molecule matches the unwrapped one.
+    """
+    cell = np.array([[7.0, 0.0, 0.0], [1.5, 7.0, 0.0], [0.5, 1.0, 7.5]])
+
+    reference = cg.from_file(path_or_file=PATH_XYZ_CYCLOHEXANE, fmt="xyz")
+    reference = reference.infer_bonds(method="cov_radii")
+    parsed_reference = reference.parse_geometry(
+        geometry_parser=["bonds", "angles", "dihedrals"], as_arrays=True
+    )
+
+    atoms = reference.to_file(fmt="atoms")
+    atoms.positions -= atoms.positions.mean(axis=0)
+    atoms.set_cell(cell)
+    atoms.set_pbc(True)
+    atoms.wrap()
+
+    shifts = {}
+    for method in ["cov_radii", "cell_list"]:
+        chemgraph = cg.from_file(atoms, fmt="atoms").infer_bonds(method=method)
+        shifts[method] = {
+            (ind_1, ind_2): shift
+            for ind_1, ind_2, shift in chemgraph.graph.edges(data="shift")
+        }
+        assert set(shifts[method]) == set(reference.graph.edges())
+        assert any(shift is not None for shift in shifts[method].values())
+
+        parsed = chemgraph.parse_geometry(
+            geometry_parser=["bonds", "angles", "dihedrals"], as_arrays=True
+        )
+        for name, parsed_geometry in parsed.items():
+            assert (parsed_geometry.indices == parsed_reference[name].indices).all()
+            assert np.allclose(parsed_geometry.values, parsed_reference[name].values)
+
+    assert shifts["cov_radii"] == shifts["cell_list"]
+
+    rng = np.random.default_rng(0)
+    cell = np.array([[6.0, 0.0, 0.0], [2.0, 5.0, 0.0], [-1.0, 1.5, 4.0]])
+    positions = rng.uniform(-0.5, 1.5, (150, 3)) @ cell
+    atomic_numbers = rng.choice([1, 6, 8], 150)
+
+    edges = {}
+    for method in ["cov_radii", "cell_list"]:
+        graph = nx.Graph(cell=cell.tolist(), pbc=[True, True, False])
+        graph.add_nodes_from(range(150))
+        chemgraph = cg(
+            graph=graph, positions=positions, atomic_numbers=atomic_numbers
+        ).infer_bonds(method=method)
+
+        edges[method] = {
+            (min(ind_1, ind_2), max(ind_1, ind_2), shift and tuple(shift))
+            for ind_1, ind_2, shift in chemgraph.graph.edges(data="shift")
+        }
+    assert len(edges["cell_list"]) > 0
+    assert edges["cov_radii"] == edges["cell_list"]
+
+
+def test_bond_tracker():
+    """
+    Tracks bonds over a random walk and compares them to a full search per frame.
+    """
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(0.0, 12.0, (800, 3))
+    atomic_numbers = rng.choice([1, 6, 8], 800)
+    cell = np.diag([12.0, 12.0, 12.0])
+
+    for periodic in [False, True]:
+        graph = nx.Graph(cell=cell.tolist(), pbc=[periodic] * 3)
+        graph.add_nodes_from(range(800))
+        chemgraph = cg(graph=graph, positions=positions, atomic_numbers=atomic_numbers)
+
+        frames = positions + np.cumsum(rng.normal(0.0, 0.05, (40, 800, 3)), axis=0)
+        tracker = tracking.BondTracker(chemgraph, verlet_skin=1.0)
+
+        for frame, edges in zip(frames, tracking.iter_bonds(chemgraph, frames)):
+            if periodic:
+                expected, _ = cell_list.periodic_bond_rows(
+                    frame, atomic_numbers, cell, [True] * 3
+                )
+            else:
+                expected = cell_list.bond_rows(frame, atomic_numbers)
+
+            assert (edges == expected).all()
+            assert (tracker.update(frame) == expected).all()
+
+        assert tracker.num_frames == 40
+        assert 1 < tracker.num_rebuilds < 40
+
+
+def test_reaction_events():
+    """
+    Pulls a hydrogen off a water molecule and back, with vibrations around the cutoff.
+    """
+    positions = np.array([[0.0, 0.0, 0.0], [0.96, 0.0, 0.0], [-0.24, 0.93, 0.0]])
+    chemgraph = cg.from_file(
+        ase.Atoms("OHH", positions=positions), fmt="atoms"
+    ).infer_bonds(method="cell_list")
+    cutoff = cell_list.cutoff_matrix()[8, 1]
+
+    distances = [0.96, cutoff + 0.1, cutoff - 0.05, cutoff + 0.4, cutoff + 0.1]
+    distances += [cutoff - 0.05, 0.96]
+    frames = []
+    for distance in distances:
+        frame = positions.copy()
+        frame[1, 0] = distance
+        frames.append(frame)
+
+    reaction_frames = list(reactions.iter_reactions(chemgraph, frames, break_skin=0.3))
+
+    assert [r.num_components for r in reaction_frames] == [1, 1, 1, 2, 2, 1, 1]
+    assert [len(r.broken) for r in reaction_frames] == [0, 0, 0, 1, 0, 0, 0]
+    assert [len(r.formed) for r in reaction_frames] == [0, 0, 0, 0, 0, 1, 0]
+    assert reaction_frames[3].num_fragmented == 1
+    assert reaction_frames[5].num_recombined == 1
+
+    formed, broken = reaction_frames[3].to_events()
+    assert broken.tolist() == [[3, 0, 1]] and len(formed) == 0
+
+    events = list(reactions.iter_reactions(chemgraph, frames, events_only=True))
+    assert [r.frame for r in events] == [3, 5]
+
+    # Without hysteresis the vibrations around the cutoff register as events.
+    events = list(
+        reactions.iter_reactions(chemgraph, frames, break_skin=0.0, events_only=True)
+    )
+    assert [r.frame for r in events] == [1, 2, 3, 5]
+
+
+def test_component_labels():
+    rng = np.random.default_rng(2)
+    rows = np.sort(rng.integers(0, 300, (250, 2)), axis=1)
+    rows = rows[rows[:, 0] < rows[:, 1]]
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(300))
+    graph.add_edges_from(rows.tolist())
+
+    labels = reactions._component_labels(300, rows)
+    for component in nx.connected_components(graph):
+        assert (labels[list(component)] == min(component)).all()
+
+
+def test_inference_bonds_rdkit_batch():
+    """
+    Infers bonds with RDKIT in worker processes and falls back on timeouts.
+    """
+    chemgraphs = [
+        cg.from_file(path_or_file=path, fmt="xyz")
+        for path in [PATH_XYZ_AZULENE, PATH_XYZ_CYCLOHEXANE]
+    ]
+
+    expected = []
+    for chemgraph in chemgraphs:
+        rdkit_mol = chemgraph.to_file(fmt="mol")
+        rdDetermineBonds.DetermineBonds(rdkit_mol, charge=0)
+        expected.append(
+            {
+                (frozenset((u, v)), bond_order)
+                for u, v, bond_order in cg.from_file(rdkit_mol, fmt="mol").graph.edges(
+                    data="bond_order"
+                )
+            }
+        )
+
+        edges = bonds.infer_bonds_rdkit(chemgraph)
+        assert {
+            (frozenset((u, v)), data["bond_order"]) for u, v, data in edges
+        } == expected[-1]
+
+    results = bonds.infer_bonds_rdkit_batch(chemgraphs, num_workers=2)
+    for edges, edges_expected in zip(results, expected):
+        assert {
+            (frozenset((u, v)), data["bond_order"]) for u, v, data in edges
+        } == edges_expected
+
+    with pytest.warns(UserWarning, match="Falling back to 'cov_radii'"):
+        results = bonds.infer_bonds_rdkit_batch(chemgraphs, charge=[0, 1])
+    assert results[1] == bonds.infer_bonds_cov_radii(chemgraphs[1])
+
+    results = bonds.infer_bonds_rdkit_batch(chemgraphs, charge=[0, 1], fallback=None)
+    assert isinstance(results[1], TaskError)
+
+    # A worker stuck beyond the time limit is killed and replaced.
+    results = dict(parallel.iter_map_timeout(time.sleep, [30.0, 0.0], timeout=0.5))
+    assert "TimeoutError" in results[0].error and results[1] is None
+
+
+def test_inference_bonds_valence():
+    """
+    Perceives bond orders from valence rules and validates them against RDKIT.
+    """
+    smiles = [
+        "c1ccccc1",
+        "c1ccncc1",
+        "c1ccc2ccccc2c1",
+        "CC(=O)O",
+        "CC#N",
+        "C#C",
+        "c1cc[nH]c1",
+        "c1ccoc1",
+        "c1ccsc1",
+        "O=C=O",
+        "C1=CC=C2C=CC=CC=C12",
+        "Cn1cnc2c1c(=O)n(C)c(=O)n2C",
+        "CC(=O)Nc1ccc(O)cc1",
+        "O=C1C=CC(=O)C=C1",
+        "c1ccc2[nH]ccc2c1",
+        "CC(=O)[O-]",
+        "c1cc[nH+]cc1",
+        "OS(=O)(=O)O",
+        "O=P(O)(O)O",
+        "c1ccc2cc3ccccc3cc2c1",
+        "c1ccc2c(c1)ccc1ccccc12",
+        "c1cc2ccc3cccc4ccc(c1)c2c34",
+        "[O-]c1ccccc1",
+        "[O-]c1cccc2ccccc12",
+        "[S-]c1ccccc1",
+    ]
+
+    for smi in smiles:
+        rdkit_mol = rdkit.Chem.AddHs(rdkit.Chem.MolFromSmiles(smi))
+        AllChem.EmbedMolecule(rdkit_mol, randomSeed=1)
+        charge = rdkit.Chem.GetFormalCharge(rdkit_mol)
+
+        graph = nx.Graph()
+        graph.add_nodes_from(range(rdkit_mol.GetNumAtoms()))
+        chemgraph = cg(
+            graph=graph,
+            positions=rdkit_mol.GetConformer().GetPositions(),
+            atomic_numbers=np.array([a.GetAtomicNum() for a in rdkit_mol.GetAtoms()]),
+        )
+
+        expected = {
+            (frozenset((u, v)), data["bond_order"])
+            for u, v, data in bonds.infer_bonds_rdkit(chemgraph, charge=charge)
+        }
+        edges = valence.infer_bonds_valence(chemgraph, charge=charge)
+
+        assert {(frozenset((u, v)), data["bond_order"]) for u, v, data in edges} == (
+            expected
+        ), smi
+
+    chemgraph = cg.from_file(path_or_file=PATH_XYZ_AZULENE, fmt="xyz")
+    chemgraph = chemgraph.infer_bonds(method="cell_list")
+    chemgraph = chemgraph.infer_bonds(method="valence", connectivity=None)
+
+    assert {1, 1.5} == {bo for _, _, bo in chemgraph.graph.edges(data="bond_order")}
+    assert len(chemgraph.graph.edges) == len(bonds.infer_bonds_rdkit(chemgraph))
@@ -1,11 +1,14 @@
 import pytest
 
 from chemgraph.chemgraph import ChemGraph as cg
+from chemgraph.io import store, xyz
+from chemgraph.utils.parallel import TaskError
 from pathlib import Path
 
 import rdkit.Chem
 
 import ase.io
+import numpy as np
 
 
 def test_non_existent_file():
@@ -68,3 +71,210 @@ def test_io_atoms():
     atoms_cg = chemgraph.to_file(fmt="atoms")
 
     assert atoms == atoms_cg
+
+
+def test_xyz_iter_file(tmp_path):
+    path_cyclohexane = Path(__file__).parent / "files" / "cyclohexane.xyz"
+    path_azulene = Path(__file__).parent / "files" / "azulene.xyz"
+    path_trajectory = tmp_path / "trajectory.xyz"
+
+    frames = [path_cyclohexane, path_azulene] * 3
+    path_trajectory.write_text(
+        "".join(path.read_text().rstrip("\n") + "\n" for path in frames)
+    )
+
+    chemgraphs = list(cg.iter_file(path_trajectory))
+    assert len(chemgraphs) == 6
+
+    for chemgraph, path in zip(chemgraphs, frames):
+        chemgraph_ref = cg.from_file(path)
+        assert (chemgraph.atomic_numbers == chemgraph_ref.atomic_numbers).all()
+        assert (chemgraph.positions == chemgraph_ref.positions).all()
+
+    chemgraphs_sliced = list(cg.iter_file(path_trajectory, start=1, stop=5, step=2))
+    assert len(chemgraphs_sliced) == 2
+    assert all(len(chemgraph.graph) == 18 for chemgraph in chemgraphs_sliced)
+
+    chemgraph_3 = cg.from_file(path_trajectory, frame=3)
+    assert (chemgraph_3.positions == chemgraphs[3].positions).all()
+
+
+def test_xyz_index(tmp_path):
+    path_cyclohexane = Path(__file__).parent / "files" / "cyclohexane.xyz"
+    path_azulene = Path(__file__).parent / "files" / "azulene.xyz"
+    path_trajectory = tmp_path / "trajectory.xyz"
+
+    frames = [path_cyclohexane, path_azulene, path_azulene, path_cyclohexane]
+    path_trajectory.write_text(
+        "".join(path.read_text().rstrip("\n") + "\n" for path in frames)
+    )
+
+    index = xyz.build_xyz_index(path_trajectory)
+    assert index["num_atoms"].tolist() == [18, 18, 18, 18]
+    assert (tmp_path / "trajectory.xyz.idx.npz").exists()
+
+    chemgraphs = list(cg.iter_file(path_trajectory))
+    read = xyz.read_xyz_frames(path_trajectory, [3, 0, -2])
+
+    for data, ind_frame in zip(read, [3, 0, 2]):
+        chemgraph = cg(**data)
+        assert (chemgraph.positions == chemgraphs[ind_frame].positions).all()
+
+    chemgraph_1 = cg.from_file(path_trajectory, frame=1, index=True)
+    assert (chemgraph_1.positions == chemgraphs[1].positions).all()
+
+    # Appending a frame makes the index stale.
+    with open(path_trajectory, "a") as file:
+        file.write(path_azulene.read_text().rstrip("\n") + "\n")
+
+    with pytest.raises(ValueError):
+        xyz.load_xyz_index(path_trajectory, rebuild=False)
+
+    assert len(xyz.load_xyz_index(path_trajectory)["offsets"]) == 5
+
+
+def test_xyz_reader_bulk_and_strict(tmp_path):
+    path_xyz = Path(__file__).parent / "files" / "azulene.xyz"
+
+    chemgraph_bulk = cg.from_file(path_xyz)
+    chemgraph_strict = cg.from_file(path_xyz, strict=True)
+
+    assert (chemgraph_bulk.positions == chemgraph_strict.positions).all()
+    assert (chemgraph_bulk.atomic_numbers == chemgraph_strict.atomic_numbers).all()
+    assert chemgraph_bulk.atomic_numbers.tolist().count(6) == 10
+
+    path_invalid = tmp_path / "invalid.xyz"
+    path_invalid.write_text("2\n\nC 0.0 0.0 0.0 1.0\nC 0.0 0.0 1.5\n")
+
+    for strict in [False, True]:
+        with pytest.raises(ValueError):
+            cg.from_file(path_invalid, strict=strict)
+
+
+def test_xyz_frames_writer(tmp_path):
+    path_xyz = Path(__file__).parent / "files" / "azulene.xyz"
+    path_trajectory = tmp_path / "trajectory.xyz"
+
+    chemgraph = cg.from_file(path_xyz)
+    cg.frames_to_file([chemgraph, chemgraph], path_trajectory)
+    chemgraph.to_file(path_trajectory, append=True)
+
+    positions = np.stack([chemgraph.positions + shift for shift in [1.0, 2.0]])
+    xyz.write_xyz_frames(
+        positions,
+        path_trajectory,
+        atomic_numbers=chemgraph.atomic_numbers,
+        precision="%12.6f",
+        append=True,
+    )
+
+    chemgraphs = list(cg.iter_file(path_trajectory))
+    assert len(chemgraphs) == 5
+
+    for chemgraph_read in chemgraphs[:3]:
+        assert (chemgraph_read.positions == chemgraph.positions).all()
+        assert (chemgraph_read.atomic_numbers == chemgraph.atomic_numbers).all()
+
+    assert np.allclose(chemgraphs[4].positions, positions[1], atol=1e-6)
+
+
+def test_cgstore(tmp_path):
+    path_xyz = Path(__file__).parent / "files" / "azulene.xyz"
+    path_store = tmp_path / "dataset.cgstore"
+
+    chemgraph = cg.from_file(path_xyz, name="azulene").infer_bonds()
+    chemgraph.graph.graph["charge"] = -1
+    chemgraph_heavy = cg.from_file(path_xyz).supress_hydrogens()
+
+    cg.frames_to_file([chemgraph, chemgraph_heavy], path_store)
+    chemgraph.to_file(path_store, append=True)
+
+    dataset = store.Store(path_store)
+    assert len(dataset) == 3
+    assert isinstance(dataset.positions, np.memmap)
+
+    chemgraph_read = cg.from_file(path_store)
+    assert chemgraph_read.name == "azulene"
+    assert chemgraph_read.graph.graph["charge"] == -1
+    assert (chemgraph_read.positions == chemgraph.positions).all()
+    assert (chemgraph_read.atomic_numbers == chemgraph.atomic_numbers).all()
+    assert chemgraph_read.graph.number_of_edges() == chemgraph.graph.number_of_edges()
+
+    molecule = dataset.read(1)
+    assert np.shares_memory(molecule["positions"], dataset.positions)
+    assert len(molecule["atomic_numbers"]) == len(chemgraph_heavy.atomic_numbers)
+    assert molecule["graph"].number_of_edges() == 0
+
+    chemgraphs = list(cg.iter_file(path_store, start=1))
+    assert [len(c.atomic_numbers) for c in chemgraphs] == [
+        len(chemgraph_heavy.atomic_numbers),
+        len(chemgraph.atomic_numbers),
+    ]
+
+    # Rows written after the last flush (e.g. by a crashed writer) are dropped on append.
+    writer = store.StoreWriter(path_store, append=True)
+    writer.write(chemgraph)
+    writer._files.close()
+
+    chemgraph_heavy.graph.graph["cell"] = np.eye(3)
+    chemgraph_heavy.to_file(path_store, append=True)
+    dataset = store.Store(path_store)
+    assert len(dataset) == 4
+    assert len(dataset.positions) == 2 * len(chemgraph.atomic_numbers) + 2 * len(
+        chemgraph_heavy.atomic_numbers
+    )
+
+    chemgraph_read = cg.from_file(path_store, index=3)
+    assert chemgraph_read.graph.graph["cell"] == np.eye(3).tolist()
+    assert (chemgraph_read.atomic_numbers == chemgraph_heavy.atomic_numbers).all()
+
+    chemgraph.graph.graph["charge"] = object()
+    with pytest.raises(TypeError):
+        chemgraph.to_file(path_store, append=True)
+    assert len(store.Store(path_store)) == 4
+
+
+def test_from_files(tmp_path):
+    path_files = Path(__file__).parent / "files"
+    for name in ["azulene", "cyclohexane"]:
+        (tmp_path / f"{name}.xyz").write_text((path_files / f"{name}.xyz").read_text())
+    (tmp_path / "invalid.xyz").write_text("2\n\nC 0.0 0.0\n")
+    (tmp_path / "notes.txt").write_text("not a molecule")
+    # Readers of the 'mol' and 'atoms' formats take objects, not paths.
+    (tmp_path / "molecule.mol").write_text("not a path format")
+    (tmp_path / "molecule.atoms").write_text("not a path format")
+
+    results = cg.from_files(
+        tmp_path, num_workers=2, chunk_size=1, infer_bonds="cov_radii"
+    )
+    assert len(results) == 3
+
+    chemgraph_azulene, chemgraph_cyclohexane, error = results
+    assert chemgraph_azulene.graph.number_of_edges() == 19
+    assert chemgraph_cyclohexane.graph.number_of_edges() == 18
+    assert isinstance(error, TaskError)
+    assert error.item == tmp_path / "invalid.xyz"
+
+    streamed = dict(
+        cg.from_files(str(tmp_path / "*.xyz"), num_workers=0, as_completed=True)
+    )
+    assert set(streamed) == {
+        tmp_path / f"{name}.xyz" for name in ["azulene", "cyclohexane", "invalid"]
+    }
+    assert (
+        streamed[tmp_path / "azulene.xyz"].positions == chemgraph_azulene.positions
+    ).all()
+
+
+def test_io_atoms_periodic():
+    atoms = ase.Atoms(
+        "H2O",
+        positions=[[0.0, 0.0, 0.0], [0.0, 0.0, 0.96], [0.93, 0.0, -0.24]],
+        cell=[[5.0, 0.0, 0.0], [1.0, 5.0, 0.0], [0.0, 0.0, 6.0]],
+        pbc=[True, True, False],
+    )
+
+    chemgraph = cg.from_file(atoms, fmt="atoms")
+
+    assert chemgraph.graph.graph["pbc"] == [True, True, False]
+    assert chemgraph.to_file(fmt="atoms") == atoms
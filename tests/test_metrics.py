@@ -1,7 +1,12 @@
-from chemgraph.metrics import flexibility
+from chemgraph.metrics import descriptors, flexibility
+from chemgraph.utils import pathfinder
 from chemgraph.chemgraph import ChemGraph as cg
 import rdkit.Chem
 
+import networkx as nx
+import numpy as np
+import pytest
+
 
 def test_flex_kier_alpha():
     """
@@ -90,3 +95,131 @@ def test_kier_phi():
     assert isinstance(kier_phi_g, float)
 
     assert kier_phi_cg == kier_phi_g
+
+
+def test_kier_mkappa_counting_regression():
+    """
+    Kier kappa 2 and 3 from path counting equal the values from path enumeration.
+    """
+    smiles_list = ["c1ccccc1C=CC#C", "C1CC1CC(C)(C)C", "c1ccc2ccccc2c1", "C1CCC12CC2"]
+
+    for smiles in smiles_list:
+        rdkit_mol = rdkit.Chem.rdmolfiles.MolFromSmiles(smiles)
+        chemgraph = cg.from_file(rdkit_mol, fmt="mol")
+        g = chemgraph.graph
+        num_atoms = len(g.nodes())
+
+        p_2 = len(pathfinder._paths_finder_rev(g, 2))
+        p_3 = len(pathfinder._paths_finder_rev(g, 3))
+
+        kappa_2 = (num_atoms - 1) * (num_atoms - 2) ** 2 / p_2**2
+        if num_atoms % 2 == 0:
+            kappa_3 = (num_atoms - 3) * (num_atoms - 2) ** 2 / p_3**2
+        else:
+            kappa_3 = (num_atoms - 1) * (num_atoms - 3) ** 2 / p_3**2
+
+        assert flexibility.kier_mkappa(chemgraph, m=2) == kappa_2
+        assert flexibility.kier_mkappa(chemgraph, m=3) == kappa_3
+
+
+def test_compute_descriptors():
+    smiles = ["c1ccccc1C=CC#C", "CCCCCC", "C1CCC2CCCCC2C1", "CC(C)(C)C(=O)O"]
+    chemgraphs = [
+        cg.from_file(rdkit.Chem.rdmolfiles.MolFromSmiles(s), fmt="mol") for s in smiles
+    ]
+
+    names = list(descriptors.REGISTRY_DESCRIPTORS)
+    for alpha in [False, True]:
+        table = descriptors.compute_descriptors(
+            chemgraphs, names, alpha=alpha, num_workers=2, chunk_size=1
+        )
+        assert table.shape == (len(smiles), len(names))
+
+        for chemgraph, row in zip(chemgraphs, table):
+            expected = {
+                "kier_alpha": flexibility.kier_alpha(chemgraph),
+                "molecular_shannon_i": flexibility.molecular_shannon_i(chemgraph),
+                "kier_phi": flexibility.kier_phi(chemgraph, alpha=alpha),
+                "crest_flex": flexibility.crest_flex(chemgraph),
+            }
+            for m in range(4):
+                expected[f"kier_mkappa_{m}"] = flexibility.kier_mkappa(
+                    chemgraph, m, alpha=alpha
+                )
+
+            assert np.allclose(row, [expected[name] for name in names])
+
+    rows = dict(descriptors.iter_descriptors(chemgraphs, ["crest_flex"], num_workers=0))
+    assert sorted(rows) == [0, 1, 2, 3]
+    assert rows[1].shape == (1,)
+
+    with pytest.raises(ValueError):
+        descriptors.compute_descriptors(chemgraphs, ["unknown"])
+
+    # Graphs without atom numbers are errors, not undefined descriptors.
+    graph = nx.path_graph(4)
+    with pytest.raises(KeyError):
+        descriptors.descriptor_row(graph, ["kier_alpha"])
+    with pytest.warns(UserWarning, match="KeyError"):
+        rows = dict(descriptors.iter_descriptors([graph], num_workers=0))
+    assert np.isnan(rows[0]).all()
+
+
+def test_crest_flex_regression():
+    """
+    Vectorized crest_flex matches the values of the per-bond implementation.
+    """
+    expected = {
+        "c1ccccc1C=CC#C": 0.1347738907720301,
+        "C1CCC2CCCCC2C1": 0.03376318208902585,
+        "C1CC1C2CCC2": 0.020676654391637746,
+        "c1ccc2cc3ccccc3cc2c1": 0.0020011344319439193,
+        "C=CC=CC#N": 0.3470778343632797,
+    }
+
+    for smiles, crest_flex in expected.items():
+        chemgraph = cg.from_file(rdkit.Chem.rdmolfiles.MolFromSmiles(smiles), fmt="mol")
+        assert np.isclose(flexibility.crest_flex(chemgraph), crest_flex, rtol=1e-12)
+
+
+def test_crest_flex_missing_bond_orders():
+    """
+    Bonds with a bond order of None are skipped like bonds of bond order 0.
+    """
+    mol = rdkit.Chem.rdmolfiles.MolFromSmiles("c1ccccc1C=CC#C")
+    chemgraph = cg.from_file(mol, fmt="mol")
+    chemgraph_none = cg.from_file(mol, fmt="mol")
+    chemgraph.graph.edges[0, 1]["bond_order"] = 0
+    chemgraph_none.graph.edges[0, 1]["bond_order"] = None
+
+    crest_flex = flexibility.crest_flex(chemgraph)
+    assert np.isfinite(crest_flex)
+    assert flexibility.crest_flex(chemgraph_none) == crest_flex
+
+
+def test_metrics_heavy_atom_view():
+    """
+    Metrics work on molecules with explicit Hydrogens without modifying them.
+    """
+    smiles = "c1ccccc1C=CC#C"
+    mol = rdkit.Chem.rdmolfiles.MolFromSmiles(smiles)
+    chemgraph = cg.from_file(mol, fmt="mol")
+    chemgraph_H = cg.from_file(rdkit.Chem.AddHs(mol), fmt="mol")
+    num_nodes = chemgraph_H.graph.number_of_nodes()
+
+    view = chemgraph_H.heavy_atom_view()
+    assert view is chemgraph_H.heavy_atom_view()
+    assert view.number_of_nodes() == chemgraph.graph.number_of_nodes()
+
+    assert flexibility.kier_alpha(chemgraph_H) == flexibility.kier_alpha(chemgraph)
+    assert flexibility.molecular_shannon_i(
+        chemgraph_H
+    ) == flexibility.molecular_shannon_i(chemgraph)
+    assert flexibility.crest_flex(chemgraph_H) == flexibility.crest_flex(chemgraph)
+    assert flexibility.kier_phi(chemgraph_H, mode="legacy") == flexibility.kier_phi(
+        chemgraph, mode="legacy"
+    )
+    assert chemgraph_H.graph.number_of_nodes() == num_nodes
+
+    chemgraph_H.supress_hydrogens()
+    assert chemgraph_H.heavy_atom_view().number_of_nodes() == num_nodes - 8
@@ -0,0 +1,76 @@
+import networkx as nx
+import numpy as np
+
+from chemgraph.utils import pathfinder
+
+
+def _graph_fused_rings():
+    """Naphthalene-like graph with a side chain and bond orders of 1."""
+    g = nx.Graph()
+    g.add_edges_from(
+        [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 0), (4, 6), (6, 7)]
+        + [(7, 8), (8, 9), (9, 5), (2, 10), (10, 11), (11, 12), (10, 13)],
+        bond_order=1,
+    )
+    return g
+
+
+def test_iter_paths_matches_recursion():
+    """
+    The iterative enumerator yields the same paths, in the same order, as recu_path.
+    """
+    g = _graph_fused_rings()
+    g.edges[11, 12]["bond_order"] = 0  # Paths ending in a 0 bond order are skipped.
+
+    for n in [0, 1, 2, 3, 4]:
+        if n < 1:
+            paths_recursive = [[na] for na in g.nodes()]
+        else:
+            paths_recursive = [
+                path for na in g.nodes() for path in pathfinder.recu_path(g, na, n)
+            ]
+
+        assert [list(path) for path in pathfinder.iter_paths(g, n)] == paths_recursive
+        assert pathfinder._paths_finder_rev(g, n) == paths_recursive
+
+
+def test_iter_path_chunks():
+    """
+    Chunks of paths concatenate to the full path array.
+    """
+    g = _graph_fused_rings()
+    paths = pathfinder.path_index_array(g, 3)
+    chunks = list(pathfinder.iter_path_chunks(g, 3, chunk_size=7))
+
+    assert paths.shape == (len(pathfinder._paths_finder_rev(g, 3)), 4)
+    assert all(chunk.shape[0] <= 7 for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks), paths)
+
+
+def test_count_paths_matches_enumeration():
+    """
+    Counting paths from degrees gives the same number as enumerating them,
+    including rings of 3 and 4 atoms and bonds with a bond order of 0. Paths of one
+    bond are the edges, as in the first Kier kappa index.
+    """
+    graphs = [_graph_fused_rings(), nx.complete_graph(4), nx.cycle_graph(3)]
+    graphs += [nx.cycle_graph(4), nx.petersen_graph(), nx.path_graph(1)]
+
+    for g in graphs:
+        nx.set_edge_attributes(g, 1, "bond_order")
+
+    g_zero = _graph_fused_rings()
+    g_zero.edges[0, 1]["bond_order"] = 0
+    graphs.append(g_zero)
+
+    for g in graphs:
+        for n in [0, 2, 3, 4]:
+            assert pathfinder.count_paths(g, n) == len(
+                pathfinder._paths_finder_rev(g, n)
+            )
+        assert pathfinder.count_paths(g, 1) == g.number_of_edges()
+
+    assert (
+        pathfinder.count_paths(g_zero, 1)
+        == len(pathfinder._paths_finder_rev(g_zero, 1)) + 1
+    )
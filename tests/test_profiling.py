@@ -0,0 +1,62 @@
+from chemgraph import profiling
+from chemgraph.chemgraph import ChemGraph as cg
+from chemgraph.io import registry
+from chemgraph.metrics import descriptors
+from pathlib import Path
+
+PATH_XYZ_AZULENE = Path(__file__).parent / "files" / "azulene.xyz"
+
+
+def test_profiling():
+    """
+    Registry dispatches are recorded only while profiling is enabled.
+    """
+    reader = registry.readers["xyz"]
+    assert not profiling.enabled()
+
+    with profiling.profile() as profile:
+        assert registry.readers["xyz"] is not reader
+
+        chemgraph = cg.from_file(PATH_XYZ_AZULENE, fmt="xyz")
+        chemgraph.infer_bonds(method="cell_list")
+        chemgraph.parse_geometry(["bonds", "angles"], as_arrays=True)
+        frames = list(cg.iter_file(PATH_XYZ_AZULENE, fmt="xyz"))
+
+    assert registry.readers["xyz"] is reader
+    cg.from_file(PATH_XYZ_AZULENE, fmt="xyz")
+
+    report = profile.report()
+    num_atoms = len(chemgraph.atomic_numbers)
+
+    assert set(report) == {
+        "io.readers:xyz",
+        "io.iterators:xyz",
+        "inference.bonds:cell_list",
+        "geometry.array_parsers:bonds",
+        "geometry.array_parsers:angles",
+    }
+    assert report["io.readers:xyz"]["calls"] == 1
+    assert report["io.readers:xyz"]["atoms"] == num_atoms
+    assert report["io.iterators:xyz"]["calls"] == len(frames)
+    for row in report.values():
+        assert 0.0 <= row["p50_s"] <= row["p99_s"] <= row["max_s"] <= row["total_s"]
+
+    text = profile.report_text()
+    assert len(text.splitlines()) == len(report) + 1
+    assert "inference.bonds:cell_list" in text
+
+
+def test_profiling_workers():
+    """
+    Records of worker processes are merged into the session of the calling process.
+    """
+    chemgraph = cg.from_file(PATH_XYZ_AZULENE, fmt="xyz").infer_bonds("cell_list")
+
+    with profiling.profile() as profile:
+        descriptors.compute_descriptors(
+            [chemgraph] * 8, ["kier_phi"], num_workers=2, chunk_size=2
+        )
+
+    row = profile.report()["metrics.descriptors:kier_phi"]
+    assert row["calls"] == 8
+    assert row["atoms"] == 8 * len(chemgraph.atomic_numbers)
@@ -0,0 +1,26 @@
+from chemgraph.utils import arrays, rings
+
+import networkx as nx
+import numpy as np
+
+
+def test_bond_ring_sizes():
+    """
+    Compares the one pass ring sizes with a search over all cycles for every bond.
+    """
+    g = nx.ladder_graph(5)
+    g.add_edges_from([(9, 10), (10, 11), (11, 12), (12, 10), (12, 13)])
+
+    cycles = nx.cycle_basis(g)
+    expected = []
+    for ind_1, ind_2 in g.edges():
+        sizes = [len(c) for c in cycles if ind_1 in c or ind_2 in c]
+        expected.append(min(sizes, default=0))
+
+    assert rings.bond_ring_sizes(g).tolist() == expected
+    assert rings.bond_ring_sizes(g, arrays.edge_index_array(g)[:0]).shape == (0,)
+
+    sizes = rings.atom_ring_sizes(g)
+    assert sizes[list(g.nodes()).index(13)] == 0
+    assert sizes[list(g.nodes()).index(11)] == 3
+    assert np.all(rings.atom_ring_sizes(nx.path_graph(4)) == 0)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from chemgraph.utils import math
+
+RNG = np.random.default_rng(seed=42)
+
+
+def test_batched_kernels_match_scalar():
+    """
+    Batched bond lengths, angles and dihedrals agree with the scalar functions.
+    """
+    pos_1, pos_2, pos_3, pos_4 = RNG.normal(size=(4, 50, 3))
+
+    lengths = math.bond_lengths(pos_1, pos_2)
+    angles = math.bond_angles(pos_2, pos_1, pos_3)
+    dihedrals = math.dihedral_angles(pos_1, pos_2, pos_3, pos_4)
+
+    for ind in range(50):
+        _, length = math.bond_length(pos_1[ind], pos_2[ind])
+        angle = math.bond_angle(pos_2[ind], pos_1[ind], pos_3[ind])
+        dihedral = math.dihedral_angle(pos_1[ind], pos_2[ind], pos_3[ind], pos_4[ind])
+
+        assert np.isclose(lengths[ind], length)
+        assert np.isclose(angles[ind], angle)
+        assert np.isclose(dihedrals[ind], dihedral)
+
+
+def test_batched_kernels_frames_and_out():
+    """
+    Kernels broadcast over a frame axis and write into preallocated buffers.
+    """
+    frames = RNG.normal(size=(4, 10, 20, 3))  # 4 positions, 10 frames, 20 dihedrals
+    out = np.empty((10, 20))
+
+    dihedrals = math.dihedral_angles(*frames, out=out)
+
+    assert dihedrals is out
+    assert np.all((dihedrals >= 0.0) & (dihedrals < 360.0))
+    assert np.allclose(dihedrals[3], math.dihedral_angles(*frames[:, 3]))
+
+    with pytest.raises(ValueError):
+        math.bond_lengths(frames[0], frames[1], out=np.empty(20))
+
+    centers = math.centers_of_mass(frames[0], weights=np.arange(1, 21))
+    assert centers.shape == (10, 3)
+    assert np.allclose(
+        centers[0], math.center_of_mass(frames[0, 0], np.arange(1, 21)[:, None])
+    )
+
+
+def test_batched_kernels_degenerate():
+    """
+    Degenerate angles and dihedrals are masked to 0.0 instead of returning NaN.
+    """
+    pos_1, pos_2, pos_4 = RNG.normal(size=(3, 5, 3))
+
+    angles = math.bond_angles(pos_2, pos_1, pos_1)
+    dihedrals = math.dihedral_angles(pos_1, pos_2, pos_2, pos_4)
+
+    assert np.array_equal(angles, np.zeros(5))
+    assert np.array_equal(dihedrals, np.zeros(5))